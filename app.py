@@ -1,18 +1,28 @@
-from flask import Flask, render_template, request, jsonify, send_file, redirect, url_for, flash, session
+from flask import Flask, render_template, request, jsonify, send_file, redirect, url_for, flash, session, Response, stream_with_context
 from flask_cors import CORS
 from flask_login import LoginManager, login_user, logout_user, login_required, current_user
 import os
 from dotenv import load_dotenv
-import requests
 import json
+import re
 from io import BytesIO
-from reportlab.lib.pagesizes import letter
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-from reportlab.lib import colors
-import json
-from models import db, User
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from models import db, User, Resume, engine_options, tune_sqlite, password_hasher
+from sqlalchemy import and_, or_
+from sqlalchemy.exc import IntegrityError
+from identity_cache import IdentityCache, identity_from_claims
+from password_hasher import HasherBusy
+from grok_client import GrokClient
+from generation_cache import GenerationCache
+from generation import Generator, register_routes, register_preview_route, resume_response
+from singleflight import SingleFlight
+from pdf_themes import get_theme, UnknownThemeError, UnknownRendererError
+from pdf_cache import PdfCache, pdf_key
+from pdf_pool import PdfRenderPool, PdfPoolFull, PdfRenderTimeout
+from html_preview import HtmlPreview
+from zip_stream import stream_zip
+from circuit_breaker import CircuitBreaker
+from prompt_builder import resume_fields
 
 load_dotenv()
 
@@ -21,7 +31,8 @@ CORS(app)
 
 # App Configuration
 app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'your-secret-key-change-in-production')
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///users.db'
+app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv('DATABASE_URL', 'sqlite:///users.db')
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(app.config['SQLALCHEMY_DATABASE_URI'])
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 
 # Initialize extensions
@@ -33,15 +44,42 @@ login_manager.login_message = 'Please log in to access this page.'
 
 # Configure Grok API (xAI)
 GROK_API_KEY = os.getenv('XAI_API_KEY', 'xai-demo-key')
-GROK_API_URL = 'https://api.x.ai/v1/chat/completions'
+GROK_API_URL = os.getenv('GROK_API_URL', 'https://api.x.ai/v1/chat/completions')
+
+def grok_enabled():
+    """True when a real Grok API key is configured"""
+    return bool(GROK_API_KEY) and GROK_API_KEY != 'xai-demo-key'
+
+generator = Generator(GrokClient(GROK_API_KEY, GROK_API_URL), GenerationCache(), SingleFlight(),
+                      CircuitBreaker(), enabled=grok_enabled, logger=app.logger)
+pdf_cache = PdfCache()
+pdf_pool = PdfRenderPool()
+html_preview = HtmlPreview()
+identity_cache = IdentityCache()
+identity_cache.watch(User)
+
+# Claims mode: API routes trust the identity signed into the session cookie
+IDENTITY_CLAIMS = os.getenv('IDENTITY_CLAIMS', 'false').lower() == 'true'
+IDENTITY_CLAIMS_MAX_AGE = int(os.getenv('IDENTITY_CLAIMS_MAX_AGE', 300))
 
 # User loader for Flask-Login
 @login_manager.user_loader
 def load_user(user_id):
-    return User.query.get(int(user_id))
+    claimed = None
+    if IDENTITY_CLAIMS:
+        claimed = identity_from_claims(session.get('identity'), user_id, IDENTITY_CLAIMS_MAX_AGE)
+        if claimed is not None and request.path.startswith('/api/'):
+            identity_cache.count_claims_hit()
+            return claimed
+
+    identity = identity_cache.load(user_id, lambda: db.session.get(User, int(user_id)))
+    if IDENTITY_CLAIMS and identity is not None and claimed is None:
+        session['identity'] = identity.claims()
+    return identity
 
 # Create database tables
 with app.app_context():
+    tune_sqlite(db.engine)
     db.create_all()
 
 @app.route('/')
@@ -61,7 +99,16 @@ def login():
         
         user = User.query.filter_by(username=username).first()
         
-        if user and user.check_password(password):
+        try:
+            matches, rehashed = password_hasher.verify(user.password_hash if user else None, password or '')
+        except HasherBusy as e:
+            flash(str(e), 'error')
+            return render_template('login.html'), 429, {'Retry-After': '1'}
+        
+        if matches:
+            if rehashed is not None:
+                user.password_hash = rehashed
+                db.session.commit()
             login_user(user, remember=True)
             flash('Login successful!', 'success')
             next_page = request.args.get('next')
@@ -71,6 +118,26 @@ def login():
     
     return render_template('login.html')
 
+def taken_message(username, email):
+    """Why username/email cannot register, or None; one query for both"""
+    taken = User.query.with_entities(User.username, User.email).filter(
+        or_(User.username == username, User.email == email)).all()
+    if any(row.username == username for row in taken):
+        return 'Username already exists'
+    if taken:
+        return 'Email already registered'
+    return None
+
+def create_user(username, email, full_name, password_hash):
+    """Insert a user; the unique constraints settle concurrent sign-ups"""
+    db.session.add(User(username=username, email=email, full_name=full_name, password_hash=password_hash))
+    try:
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        return taken_message(username, email) or 'Registration failed, please try again'
+    return None
+
 @app.route('/register', methods=['GET', 'POST'])
 def register():
     if current_user.is_authenticated:
@@ -84,20 +151,22 @@ def register():
         full_name = data.get('full_name')
         
         # Check if user already exists
-        if User.query.filter_by(username=username).first():
-            flash('Username already exists', 'error')
-            return render_template('register.html')
-        
-        if User.query.filter_by(email=email).first():
-            flash('Email already registered', 'error')
+        error = taken_message(username, email)
+        if error:
+            flash(error, 'error')
             return render_template('register.html')
         
         # Create new user
-        new_user = User(username=username, email=email, full_name=full_name)
-        new_user.set_password(password)
+        try:
+            password_hash = password_hasher.hash(password)
+        except HasherBusy as e:
+            flash(str(e), 'error')
+            return render_template('register.html'), 429, {'Retry-After': '1'}
         
-        db.session.add(new_user)
-        db.session.commit()
+        error = create_user(username, email, full_name, password_hash)
+        if error:
+            flash(error, 'error')
+            return render_template('register.html')
         
         flash('Registration successful! Please log in.', 'success')
         return redirect(url_for('login'))
@@ -108,267 +177,315 @@ def register():
 @login_required
 def logout():
     logout_user()
+    session.pop('identity', None)
     flash('You have been logged out.', 'info')
     return redirect(url_for('login'))
 
-@app.route('/api/generate-resume', methods=['POST'])
+def store_resume_version(user_id, resume_data, personal_info, target_role):
+    """Add a generated resume to a user's history; returns its id, or None if it could not be saved
+
+    A result identical to the user's latest version (say, a cache hit on a
+    repeated request) is not stored twice. Shared by the Flask views and the
+    async front (asgi_app.py).
+    """
+    try:
+        version = Resume.build(int(user_id), resume_data, personal_info, target_role)
+        latest = (Resume.query.with_entities(Resume.id, Resume.digest)
+                  .filter_by(user_id=version.user_id)
+                  .order_by(Resume.created_at.desc(), Resume.id.desc())
+                  .first())
+        if latest is not None and latest.digest == version.digest:
+            return latest.id
+        db.session.add(version)
+        db.session.commit()
+        return version.id
+    except Exception:
+        db.session.rollback()
+        app.logger.exception('Could not save resume history')
+        return None
+
+def save_resume_version(resume_data, personal_info, target_role):
+    """store_resume_version() for the logged-in user"""
+    if not current_user.is_authenticated:
+        return None
+    return store_resume_version(current_user.id, resume_data, personal_info, target_role)
+
+def record_resume(body, fields):
+    """Save each generated resume to history and return its id with the response"""
+    body['resumeId'] = save_resume_version(body['resume'], body['personalInfo'], fields['targetRole'])
+
+register_routes(app, generator, view_decorator=login_required, on_resume=record_resume)
+register_preview_route(app, html_preview, view_decorator=login_required)
+
+def iter_ndjson_lines():
+    """Yield (index, entry) pairs from an NDJSON request body
+
+    Lines are read as they arrive, so generation starts before the upload has
+    finished. Lines that fail to parse are yielded as exceptions.
+    """
+    index = 0
+    for line in request.stream:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            entry = json.loads(line)
+        except ValueError as e:
+            entry = e
+        yield index, entry
+        index += 1
+
+def batch_entries(key='profiles'):
+    """(index, entry) pairs of a batch request, checked before any response is sent
+
+    Accepts NDJSON, a JSON list, or a JSON object holding the list under `key`;
+    raises ValueError for anything else, which the views answer with 400.
+    """
+    if request.mimetype == 'application/x-ndjson':
+        return iter_ndjson_lines()
+    data = request.get_json(silent=True)
+    if isinstance(data, dict):
+        data = data.get(key)
+    if not isinstance(data, list):
+        raise ValueError(f'Expected a JSON list, an object with a "{key}" list, or NDJSON lines')
+    return enumerate(data)
+
+def generate_batch_item(index, profile, bypass_cache):
+    """Generate one batch entry, turning any failure into an error line"""
+    try:
+        if isinstance(profile, Exception):
+            raise ValueError(f'Invalid JSON line: {profile}')
+        if not isinstance(profile, dict):
+            raise ValueError('Each entry must be a JSON object')
+        fields = resume_fields(profile)
+        resume_data, tier = generator.resume(fields, bypass_cache=bypass_cache)
+        result = resume_response(fields, resume_data, tier)
+    except Exception as e:
+        result = {'success': False, 'error': str(e)}
+    result['index'] = index
+    return result
+
+def batch_parallelism():
+    """Concurrency requested with ?parallelism=N, capped by BATCH_MAX_PARALLELISM"""
+    max_parallelism = int(os.getenv('BATCH_MAX_PARALLELISM', 8))
+    return min(max(request.args.get('parallelism', max_parallelism, type=int), 1), max_parallelism)
+
+def run_bounded(fn, items, parallelism):
+    """Yield fn(*item) for each item in completion order
+
+    At most `parallelism` items are in flight and each result is yielded as
+    soon as it finishes, so memory stays flat for large cohorts.
+    """
+    with ThreadPoolExecutor(max_workers=parallelism) as pool:
+        pending = set()
+        for item in items:
+            if len(pending) >= parallelism:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+            pending.add(pool.submit(fn, *item))
+        
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+
+@app.route('/api/generate-resumes/batch', methods=['POST'])
 @login_required
-def generate_resume():
+def generate_resumes_batch():
+    parallelism = batch_parallelism()
+    bypass_cache = request.args.get('noCache') == 'true'
+    try:
+        profiles = batch_entries()
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    
+    def results():
+        items = ((index, profile, bypass_cache) for index, profile in profiles)
+        for result in run_bounded(generate_batch_item, items, parallelism):
+            yield json.dumps(result) + '\n'
+    
+    return Response(stream_with_context(results()), mimetype='application/x-ndjson',
+                    headers={'X-Accel-Buffering': 'no'})
+
+def pdf_download(resume_data, personal_info, theme_name, renderer, compact):
+    """PDF response for a resume, answered from the ETag or the cache when unchanged"""
+    try:
+        theme = get_theme(theme_name)
+        theme.check_renderer(renderer)
+    except (UnknownThemeError, UnknownRendererError) as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    
+    etag = pdf_key(resume_data, personal_info, theme, renderer, compact)
+    if request.if_none_match.contains(etag):
+        pdf_cache.record_not_modified(etag)
+        response = Response(status=304)
+        response.set_etag(etag)
+        return response
+    
+    try:
+        pdf = pdf_cache.get_or_render(
+            etag, lambda: pdf_pool.render(resume_data, personal_info, theme.name, renderer, compact))
+    except PdfPoolFull as e:
+        return jsonify({'success': False, 'error': str(e)}), 503, {'Retry-After': '1'}
+    except PdfRenderTimeout as e:
+        return jsonify({'success': False, 'error': str(e)}), 504
+    return send_file(BytesIO(pdf), as_attachment=True, download_name='resume.pdf',
+                     mimetype='application/pdf', etag=etag)
+
+@app.route('/api/download-pdf', methods=['POST'])
+@login_required
+def download_pdf():
     try:
         data = request.json
-        
-        # Extract user data
-        name = data.get('name', '')
-        email = data.get('email', '')
-        phone = data.get('phone', '')
-        skills = data.get('skills', '')
-        education = data.get('education', '')
-        experience = data.get('experience', '')
-        projects = data.get('projects', '')
-        target_role = data.get('targetRole', '')
-        
-        # Create prompt for AI
-        prompt = f"""Generate a professional, tailored resume content for the following student:
-
-Name: {name}
-Email: {email}
-Phone: {phone}
-Target Role: {target_role}
-
-Skills: {skills}
-Education: {education}
-Experience: {experience}
-Projects: {projects}
-
-Create a compelling, well-structured resume that highlights the most relevant skills and experiences for the {target_role} position. Use professional language and format it with clear sections. Make it ATS-friendly and impactful.
-
-Return the resume in the following JSON format:
-{{
-    "summary": "Professional summary paragraph",
-    "skills": ["skill1", "skill2", "skill3"],
-    "experience": [
-        {{"title": "Job Title", "company": "Company Name", "duration": "Duration", "description": "What you did"}}
-    ],
-    "education": [
-        {{"degree": "Degree", "institution": "School Name", "year": "Year", "details": "Details"}}
-    ],
-    "projects": [
-        {{"name": "Project Name", "description": "What it does", "technologies": "Tech stack"}}
-    ]
-}}"""
-
-        # Call Grok API (xAI)
-        if GROK_API_KEY and GROK_API_KEY != 'xai-demo-key':
-            headers = {
-                'Content-Type': 'application/json',
-                'Authorization': f'Bearer {GROK_API_KEY}'
-            }
-            
-            payload = {
-                'model': 'grok-beta',
-                'messages': [
-                    {"role": "system", "content": "You are an expert resume writer and career counselor. Create professional, tailored resumes that highlight individual strengths."},
-                    {"role": "user", "content": prompt}
-                ],
-                'temperature': 0.7,
-                'max_tokens': 1500
-            }
-            
-            response = requests.post(GROK_API_URL, headers=headers, json=payload)
-            
-            if response.status_code == 200:
-                ai_content = response.json()['choices'][0]['message']['content']
-                # Extract JSON from response
-                start_idx = ai_content.find('{')
-                end_idx = ai_content.rfind('}') + 1
-                resume_data = json.loads(ai_content[start_idx:end_idx])
-            else:
-                raise Exception(f"Grok API error: {response.text}")
-        else:
-            # Fallback if no API key
-            resume_data = {
-                "summary": f"Motivated student with strong background in {skills}. Seeking {target_role} position to apply technical skills and contribute to innovative projects.",
-                "skills": skills.split(','),
-                "experience": [{"title": "Parse from experience", "company": "Various", "duration": experience, "description": "Details from input"}],
-                "education": [{"degree": education, "institution": "Educational Institution", "year": "Recent", "details": ""}],
-                "projects": [{"name": "Student Projects", "description": projects, "technologies": skills}]
-            }
-        
-        return jsonify({
-            'success': True,
-            'resume': resume_data,
-            'personalInfo': {
-                'name': name,
-                'email': email,
-                'phone': phone
-            }
-        })
+        return pdf_download(data.get('resumeData', {}), data.get('personalInfo', {}), data.get('theme'),
+                            data.get('renderer'), bool(data.get('compact')))
     
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
-@app.route('/api/generate-cover-letter', methods=['POST'])
+def user_resume(resume_id):
+    """One of the current user's saved resumes, or None"""
+    return Resume.query.filter_by(id=resume_id, user_id=current_user.id).first()
+
+@app.route('/api/resumes')
 @login_required
-def generate_cover_letter():
+def list_resumes():
     try:
-        data = request.json
+        limit = min(max(request.args.get('limit', 20, type=int), 1), 100)
+        query = Resume.query.filter_by(user_id=current_user.id)
         
-        name = data.get('name', '')
-        target_role = data.get('targetRole', '')
-        company = data.get('company', '')
-        skills = data.get('skills', '')
-        experience = data.get('experience', '')
-        
-        prompt = f"""Write a compelling, professional cover letter for:
-
-Applicant: {name}
-Target Role: {target_role}
-Company: {company}
-Skills: {skills}
-Experience: {experience}
-
-Create a personalized cover letter that showcases enthusiasm, relevant skills, and fit for the role. Keep it concise (3-4 paragraphs) and professional."""
-
-        if GROK_API_KEY and GROK_API_KEY != 'xai-demo-key':
-            headers = {
-                'Content-Type': 'application/json',
-                'Authorization': f'Bearer {GROK_API_KEY}'
-            }
-            
-            payload = {
-                'model': 'grok-beta',
-                'messages': [
-                    {"role": "system", "content": "You are an expert career counselor who writes compelling cover letters."},
-                    {"role": "user", "content": prompt}
-                ],
-                'temperature': 0.7,
-                'max_tokens': 800
-            }
-            
-            response = requests.post(GROK_API_URL, headers=headers, json=payload)
-            
-            if response.status_code == 200:
-                cover_letter = response.json()['choices'][0]['message']['content']
-            else:
-                raise Exception(f"Grok API error: {response.text}")
-        else:
-            cover_letter = f"""Dear Hiring Manager,
-
-I am writing to express my strong interest in the {target_role} position at {company}. As a motivated student with skills in {skills}, I am excited about the opportunity to contribute to your team.
-
-{experience}
-
-I am confident that my technical skills, combined with my passion for learning and problem-solving, make me a strong candidate for this position. I look forward to the opportunity to discuss how I can contribute to {company}'s success.
-
-Thank you for your consideration.
-
-Sincerely,
-{name}"""
+        # Newest first; ?before=<nextBefore> continues from the previous page
+        # along the (user_id, created_at) index instead of an OFFSET scan
+        before = request.args.get('before', type=int)
+        if before is not None:
+            cursor = user_resume(before)
+            if cursor is None:
+                return jsonify({'success': False, 'error': 'Unknown cursor'}), 400
+            query = query.filter(or_(Resume.created_at < cursor.created_at,
+                                     and_(Resume.created_at == cursor.created_at, Resume.id < cursor.id)))
         
+        page = query.order_by(Resume.created_at.desc(), Resume.id.desc()).limit(limit + 1).all()
         return jsonify({
             'success': True,
-            'coverLetter': cover_letter
+            'resumes': [version.summary() for version in page[:limit]],
+            'nextBefore': page[limit - 1].id if len(page) > limit else None
         })
     
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
-@app.route('/api/download-pdf', methods=['POST'])
+@app.route('/api/resumes/<int:resume_id>')
 @login_required
-def download_pdf():
+def get_resume(resume_id):
     try:
-        data = request.json
-        resume_data = data.get('resumeData', {})
-        personal_info = data.get('personalInfo', {})
-        
-        # Create PDF
-        buffer = BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=letter, rightMargin=72, leftMargin=72,
-                               topMargin=72, bottomMargin=18)
-        
-        # Container for elements
-        elements = []
-        styles = getSampleStyleSheet()
-        
-        # Custom styles
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=24,
-            textColor=colors.HexColor('#2c3e50'),
-            spaceAfter=6,
-            alignment=1  # Center
-        )
-        
-        heading_style = ParagraphStyle(
-            'CustomHeading',
-            parent=styles['Heading2'],
-            fontSize=14,
-            textColor=colors.HexColor('#3498db'),
-            spaceAfter=12,
-            spaceBefore=12
-        )
-        
-        # Add name
-        elements.append(Paragraph(personal_info.get('name', 'N/A'), title_style))
-        
-        # Add contact info
-        contact = f"{personal_info.get('email', '')} | {personal_info.get('phone', '')}"
-        elements.append(Paragraph(contact, styles['Normal']))
-        elements.append(Spacer(1, 0.2*inch))
-        
-        # Add summary
-        if resume_data.get('summary'):
-            elements.append(Paragraph("PROFESSIONAL SUMMARY", heading_style))
-            elements.append(Paragraph(resume_data['summary'], styles['Normal']))
-            elements.append(Spacer(1, 0.15*inch))
-        
-        # Add skills
-        if resume_data.get('skills'):
-            elements.append(Paragraph("SKILLS", heading_style))
-            skills_text = " • ".join(resume_data['skills'][:10])
-            elements.append(Paragraph(skills_text, styles['Normal']))
-            elements.append(Spacer(1, 0.15*inch))
+        version = user_resume(resume_id)
+        if version is None:
+            return jsonify({'success': False, 'error': 'Resume not found'}), 404
         
-        # Add experience
-        if resume_data.get('experience'):
-            elements.append(Paragraph("EXPERIENCE", heading_style))
-            for exp in resume_data['experience'][:3]:
-                exp_title = f"<b>{exp.get('title', '')}</b> - {exp.get('company', '')}"
-                elements.append(Paragraph(exp_title, styles['Normal']))
-                elements.append(Paragraph(exp.get('duration', ''), styles['Normal']))
-                elements.append(Paragraph(exp.get('description', ''), styles['Normal']))
-                elements.append(Spacer(1, 0.1*inch))
-        
-        # Add education
-        if resume_data.get('education'):
-            elements.append(Paragraph("EDUCATION", heading_style))
-            for edu in resume_data['education'][:2]:
-                edu_text = f"<b>{edu.get('degree', '')}</b> - {edu.get('institution', '')} ({edu.get('year', '')})"
-                elements.append(Paragraph(edu_text, styles['Normal']))
-                if edu.get('details'):
-                    elements.append(Paragraph(edu['details'], styles['Normal']))
-                elements.append(Spacer(1, 0.1*inch))
-        
-        # Add projects
-        if resume_data.get('projects'):
-            elements.append(Paragraph("PROJECTS", heading_style))
-            for proj in resume_data['projects'][:3]:
-                proj_title = f"<b>{proj.get('name', '')}</b>"
-                elements.append(Paragraph(proj_title, styles['Normal']))
-                elements.append(Paragraph(proj.get('description', ''), styles['Normal']))
-                elements.append(Paragraph(f"<i>Technologies: {proj.get('technologies', '')}</i>", styles['Normal']))
-                elements.append(Spacer(1, 0.1*inch))
-        
-        # Build PDF
-        doc.build(elements)
-        buffer.seek(0)
+        resume_data, personal_info = version.unpack()
+        return jsonify(dict(version.summary(), success=True, resume=resume_data, personalInfo=personal_info))
+    
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/resumes/<int:resume_id>/pdf')
+@login_required
+def download_saved_resume(resume_id):
+    try:
+        version = user_resume(resume_id)
+        if version is None:
+            return jsonify({'success': False, 'error': 'Resume not found'}), 404
         
-        return send_file(buffer, as_attachment=True, download_name='resume.pdf', mimetype='application/pdf')
+        resume_data, personal_info = version.unpack()
+        return pdf_download(resume_data, personal_info, request.args.get('theme'),
+                            request.args.get('renderer'), request.args.get('compact') == 'true')
     
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
+def export_file_name(index, personal_info):
+    """Archive member name for one bulk-export entry"""
+    slug = re.sub(r'[^\w.-]+', '_', str(personal_info.get('name') or '')).strip('_.') or 'resume'
+    return f'{index:04d}_{slug[:60]}.pdf'
+
+def render_export_item(index, entry, default_theme, default_renderer, default_compact):
+    """Render one bulk-export entry; return (manifest entry, PDF bytes or None)"""
+    try:
+        if isinstance(entry, Exception):
+            raise ValueError(f'Invalid JSON line: {entry}')
+        if not isinstance(entry, dict):
+            raise ValueError('Each entry must be a JSON object')
+        resume_data = entry.get('resumeData', {})
+        personal_info = entry.get('personalInfo', {})
+        theme = get_theme(entry.get('theme') or default_theme)
+        renderer = entry.get('renderer') or default_renderer
+        compact = bool(entry.get('compact', default_compact))
+        
+        # Reuse a cached render, but don't let a cohort export evict the
+        # documents single downloads are hitting, or skew their hit ratio
+        pdf = pdf_cache.peek(pdf_key(resume_data, personal_info, theme, renderer, compact))
+        if pdf is None:
+            pdf = pdf_pool.render(resume_data, personal_info, theme.name, renderer, compact)
+        name = export_file_name(index, personal_info)
+        return {'index': index, 'success': True, 'file': name, 'bytes': len(pdf)}, pdf
+    except Exception as e:
+        return {'index': index, 'success': False, 'error': str(e)}, None
+
+@app.route('/api/download-pdf/batch', methods=['POST'])
+@login_required
+def download_pdf_batch():
+    renderer = request.args.get('renderer')
+    compact = request.args.get('compact') == 'true'
+    try:
+        theme = get_theme(request.args.get('theme'))
+        theme.check_renderer(renderer)
+    except (UnknownThemeError, UnknownRendererError) as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    try:
+        resumes = batch_entries('resumes')
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    # More renders in flight than worker processes would only queue
+    parallelism = min(batch_parallelism(), max(pdf_pool.workers, 1))
+    
+    def members():
+        manifest = []
+        items = ((index, entry, theme.name, renderer, compact) for index, entry in resumes)
+        for entry, pdf in run_bounded(render_export_item, items, parallelism):
+            manifest.append(entry)
+            if pdf is not None:
+                yield entry['file'], pdf
+        
+        manifest.sort(key=lambda entry: entry['index'])
+        failed = sum(1 for entry in manifest if not entry['success'])
+        yield 'manifest.json', json.dumps({
+            'total': len(manifest),
+            'succeeded': len(manifest) - failed,
+            'failed': failed,
+            'entries': manifest
+        }, indent=2)
+    
+    return Response(stream_with_context(stream_zip(members())), mimetype='application/zip',
+                    headers={'Content-Disposition': 'attachment; filename=resumes.zip',
+                             'X-Accel-Buffering': 'no'})
+
+def collect_metrics():
+    """Snapshot of every component's counters"""
+    return {
+        **generator.stats(),
+        'pdf_cache': pdf_cache.stats(),
+        'pdf_pool': pdf_pool.stats(),
+        'preview_cache': html_preview.cache.stats(),
+        'identity_cache': identity_cache.stats(),
+        'password_hasher': password_hasher.stats()
+    }
+
+@app.route('/api/metrics')
+def metrics():
+    return jsonify(collect_metrics())
+
 if __name__ == '__main__':
+    pdf_pool.warm_in_background()
     port = int(os.environ.get('PORT', 5000))
     app.run(host='0.0.0.0', port=port, debug=False)
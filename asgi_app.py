@@ -0,0 +1,153 @@
+"""
+ASGI entry point serving the generation endpoints asynchronously.
+
+The two Grok-backed endpoints run on the event loop, so a pending completion
+costs a coroutine instead of a whole worker thread; every other route is
+forwarded to the existing Flask app. Run with:
+
+    uvicorn asgi_app:application --host 0.0.0.0 --port $PORT
+"""
+
+import contextlib
+
+from a2wsgi import WSGIMiddleware
+from flask_login.utils import decode_cookie
+from itsdangerous import BadSignature
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import JSONResponse
+from starlette.routing import Mount, Route
+
+import app as flask_module
+from app import app as flask_app, generator
+from circuit_breaker import TIER_CACHE, TIER_GROK, TIER_TEMPLATE
+from generation import (resume_key, resume_request, fallback_resume, resume_response,
+                        cover_letter_key, cover_letter_request, fallback_cover_letter, cover_letter_response)
+from grok_client import AsyncGrokClient
+from prompt_builder import resume_fields, cover_letter_fields
+
+async_grok_client = AsyncGrokClient(flask_module.GROK_API_KEY, flask_module.GROK_API_URL)
+
+
+def session_user_id(request):
+    """Return the logged-in user id from the Flask session or remember cookie"""
+    if flask_app.config.get('LOGIN_DISABLED'):
+        return 'anonymous'
+
+    cookie = request.cookies.get(flask_app.config['SESSION_COOKIE_NAME'])
+    if cookie:
+        serializer = flask_app.session_interface.get_signing_serializer(flask_app)
+        max_age = int(flask_app.permanent_session_lifetime.total_seconds())
+        try:
+            session = serializer.loads(cookie, max_age=max_age)
+        except BadSignature:
+            session = {}
+        if session.get('_user_id'):
+            return session['_user_id']
+
+    remember = request.cookies.get(flask_app.config.get('REMEMBER_COOKIE_NAME', 'remember_token'))
+    if remember:
+        with flask_app.app_context():
+            return decode_cookie(remember)
+    return None
+
+
+def save_resume_version(user_id, body, target_role):
+    """Record a generated resume in the user's history, as the Flask view does"""
+    if flask_app.config.get('LOGIN_DISABLED'):
+        return None
+    with flask_app.app_context():
+        return flask_module.store_resume_version(user_id, body['resume'], body['personalInfo'], target_role)
+
+
+def unauthorized():
+    return JSONResponse({'success': False, 'error': 'Authentication required'}, status_code=401)
+
+
+async def generate_resume(request):
+    user_id = session_user_id(request)
+    if not user_id:
+        return unauthorized()
+    try:
+        data = await request.json()
+        fields = resume_fields(data)
+
+        if generator.enabled():
+            cache_key = resume_key(fields)
+            # A memory miss reads the SQLite disk tier: keep cache I/O off the event loop
+            resume_data = await run_in_threadpool(
+                generator.cache.lookup, cache_key, bypass=bool(data.get('noCache')))
+            tier = TIER_CACHE
+
+            if resume_data is None:
+                async def call():
+                    return generator.parse_resume_content(
+                        await async_grok_client.chat_completion(**resume_request(fields)))
+
+                resume_data, tier = await generator.circuit_breaker.acall(call, lambda: fallback_resume(fields))
+                if tier == TIER_GROK:
+                    await run_in_threadpool(generator.cache.set, cache_key, resume_data)
+        else:
+            resume_data, tier = fallback_resume(fields), TIER_TEMPLATE
+
+        body = resume_response(fields, resume_data, tier)
+        # A blocking SQLite write: keep it off the event loop
+        body['resumeId'] = await run_in_threadpool(save_resume_version, user_id, body, fields['targetRole'])
+        return JSONResponse(body)
+
+    except Exception as e:
+        return JSONResponse({'success': False, 'error': str(e)}, status_code=500)
+
+
+async def generate_cover_letter(request):
+    if not session_user_id(request):
+        return unauthorized()
+    try:
+        data = await request.json()
+        fields = cover_letter_fields(data)
+
+        if generator.enabled():
+            cache_key = cover_letter_key(fields)
+            cover_letter = await run_in_threadpool(
+                generator.cache.lookup, cache_key, bypass=bool(data.get('noCache')))
+            tier = TIER_CACHE
+
+            if cover_letter is None:
+                async def call():
+                    return await async_grok_client.chat_completion(**cover_letter_request(fields))
+
+                cover_letter, tier = await generator.circuit_breaker.acall(
+                    call, lambda: fallback_cover_letter(fields))
+                if tier == TIER_GROK:
+                    await run_in_threadpool(generator.cache.set, cache_key, cover_letter)
+        else:
+            cover_letter, tier = fallback_cover_letter(fields), TIER_TEMPLATE
+
+        return JSONResponse(cover_letter_response(cover_letter, tier))
+
+    except Exception as e:
+        return JSONResponse({'success': False, 'error': str(e)}, status_code=500)
+
+
+async def metrics(request):
+    snapshot = flask_module.collect_metrics()
+    snapshot['async_grok_client'] = async_grok_client.stats()
+    return JSONResponse(snapshot)
+
+
+@contextlib.asynccontextmanager
+async def lifespan(application):
+    flask_module.pdf_pool.warm_in_background()
+    yield
+    await async_grok_client.aclose()
+
+
+application = Starlette(
+    routes=[
+        Route('/api/generate-resume', generate_resume, methods=['POST']),
+        Route('/api/generate-cover-letter', generate_cover_letter, methods=['POST']),
+        Route('/api/metrics', metrics),
+        Mount('/', app=WSGIMiddleware(flask_app)),
+    ],
+    lifespan=lifespan,
+)
@@ -0,0 +1,7 @@
+"""
+Offline benchmarks and shared fixtures for the resume builder.
+
+Run a benchmark as a module from the project root, e.g.:
+
+    python -m benchmarks.bench_resume_json
+"""
@@ -0,0 +1,136 @@
+"""
+Benchmark register/login throughput against SQLite, before and after tuning.
+
+"before" is the old setup: default engine options and pragmas, and a
+registration that queries the username, then the email, then inserts.
+"after" is the current one: WAL, busy timeout, a sized pool, and the
+single-query check plus insert-and-catch of app.create_user. Password
+hashing is left out (a precomputed hash is stored) so only the database
+work is timed. Each mode uses a fresh database file.
+
+    python -m benchmarks.bench_auth_db [--threads N] [--users N] [--logins N]
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import threading
+import time
+
+os.environ.setdefault('PDF_RENDER_WORKERS', '0')
+
+from flask import Flask
+from sqlalchemy.exc import IntegrityError, OperationalError
+from werkzeug.security import generate_password_hash
+
+import app as app_module
+from models import db, User, engine_options, tune_sqlite
+
+PASSWORD_HASH = generate_password_hash('secret1', 'pbkdf2:sha256:1')
+
+
+def register_before(username, email):
+    if User.query.filter_by(username=username).first():
+        return 'Username already exists'
+    if User.query.filter_by(email=email).first():
+        return 'Email already registered'
+    db.session.add(User(username=username, email=email, full_name=username, password_hash=PASSWORD_HASH))
+    db.session.commit()
+    return None
+
+
+def register_after(username, email):
+    return app_module.taken_message(username, email) or app_module.create_user(
+        username, email, username, PASSWORD_HASH)
+
+
+def make_app(mode, path):
+    bench_app = Flask(f'bench-{mode}')
+    uri = f'sqlite:///{path}'
+    bench_app.config['SQLALCHEMY_DATABASE_URI'] = uri
+    if mode == 'after':
+        bench_app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(uri)
+    db.init_app(bench_app)
+    with bench_app.app_context():
+        if mode == 'after':
+            tune_sqlite(db.engine)
+        db.create_all()
+    return bench_app
+
+
+def run_threads(bench_app, threads, work):
+    """Run work(thread_index, attempt) on each thread in an app context; (seconds, failures)"""
+    failures = {'locked': 0, 'unique_violations': 0}
+    lock = threading.Lock()
+
+    def attempt(fn):
+        try:
+            fn()
+        except (IntegrityError, OperationalError) as e:
+            # The old register() let both reach the user as a 500
+            db.session.rollback()
+            with lock:
+                failures['unique_violations' if isinstance(e, IntegrityError) else 'locked'] += 1
+
+    def worker(i):
+        with bench_app.app_context():
+            work(i, attempt)
+
+    pool = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    start = time.perf_counter()
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    return time.perf_counter() - start, failures
+
+
+def bench(mode, path, threads, users, logins):
+    bench_app = make_app(mode, path)
+    register = register_before if mode == 'before' else register_after
+
+    def register_users(i, attempt):
+        for n in range(users):
+            # Odd names are tried by every thread at once, so those attempts race
+            name = f'user{n}' if n % 2 else f'user{i}-{n}'
+            attempt(lambda: register(name, f'{name}@example.com'))
+
+    def log_in(i, attempt):
+        rng = random.Random(i)
+        for _ in range(logins):
+            name = f'user{rng.randrange(1, users, 2)}'
+            attempt(lambda: User.query.filter_by(username=name).first())
+            db.session.rollback()
+
+    register_s, register_failures = run_threads(bench_app, threads, register_users)
+    login_s, login_failures = run_threads(bench_app, threads, log_in)
+    with bench_app.app_context():
+        accounts = User.query.count()
+        db.engine.dispose()
+    return {
+        'register_per_s': threads * users / register_s,
+        'login_per_s': threads * logins / login_s,
+        'unique_violations': register_failures['unique_violations'],
+        'locked': register_failures['locked'] + login_failures['locked'],
+        'accounts': accounts
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--users', type=int, default=100)
+    parser.add_argument('--logins', type=int, default=500)
+    args = parser.parse_args()
+
+    print(f"{'mode':<7} {'register/s':>11} {'login/s':>9} {'500s':>5} {'locked':>7} {'accounts':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode in ('before', 'after'):
+            result = bench(mode, os.path.join(tmp, f'{mode}.db'), args.threads, args.users, args.logins)
+            print(f"{mode:<7} {result['register_per_s']:>11.0f} {result['login_per_s']:>9.0f} "
+                  f"{result['unique_violations']:>5} {result['locked']:>7} {result['accounts']:>9}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+"""
+Benchmark the cost of each password-hash setting.
+
+For each KDF setting, reports the median milliseconds per hash and the
+logins per second a PasswordHasher with --workers threads sustains over a
+burst, which bounds how many sign-ins a process can absorb before answering
+429.
+
+    python -m benchmarks.bench_password_hash [--repeat N] [--workers N]
+"""
+
+import argparse
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from password_hasher import PasswordHasher, DEFAULT_METHOD
+
+METHODS = ('scrypt:16384:8:1', DEFAULT_METHOD, 'scrypt:65536:8:1',
+           'pbkdf2:sha256:260000', 'pbkdf2:sha256:600000')
+
+
+def time_hash(hasher, repeat):
+    """Median milliseconds per hash over repeat runs"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        hasher.hash('correct horse battery staple')
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def burst_rate(hasher, stored, attempts):
+    """Verifications per second for a burst of concurrent logins"""
+    with ThreadPoolExecutor(max_workers=hasher.capacity) as clients:
+        start = time.perf_counter()
+        list(clients.map(lambda _: hasher.verify(stored, 'correct horse battery staple'), range(attempts)))
+        return attempts / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--repeat', type=int, default=10)
+    parser.add_argument('--workers', type=int, default=2)
+    args = parser.parse_args()
+
+    print(f"{'method':<22} {'ms/hash':>8} {'logins/s':>9}")
+    for method in METHODS:
+        hasher = PasswordHasher(workers=args.workers, max_queue=args.workers * 4, method=method)
+        ms = time_hash(hasher, args.repeat)
+        rate = burst_rate(hasher, hasher.hash('correct horse battery staple'), args.repeat * args.workers)
+        hasher.shutdown()
+        print(f'{method:<22} {ms:>8.1f} {rate:>9.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+"""
+Benchmark compact PDF output against the regular writer.
+
+For every theme, renderer and fixture resume, reports the regular and
+compact file sizes and the CPU time per render of each.
+
+    python -m benchmarks.bench_pdf_compact [--repeat N]
+"""
+
+import argparse
+import time
+
+from benchmarks.fixtures import PERSONAL_INFO, RESUMES
+from pdf_themes import get_theme, theme_names
+
+
+def render(theme, renderer, name, compact):
+    return get_theme(theme).render(RESUMES[name], PERSONAL_INFO, renderer, compact).getvalue()
+
+
+def cpu_ms(theme, renderer, name, compact, repeat):
+    """CPU milliseconds per render over repeat runs"""
+    start = time.process_time()
+    for _ in range(repeat):
+        render(theme, renderer, name, compact)
+    return (time.process_time() - start) * 1000 / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    rows = []
+    for theme in theme_names():
+        for renderer in get_theme(theme).renderers:
+            for name in RESUMES:
+                render(theme, renderer, name, True)  # warm fonts and metrics
+                rows.append((f'{theme}/{renderer}/{name}',
+                             len(render(theme, renderer, name, False)), len(render(theme, renderer, name, True)),
+                             cpu_ms(theme, renderer, name, False, args.repeat),
+                             cpu_ms(theme, renderer, name, True, args.repeat)))
+
+    print(f"{'document':<28} {'regular B':>9} {'compact B':>9} {'saved':>6} {'regular ms':>10} {'compact ms':>10}")
+    for label, regular, compact, regular_cpu, compact_cpu in rows:
+        print(f'{label:<28} {regular:>9} {compact:>9} {1 - compact / regular:>6.1%} '
+              f'{regular_cpu:>10.2f} {compact_cpu:>10.2f}')
+    regular_bytes, compact_bytes, regular_ms, compact_ms = (sum(row[i] for row in rows) for i in range(1, 5))
+    print(f"{'total':<28} {regular_bytes:>9} {compact_bytes:>9} {1 - compact_bytes / regular_bytes:>6.1%} "
+          f'{regular_ms:>10.2f} {compact_ms:>10.2f} ({compact_ms / regular_ms - 1:+.1%} CPU)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+"""
+Benchmark the canvas fast-path PDF renderer against the platypus path.
+
+Renders the minimal, typical and maximal fixture resumes with the classic
+theme through both renderers and reports the median time per render, the
+speedup and the output size.
+
+    python -m benchmarks.bench_pdf_render [--repeat N]
+"""
+
+import argparse
+import statistics
+import time
+
+from benchmarks.fixtures import PERSONAL_INFO, MINIMAL_RESUME, TYPICAL_RESUME, MAXIMAL_RESUME
+from pdf_themes import get_theme, PLATYPUS, CANVAS
+
+CASES = (('minimal', MINIMAL_RESUME), ('typical', TYPICAL_RESUME), ('maximal', MAXIMAL_RESUME))
+
+
+def time_render(theme, resume, renderer, repeat):
+    """Median milliseconds per render over repeat runs"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        theme.render(resume, PERSONAL_INFO, renderer)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--repeat', type=int, default=50)
+    parser.add_argument('--theme', default='classic')
+    args = parser.parse_args()
+
+    theme = get_theme(args.theme)
+    # Warm both paths (fonts, metrics caches) before timing
+    for _, resume in CASES:
+        for renderer in (PLATYPUS, CANVAS):
+            theme.render(resume, PERSONAL_INFO, renderer)
+
+    print(f"{'resume':<10} {'platypus ms':>12} {'canvas ms':>10} {'speedup':>8} {'platypus B':>11} {'canvas B':>9}")
+    for name, resume in CASES:
+        platypus_ms = time_render(theme, resume, PLATYPUS, args.repeat)
+        canvas_ms = time_render(theme, resume, CANVAS, args.repeat)
+        platypus_size = len(theme.render(resume, PERSONAL_INFO, PLATYPUS).getvalue())
+        canvas_size = len(theme.render(resume, PERSONAL_INFO, CANVAS).getvalue())
+        print(f'{name:<10} {platypus_ms:>12.2f} {canvas_ms:>10.2f} {platypus_ms / canvas_ms:>7.1f}x '
+              f'{platypus_size:>11} {canvas_size:>9}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+"""
+Benchmark re-rendering a PDF after a single-section edit.
+
+For each theme and fixture resume, times a full render with the section
+cache empty against a render where only one section (summary, skills,
+experience or projects) differs from the previous render, so every other
+section is reused from the cache.
+
+With --workers N the renders go through a PdfRenderPool of N processes, as
+in production: the "full" renders use a new person each time, so no worker
+has their sections, while the edits rely on the pool sending every render
+of one person to the worker that built the previous one.
+
+    python -m benchmarks.bench_pdf_sections [--repeat N] [--workers N]
+"""
+
+import argparse
+import statistics
+import time
+
+import pdf_themes
+from benchmarks.fixtures import PERSONAL_INFO, TYPICAL_RESUME, MAXIMAL_RESUME
+from pdf_pool import PdfRenderPool
+from pdf_sections import SectionCache
+
+CASES = (('typical', TYPICAL_RESUME), ('maximal', MAXIMAL_RESUME))
+
+
+def edit(resume, section, i):
+    """A copy of resume with one section changed, differently for each i"""
+    if section == 'summary':
+        return dict(resume, summary=f"{resume['summary']} Revision {i}.")
+    if section == 'skills':
+        return dict(resume, skills=[f'Skill {i}'] + resume['skills'][1:])
+    first = dict(resume[section][0], description=f"{resume[section][0]['description']} Revision {i}.")
+    return dict(resume, **{section: [first] + resume[section][1:]})
+
+
+def stranger(resume, tag):
+    """A copy of resume with every section different from any other render"""
+    for section in ('summary', 'skills', 'experience', 'projects', 'education'):
+        if section == 'education':
+            first = dict(resume[section][0], degree=f"{resume[section][0]['degree']} {tag}")
+            resume = dict(resume, education=[first] + resume[section][1:])
+        else:
+            resume = edit(resume, section, tag)
+    return resume
+
+
+def time_renders(theme, resumes, clear):
+    """Median milliseconds per render of each resume in turn"""
+    samples = []
+    for resume in resumes:
+        if clear:
+            pdf_themes.section_cache.clear()
+        start = time.perf_counter()
+        theme.render(resume, PERSONAL_INFO)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def time_pool_renders(pool, theme_name, jobs):
+    """Median milliseconds per pooled render of each (resume, personal info) in turn"""
+    samples = []
+    for resume, personal in jobs:
+        start = time.perf_counter()
+        pool.render(resume, personal, theme_name)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main_pooled(workers, repeat):
+    pool = PdfRenderPool(workers=workers, max_queue=0)
+    pool.warm()
+    print(f"{'theme':<8} {'resume':<8} {'edited':<11} {'full ms':>8} {'edit ms':>8} {'speedup':>8}  ({workers} workers)")
+    try:
+        for theme_name in pdf_themes.theme_names():
+            for name, resume in CASES:
+                strangers = [(stranger(resume, f'{theme_name}-{name}-{i}'),
+                              dict(PERSONAL_INFO, email=f'{theme_name}{name}{i}@example.com'))
+                             for i in range(repeat)]
+                full_ms = time_pool_renders(pool, theme_name, strangers)
+                for section in ('summary', 'skills', 'experience', 'projects'):
+                    pool.render(resume, PERSONAL_INFO, theme_name)
+                    edited = [(edit(resume, section, i), PERSONAL_INFO) for i in range(repeat)]
+                    edit_ms = time_pool_renders(pool, theme_name, edited)
+                    print(f'{theme_name:<8} {name:<8} {section:<11} {full_ms:>8.2f} {edit_ms:>8.2f} '
+                          f'{full_ms / edit_ms:>7.1f}x')
+    finally:
+        pool.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--repeat', type=int, default=30)
+    parser.add_argument('--workers', type=int, default=0)
+    args = parser.parse_args()
+    if args.workers > 0:
+        return main_pooled(args.workers, args.repeat)
+
+    pdf_themes.section_cache = SectionCache(max_entries=1024)
+    print(f"{'theme':<8} {'resume':<8} {'edited':<11} {'full ms':>8} {'edit ms':>8} {'speedup':>8}")
+    for theme_name in pdf_themes.theme_names():
+        theme = pdf_themes.get_theme(theme_name)
+        for name, resume in CASES:
+            theme.render(resume, PERSONAL_INFO)  # warm fonts and metrics
+            full_ms = time_renders(theme, [resume] * args.repeat, clear=True)
+            for section in ('summary', 'skills', 'experience', 'projects'):
+                theme.render(resume, PERSONAL_INFO)
+                edited = [edit(resume, section, i) for i in range(args.repeat)]
+                edit_ms = time_renders(theme, edited, clear=False)
+                print(f'{theme_name:<8} {name:<8} {section:<11} {full_ms:>8.2f} {edit_ms:>8.2f} '
+                      f'{full_ms / edit_ms:>7.1f}x')
+
+
+if __name__ == '__main__':
+    main()
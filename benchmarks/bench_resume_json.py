@@ -0,0 +1,77 @@
+"""
+Benchmark the resume JSON extractor against the legacy find/rfind parser.
+
+Reports, over the malformed-completion corpus, how many completions each
+parser recovers without a regeneration, the cost per parse, and how early
+the streaming parser emits its first section.
+
+    python -m benchmarks.bench_resume_json [--repeat N]
+"""
+
+import argparse
+import json
+import time
+
+from benchmarks.json_corpus import build_corpus
+from resume_json import extract_resume, ResumeStreamParser
+
+
+def legacy_parse(text):
+    """The original parser used by generate_resume"""
+    start_idx = text.find('{')
+    end_idx = text.rfind('}') + 1
+    return json.loads(text[start_idx:end_idx])
+
+
+def tolerant_parse(text):
+    return extract_resume(text)[0]
+
+
+def recovered(parse, text, expected):
+    try:
+        result = parse(text)
+    except ValueError:
+        return False
+    return all(result.get(key) == value for key, value in expected.items())
+
+
+def time_per_parse(parse, corpus, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for _, text, _ in corpus:
+            try:
+                parse(text)
+            except ValueError:
+                pass
+    return (time.perf_counter() - start) / (repeat * len(corpus)) * 1e6
+
+
+def first_section_offset(text, chunk_size=16):
+    """Fraction of the completion received before the first section is emitted"""
+    parser = ResumeStreamParser()
+    for i in range(0, len(text), chunk_size):
+        if parser.feed(text[i:i + chunk_size]):
+            return min(i + chunk_size, len(text)) / len(text)
+    return 1.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    corpus = build_corpus()
+    print(f'{len(corpus)} completions in corpus\n')
+    print(f"{'parser':<10} {'recovered':>10} {'us/parse':>10}")
+    for name, parse in (('legacy', legacy_parse), ('tolerant', tolerant_parse)):
+        ok = sum(recovered(parse, text, expected) for _, text, expected in corpus)
+        print(f'{name:<10} {ok:>6}/{len(corpus):<3} {time_per_parse(parse, corpus, args.repeat):>10.1f}')
+
+    whole = [text for name, text, _ in corpus if name.endswith('/clean')]
+    offsets = sorted(first_section_offset(text) for text in whole)
+    print(f'\nstreaming: first section emitted after {offsets[len(offsets) // 2]:.0%} '
+          f'of the completion (median over {len(whole)} clean resumes)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,143 @@
+"""
+Representative resumes, from minimal to maximal, used by benchmarks and tests.
+"""
+
+# Form input as posted to /api/generate-resume and /api/generate-cover-letter
+FORM_PROFILE = {
+    'name': 'Jordan Lee',
+    'email': 'jordan.lee@example.com',
+    'phone': '+1 555 010 2030',
+    'targetRole': 'Backend Developer',
+    'company': 'Northwind Labs',
+    'skills': 'Python, Flask, SQL, JavaScript, React, Docker, Git',
+    'education': 'B.Sc. Computer Science, State University, 2025',
+    'experience': 'Software engineering intern at Acme Analytics (summer 2024): built a Flask service '
+                  'ingesting partner CSV feeds. Teaching assistant for data structures.',
+    'projects': 'Course planner web app (React, Flask, PostgreSQL); CLI log analyzer in Python.'
+}
+
+PERSONAL_INFO = {
+    'name': 'Jordan Lee',
+    'email': 'jordan.lee@example.com',
+    'phone': '+1 555 010 2030'
+}
+
+MINIMAL_RESUME = {
+    'summary': 'Computer science student seeking a software internship.',
+    'skills': ['Python'],
+    'experience': [],
+    'education': [],
+    'projects': []
+}
+
+TYPICAL_RESUME = {
+    'summary': (
+        'Final-year computer science student with two internships in backend '
+        'development. Comfortable across the stack, with a focus on building '
+        'reliable APIs and data pipelines.'
+    ),
+    'skills': ['Python', 'Flask', 'SQL', 'JavaScript', 'React', 'Docker', 'Git'],
+    'experience': [
+        {
+            'title': 'Software Engineering Intern',
+            'company': 'Acme Analytics',
+            'duration': 'June 2024 - August 2024',
+            'description': 'Built a Flask service that ingests partner CSV feeds and cut manual reconciliation time by 60%.'
+        },
+        {
+            'title': 'Teaching Assistant',
+            'company': 'State University',
+            'duration': 'January 2024 - May 2024',
+            'description': 'Ran weekly lab sessions for 40 students in an introductory data structures course.'
+        }
+    ],
+    'education': [
+        {
+            'degree': 'B.Tech Computer Science',
+            'institution': 'State University',
+            'year': '2025',
+            'details': 'GPA 3.7, Dean\'s list'
+        }
+    ],
+    'projects': [
+        {
+            'name': 'Campus Marketplace',
+            'description': 'A web app for students to trade used textbooks, with search and messaging.',
+            'technologies': 'React, Flask, PostgreSQL'
+        },
+        {
+            'name': 'Image Classifier',
+            'description': 'A CNN that classifies plant diseases from leaf photos with 92% accuracy.',
+            'technologies': 'PyTorch, OpenCV'
+        }
+    ]
+}
+
+MAXIMAL_RESUME = {
+    'summary': ' '.join([TYPICAL_RESUME['summary']] * 4),
+    'skills': [
+        'Python', 'Flask', 'Django', 'FastAPI', 'SQL', 'PostgreSQL', 'Redis', 'JavaScript',
+        'TypeScript', 'React', 'Docker', 'Kubernetes', 'AWS', 'GCP', 'Terraform', 'Git'
+    ],
+    'experience': [
+        {
+            'title': f'Software Engineer {i}',
+            'company': f'Company {i}',
+            'duration': f'20{15 + i} - 20{16 + i}',
+            'description': ' '.join([TYPICAL_RESUME['experience'][0]['description']] * 3)
+        }
+        for i in range(5)
+    ],
+    'education': [
+        {
+            'degree': degree,
+            'institution': 'State University',
+            'year': year,
+            'details': 'Thesis on distributed consensus; graduate research assistant.'
+        }
+        for degree, year in (('M.S. Computer Science', '2025'), ('B.Tech Computer Science', '2023'), ('Diploma', '2019'))
+    ],
+    'projects': [
+        {
+            'name': f'Project {i}',
+            'description': ' '.join([TYPICAL_RESUME['projects'][0]['description']] * 3),
+            'technologies': 'React, Flask, PostgreSQL, Docker, Kubernetes'
+        }
+        for i in range(5)
+    ]
+}
+
+UNICODE_RESUME = {
+    'summary': 'Étudiante en informatique — passionnée par l\'IA. 数据科学与机器学习。 Ğöz ✓ «résumé» 🚀',
+    'skills': ['Python 🐍', 'Машинное обучение', 'データ分析', 'Análisis', 'Ελληνικά'],
+    'experience': [
+        {
+            'title': 'Stagiaire R&D',
+            'company': 'Société Générale d\'Études',
+            'duration': '2024 – 2025',
+            'description': 'Développement d\'outils internes et automatisation — 数据管道 ✓'
+        }
+    ],
+    'education': [
+        {
+            'degree': 'Licence Informatique',
+            'institution': 'Université Paris-Saclay',
+            'year': '2024',
+            'details': 'Mention très bien — 🎓'
+        }
+    ],
+    'projects': [
+        {
+            'name': 'Traducteur 翻訳',
+            'description': 'Outil de traduction multilingue (français ⇄ 日本語 ⇄ русский).',
+            'technologies': 'PyTorch, spaCy'
+        }
+    ]
+}
+
+RESUMES = {
+    'minimal': MINIMAL_RESUME,
+    'typical': TYPICAL_RESUME,
+    'maximal': MAXIMAL_RESUME,
+    'unicode': UNICODE_RESUME
+}
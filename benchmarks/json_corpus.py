@@ -0,0 +1,79 @@
+"""
+Corpus of malformed model completions for the resume JSON extractor.
+
+Each case is (name, text, expected) where expected holds the sections the
+extractor must recover exactly. Truncated cases are generated from seeded
+random cut points, so the corpus is stable across runs.
+"""
+
+import json
+import random
+import re
+
+from benchmarks.fixtures import RESUMES
+from resume_json import RESUME_SECTIONS
+
+
+def _with_comments(text):
+    return re.sub(r'\n    "(\w+)":', lambda m: f"\n    // {m.group(1)} section, it's generated\n    \"{m.group(1)}\":", text)
+
+
+def _with_trailing_commas(text):
+    return re.sub(r'(["\]\}\d])(\n\s*[\]\}])', r'\1,\2', text)
+
+
+def _section_ends(text, resume):
+    """Map each top-level section to the offset where its value ends"""
+    ends = {}
+    keys = list(resume)
+    for i, key in enumerate(keys):
+        if i + 1 < len(keys):
+            ends[key] = text.index(f',\n    "{keys[i + 1]}"')
+        else:
+            ends[key] = text.rindex('\n}')
+    return ends
+
+
+def mutations(resume):
+    """Yield (name, text, expected) for one clean resume"""
+    clean = json.dumps(resume, indent=4, ensure_ascii=False)
+
+    yield 'clean', clean, resume
+    yield 'code_fence', f'```json\n{clean}\n```', resume
+    yield 'prose', f"Here is the tailored resume:\n\n{clean}\n\nLet me know if you'd like any changes!", resume
+    yield 'trailing_commas', _with_trailing_commas(clean), resume
+    yield 'comments', _with_comments(clean), resume
+    yield 'second_block', clean + '\n\nAlternatively: {"summary": "A shorter summary"}', resume
+    yield 'placeholder_block', 'Resume for the {target_role} role:\n' + clean, resume
+    yield 'python_literals', repr(resume), resume
+
+    multiline = dict(resume, summary=resume['summary'] + '\nOpen to relocation.')
+    raw = json.dumps(multiline, indent=4, ensure_ascii=False).replace('\\n', '\n')
+    yield 'raw_newlines', raw, multiline
+
+    unquoted = re.sub(r'\n    "(\w+)":', r'\n    \1:', clean)
+    yield 'unquoted_keys', unquoted, resume
+
+
+def truncations(resume, count, rng):
+    """Yield completions cut at random points, expecting every whole section"""
+    clean = json.dumps(resume, indent=4, ensure_ascii=False)
+    ends = _section_ends(clean, resume)
+    first_end = min(ends.values())
+    for _ in range(count):
+        cut = rng.randint(first_end, len(clean) - 1)
+        expected = {key: resume[key] for key, end in ends.items() if end <= cut}
+        yield f'truncated_{cut}', clean[:cut], expected
+
+
+def build_corpus(seed=0, truncations_per_resume=15):
+    """Return the full list of (name, text, expected) cases"""
+    rng = random.Random(seed)
+    corpus = []
+    for resume_name, resume in RESUMES.items():
+        resume = {key: resume[key] for key in RESUME_SECTIONS}
+        for name, text, expected in mutations(resume):
+            corpus.append((f'{resume_name}/{name}', text, expected))
+        for name, text, expected in truncations(resume, truncations_per_resume, rng):
+            corpus.append((f'{resume_name}/{name}', text, expected))
+    return corpus
@@ -0,0 +1,260 @@
+"""
+End-to-end load test of the generation and PDF endpoints.
+
+Starts the stub Grok server, launches app.py or main.py against it, and
+drives /api/generate-resume, /api/generate-cover-letter and
+/api/download-pdf at each concurrency level. Throughput and p50/p95/p99
+latency per endpoint are written to a JSON file that can be diffed between
+commits:
+
+    python -m benchmarks.load_test --target app --concurrency 1,8,32 --output load_app.json
+
+Use --base-url to drive an already running server (for example under
+gunicorn or uvicorn) instead; it must already point at a stub or real API.
+"""
+
+import argparse
+import datetime
+import functools
+import itertools
+import json
+import math
+import os
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from benchmarks.fixtures import FORM_PROFILE, PERSONAL_INFO, TYPICAL_RESUME
+from benchmarks.stub_grok import add_stub_arguments, stub_from_args
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ENDPOINTS = {
+    'generate-resume': '/api/generate-resume',
+    'generate-cover-letter': '/api/generate-cover-letter',
+    'download-pdf': '/api/download-pdf'
+}
+
+
+# Numbers the PDF request bodies, so each one is a distinct document
+_sequence = itertools.count()
+
+
+def request_body(endpoint, use_cache):
+    if endpoint == 'download-pdf':
+        personal_info = PERSONAL_INFO
+        if not use_cache:
+            # A repeated body would be served from the PDF cache, not rendered
+            personal_info = dict(PERSONAL_INFO, name=f"{PERSONAL_INFO['name']} {next(_sequence)}")
+        return {'resumeData': TYPICAL_RESUME, 'personalInfo': personal_info}
+    body = dict(FORM_PROFILE)
+    if not use_cache:
+        body['noCache'] = True
+    return body
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an ascending list"""
+    if not sorted_values:
+        return None
+    rank = max(math.ceil(pct / 100 * len(sorted_values)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+def summarize(latencies, statuses, elapsed):
+    """Turn raw per-request samples into the reported figures"""
+    ok = sorted(latency for latency, status in zip(latencies, statuses) if status == 200)
+    counts = {}
+    for status in statuses:
+        counts[str(status)] = counts.get(str(status), 0) + 1
+
+    def ms(value):
+        return None if value is None else round(value * 1000, 2)
+
+    return {
+        'requests': len(statuses),
+        'errors': len(statuses) - len(ok),
+        'status_counts': counts,
+        'throughput_rps': round(len(ok) / elapsed, 2) if elapsed else None,
+        'mean_ms': ms(sum(ok) / len(ok)) if ok else None,
+        'p50_ms': ms(percentile(ok, 50)),
+        'p95_ms': ms(percentile(ok, 95)),
+        'p99_ms': ms(percentile(ok, 99)),
+        'max_ms': ms(ok[-1]) if ok else None
+    }
+
+
+class LoadClient:
+    """Per-thread HTTP sessions that share the login cookies"""
+
+    def __init__(self, base_url, cookies=None):
+        self.base_url = base_url.rstrip('/')
+        self.cookies = cookies
+        self._local = threading.local()
+
+    def session(self):
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = requests.Session()
+            if self.cookies is not None:
+                session.cookies.update(self.cookies)
+        return session
+
+    def post(self, path, body):
+        """Send one request; return (latency_seconds, status)"""
+        start = time.perf_counter()
+        try:
+            response = self.session().post(self.base_url + path, json=body, timeout=120, allow_redirects=False)
+            response.content
+            status = response.status_code
+            if status == 200 and response.headers.get('Content-Type', '').startswith('application/json'):
+                if response.json().get('success') is False:
+                    status = 'failed'
+        except requests.RequestException as e:
+            status = type(e).__name__
+        return time.perf_counter() - start, status
+
+
+def run_level(client, path, make_body, concurrency, total):
+    """Keep `concurrency` requests in flight until `total` have completed"""
+    bodies = [make_body() for _ in range(total)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        samples = list(pool.map(lambda body: client.post(path, body), bodies))
+    elapsed = time.perf_counter() - start
+    latencies = [latency for latency, _ in samples]
+    statuses = [status for _, status in samples]
+    return summarize(latencies, statuses, elapsed)
+
+
+def login(base_url):
+    """Register and log in a throwaway user; return the session cookies"""
+    session = requests.Session()
+    username = f'loadtest-{uuid.uuid4().hex[:10]}'
+    password = uuid.uuid4().hex
+    session.post(f'{base_url}/register', data={
+        'username': username,
+        'email': f'{username}@example.com',
+        'password': password,
+        'full_name': 'Load Test'
+    })
+    response = session.post(f'{base_url}/login', data={'username': username, 'password': password},
+                            allow_redirects=False)
+    if response.status_code != 302 or '/login' in response.headers.get('Location', ''):
+        raise RuntimeError('Could not log in to the target app')
+    return session.cookies
+
+
+def launch_target(target, port, grok_url):
+    """Start app.py or main.py on port, pointed at the stub Grok server"""
+    env = dict(os.environ, PORT=str(port), XAI_API_KEY='stub-key', GROK_API_URL=grok_url)
+    process = subprocess.Popen([sys.executable, f'{target}.py'], cwd=ROOT, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    base_url = f'http://127.0.0.1:{port}'
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f'{target}.py exited with status {process.returncode}')
+        try:
+            requests.get(base_url + '/', timeout=1, allow_redirects=False)
+            return process, base_url
+        except requests.ConnectionError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError(f'{target}.py did not start listening on port {port}')
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(args, base_url, stub=None):
+    cookies = login(base_url) if args.login else None
+    client = LoadClient(base_url, cookies)
+    results = {}
+
+    for endpoint in args.endpoints:
+        path = ENDPOINTS[endpoint]
+        make_body = functools.partial(request_body, endpoint, args.cache)
+        for _ in range(args.warmup):
+            client.post(path, make_body())
+        results[endpoint] = {}
+        for concurrency in args.concurrency:
+            summary = run_level(client, path, make_body, concurrency, args.requests)
+            results[endpoint][str(concurrency)] = summary
+            print(f"{endpoint:<22} c={concurrency:<4} {summary['throughput_rps'] or 0:>8.1f} req/s  "
+                  f"p50 {summary['p50_ms']} ms  p95 {summary['p95_ms']} ms  p99 {summary['p99_ms']} ms  "
+                  f"errors {summary['errors']}")
+
+    try:
+        app_metrics = client.session().get(base_url + '/api/metrics', timeout=5).json()
+    except (requests.RequestException, ValueError):
+        app_metrics = None
+
+    return {
+        'target': args.target if not args.base_url else args.base_url,
+        'commit': git_commit(),
+        'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'settings': {
+            'concurrency': args.concurrency,
+            'requests_per_level': args.requests,
+            'warmup': args.warmup,
+            'cache': args.cache
+        },
+        'stub': stub.stats() if stub is not None else None,
+        'results': results,
+        'app_metrics': app_metrics
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--target', choices=('app', 'main'), default='app', help='entry point to launch')
+    parser.add_argument('--base-url', help='drive an already running server instead of launching one')
+    parser.add_argument('--port', type=int, default=5055, help='port for the launched app')
+    parser.add_argument('--endpoints', default=','.join(ENDPOINTS),
+                        type=lambda value: [name for name in value.split(',') if name])
+    parser.add_argument('--concurrency', default='1,8,32',
+                        type=lambda value: [int(level) for level in value.split(',')])
+    parser.add_argument('--requests', type=int, default=100, help='requests per endpoint and level')
+    parser.add_argument('--warmup', type=int, default=3)
+    parser.add_argument('--cache', action='store_true', help='allow cached generations and PDFs (by default noCache is sent and every PDF differs)')
+    parser.add_argument('--login', action=argparse.BooleanOptionalAction, default=None,
+                        help='register and log in first (default: on for app.py)')
+    parser.add_argument('--output', default='load_test_results.json')
+    add_stub_arguments(parser)
+    args = parser.parse_args()
+
+    unknown = set(args.endpoints) - set(ENDPOINTS)
+    if unknown:
+        parser.error(f"unknown endpoints: {', '.join(sorted(unknown))}")
+    if args.login is None:
+        args.login = not args.base_url and args.target == 'app'
+
+    if args.base_url:
+        report = run(args, args.base_url)
+    else:
+        with stub_from_args(args) as stub:
+            process, base_url = launch_target(args.target, args.port, stub.url)
+            try:
+                report = run(args, base_url, stub)
+            finally:
+                process.terminate()
+                process.wait(timeout=10)
+
+    with open(args.output, 'w', encoding='utf-8') as handle:
+        json.dump(report, handle, indent=2, sort_keys=True)
+        handle.write('\n')
+    print(f'\nResults written to {args.output}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,252 @@
+"""
+Local stand-in for the xAI chat-completions API.
+
+Speaks the /v1/chat/completions protocol GROK_API_URL points at, including
+streamed (SSE) completions, with configurable latency, error rate and
+defective bodies, so the app can be load-tested without the live API:
+
+    python -m benchmarks.stub_grok --port 8099 --latency lognormal:800,0.4
+    GROK_API_URL=http://127.0.0.1:8099/v1/chat/completions XAI_API_KEY=stub python app.py
+
+Latency specs are in milliseconds: fixed:MS, uniform:LO,HI, normal:MEAN,SD
+or lognormal:MEDIAN,SIGMA. Streamed responses spend the sampled latency
+before the first token, then --token-interval between chunks.
+GET /stats returns request counters.
+"""
+
+import argparse
+import json
+import math
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from benchmarks.fixtures import TYPICAL_RESUME
+from benchmarks.json_corpus import build_corpus
+
+COVER_LETTER_TEXT = """Dear Hiring Manager,
+
+I am excited to apply for this role. My coursework and internship work in backend development have prepared me to contribute from day one.
+
+At Acme Analytics I built a Flask service that ingests partner CSV feeds and cut manual reconciliation time by 60%.
+
+Thank you for your consideration.
+
+Sincerely,
+Jordan Lee"""
+
+GARBAGE_TEXT = "I'm sorry, but I can't produce a resume from the details provided."
+
+
+class LatencyDistribution:
+    """Sample request latencies (seconds) from a spec such as 'uniform:100,300'"""
+
+    def __init__(self, spec='fixed:0'):
+        self.spec = spec
+        kind, _, raw = spec.partition(':')
+        expected = {'fixed': 1, 'uniform': 2, 'normal': 2, 'lognormal': 2}
+        try:
+            values = [float(value) for value in raw.split(',')]
+        except ValueError:
+            values = []
+        if kind not in expected or len(values) != expected[kind]:
+            raise ValueError(f'Invalid latency spec: {spec!r}')
+        self.kind = kind
+        # Everything is in milliseconds except the lognormal sigma
+        self.params = [value if kind == 'lognormal' and i == 1 else value / 1000
+                       for i, value in enumerate(values)]
+
+    def sample(self, rng):
+        if self.kind == 'fixed':
+            return self.params[0]
+        if self.kind == 'uniform':
+            return rng.uniform(*self.params)
+        if self.kind == 'normal':
+            return max(rng.gauss(*self.params), 0.0)
+        median, sigma = self.params
+        return rng.lognormvariate(math.log(median), sigma) if median > 0 else 0.0
+
+
+class StubGrokHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Headers and body are separate writes; don't let Nagle add ~40ms to each
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        if self.path.rstrip('/') != '/stats':
+            self._send_json(404, {'error': 'Not found'})
+            return
+        self._send_json(200, self.server.stats())
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+        stub = self.server
+        outcome, content, delay = stub.plan(payload)
+        time.sleep(delay)
+
+        if outcome == 'error':
+            self._send_json(stub.error_status, {'error': {'message': 'Stub upstream failure'}})
+        elif payload.get('stream'):
+            self._send_stream(content)
+        else:
+            self._send_json(200, {
+                'id': 'stub-completion',
+                'object': 'chat.completion',
+                'model': payload.get('model', 'grok-beta'),
+                'choices': [{'index': 0, 'message': {'role': 'assistant', 'content': content}, 'finish_reason': 'stop'}]
+            })
+
+    def _send_json(self, status, body):
+        encoded = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(encoded)))
+        self.end_headers()
+        self.wfile.write(encoded)
+
+    def _send_stream(self, content):
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        size = self.server.chunk_chars
+        for i in range(0, len(content), size):
+            if i:
+                time.sleep(self.server.token_interval)
+            chunk = {'choices': [{'index': 0, 'delta': {'content': content[i:i + size]}}]}
+            self._write_chunk(f'data: {json.dumps(chunk)}\n\n')
+        self._write_chunk('data: [DONE]\n\n')
+        self.wfile.write(b'0\r\n\r\n')
+
+    def _write_chunk(self, text):
+        data = text.encode()
+        self.wfile.write(f'{len(data):x}\r\n'.encode() + data + b'\r\n')
+        self.wfile.flush()
+
+    def log_message(self, *args):
+        pass
+
+
+class StubGrokServer(ThreadingHTTPServer):
+    """Threaded stub server; use as a context manager or call start()/stop()"""
+
+    daemon_threads = True
+
+    def __init__(self, host='127.0.0.1', port=0, latency='fixed:0', error_rate=0.0, error_status=500,
+                 malformed_rate=0.0, garbage_rate=0.0, token_interval=0.0, chunk_chars=16,
+                 resume_body=None, seed=None):
+        super().__init__((host, port), StubGrokHandler)
+        self.latency = LatencyDistribution(latency) if isinstance(latency, str) else latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.malformed_rate = malformed_rate
+        self.garbage_rate = garbage_rate
+        self.token_interval = token_interval
+        self.chunk_chars = chunk_chars
+        self.resume_body = resume_body or json.dumps(TYPICAL_RESUME, indent=4)
+        self._malformed = [text for name, text, _ in build_corpus() if not name.endswith('/clean')]
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._counters = {'requests': 0, 'streamed': 0, 'errors': 0, 'malformed': 0, 'garbage': 0}
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f'http://{host}:{port}/v1/chat/completions'
+
+    def plan(self, payload):
+        """Decide (outcome, content, delay) for one request"""
+        prompt = ' '.join(str(message.get('content', '')) for message in payload.get('messages', []))
+        wants_resume = 'JSON' in prompt
+        with self._lock:
+            self._counters['requests'] += 1
+            if payload.get('stream'):
+                self._counters['streamed'] += 1
+            delay = self.latency.sample(self._rng)
+            roll = self._rng.random()
+            if roll < self.error_rate:
+                self._counters['errors'] += 1
+                return 'error', None, delay
+            roll -= self.error_rate
+            if wants_resume and roll < self.garbage_rate:
+                self._counters['garbage'] += 1
+                return 'ok', GARBAGE_TEXT, delay
+            roll -= self.garbage_rate
+            if wants_resume and roll < self.malformed_rate:
+                self._counters['malformed'] += 1
+                return 'ok', self._rng.choice(self._malformed), delay
+        return 'ok', self.resume_body if wants_resume else COVER_LETTER_TEXT, delay
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._counters)
+        stats.update({
+            'latency': self.latency.spec,
+            'error_rate': self.error_rate,
+            'malformed_rate': self.malformed_rate,
+            'garbage_rate': self.garbage_rate
+        })
+        return stats
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def add_stub_arguments(parser):
+    """Register the stub's behaviour flags on an argparse parser"""
+    parser.add_argument('--latency', default='lognormal:800,0.4', help='latency spec in ms (see module docs)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='fraction of requests answered with an error')
+    parser.add_argument('--error-status', type=int, default=500)
+    parser.add_argument('--malformed-rate', type=float, default=0.0,
+                        help='fraction of resumes returned with repairable JSON defects')
+    parser.add_argument('--garbage-rate', type=float, default=0.0,
+                        help='fraction of resumes returned as prose with no JSON')
+    parser.add_argument('--token-interval', type=float, default=20.0, help='ms between streamed chunks')
+    parser.add_argument('--resume-body', help='file whose contents replace the canned resume completion')
+    parser.add_argument('--seed', type=int, default=0)
+
+
+def stub_from_args(args, host='127.0.0.1', port=0):
+    resume_body = None
+    if args.resume_body:
+        with open(args.resume_body, encoding='utf-8') as handle:
+            resume_body = handle.read()
+    return StubGrokServer(host, port, latency=args.latency, error_rate=args.error_rate,
+                          error_status=args.error_status, malformed_rate=args.malformed_rate,
+                          garbage_rate=args.garbage_rate, token_interval=args.token_interval / 1000,
+                          resume_body=resume_body, seed=args.seed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8099)
+    add_stub_arguments(parser)
+    args = parser.parse_args()
+
+    server = stub_from_args(args, args.host, args.port)
+    print(f'Stub Grok API listening on {server.url}')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
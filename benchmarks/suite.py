@@ -0,0 +1,290 @@
+"""
+Regression benchmarks for the PDF and resume-generation hot paths.
+
+Every case runs once per fixture resume (minimal, typical, maximal, unicode):
+
+    download_pdf/<resume>     POST /api/download-pdf on main.app, rendered inline with nothing cached
+    generate_pdf/<resume>     the Streamlit app's generate_pdf (modern theme, compact) on a cache miss
+    parse_resume/<resume>     parse_resume_content on a model completion holding the resume
+    generate_resume/<resume>  POST /api/generate-resume, answered by an in-process stand-in for Grok
+
+and records the median wall time, the tracemalloc peak and the number of
+memory blocks the call allocated that were still held when it returned (with
+the cyclic GC paused, so this counts cyclic garbage too: a stable proxy for
+allocation churn). Nothing touches the network.
+
+Baselines live in benchmarks/baselines.json. compare re-runs the suite
+--runs times (or reads --current), takes each case's median across the runs,
+and exits 1 when a case is slower or heavier than its baseline by more than
+the threshold. A wall-time change must also clear the case's noise band: the
+spread of its run medians and three times the median absolute deviation of
+its samples, so timer jitter on a busy machine is not reported as a
+regression.
+
+    python -m benchmarks.suite run [--repeat N] [--runs N] [--only download_pdf] [--output results.json]
+    python -m benchmarks.suite run --save-baseline
+    python -m benchmarks.suite compare [--current results.json] [--threshold 0.10] [--time-threshold 0.30]
+"""
+
+import argparse
+import datetime
+import gc
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+# main starts a render pool on import; the benchmarks render inline instead
+os.environ.setdefault('PDF_RENDER_WORKERS', '0')
+
+import main  # noqa: E402
+import pdf_themes  # noqa: E402
+from benchmarks.fixtures import FORM_PROFILE, PERSONAL_INFO, RESUMES  # noqa: E402
+from pdf_cache import PdfCache, pdf_key  # noqa: E402
+from pdf_pool import PdfRenderPool  # noqa: E402
+from pdf_sections import SectionCache  # noqa: E402
+from pdf_themes import get_theme  # noqa: E402
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines.json')
+
+METRICS = ('ms', 'peak_kib', 'blocks')
+
+# Wall-time changes smaller than this are timer noise, whatever the percentage
+TIME_FLOOR_MS = 0.05
+
+
+def model_completion(resume):
+    """A resume as Grok typically returns it: JSON in a fenced block between prose"""
+    body = json.dumps(resume, indent=4, ensure_ascii=False)
+    return f"Here is the tailored resume in JSON format:\n\n```json\n{body}\n```\n\nLet me know if you want any changes."
+
+
+class StubGrokClient:
+    """Stand-in for GrokClient that answers every completion with fixed text"""
+
+    def __init__(self, completion):
+        self.completion = completion
+
+    def chat_completion(self, **kwargs):
+        return self.completion
+
+    def stats(self):
+        return {}
+
+
+@contextmanager
+def patched(target, **attributes):
+    saved = {name: getattr(target, name) for name in attributes}
+    for name, value in attributes.items():
+        setattr(target, name, value)
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            setattr(target, name, value)
+
+
+def download_pdf_case(resume):
+    client = main.app.test_client()
+    body = {'resumeData': resume, 'personalInfo': PERSONAL_INFO}
+
+    def run():
+        pdf_themes.section_cache.clear()
+        response = client.post('/api/download-pdf', json=body)
+        assert response.status_code == 200, response.data[:200]
+    return run
+
+
+def generate_pdf_case(resume):
+    # streamlit_app.generate_pdf, which cannot be imported outside `streamlit run`
+    theme = get_theme('modern')
+
+    def run():
+        pdf_themes.section_cache.clear()
+        cache = PdfCache(max_bytes=0)
+        key = pdf_key(resume, PERSONAL_INFO, theme, compact=True)
+        cache.get_or_render(key, lambda: theme.render(resume, PERSONAL_INFO, compact=True).getvalue())
+    return run
+
+
+def parse_resume_case(resume):
+    completion = model_completion(resume)
+
+    def run():
+        main.generator.parse_resume_content(completion)
+    return run
+
+
+def generate_resume_case(resume):
+    client = main.app.test_client()
+    body = dict(FORM_PROFILE, noCache=True)
+
+    def run():
+        response = client.post('/api/generate-resume', json=body)
+        assert response.json['tier'] == 'grok', response.json
+    return run
+
+
+CASES = {
+    'download_pdf': download_pdf_case,
+    'generate_pdf': generate_pdf_case,
+    'parse_resume': parse_resume_case,
+    'generate_resume': generate_resume_case
+}
+
+
+def measure(run, repeat):
+    """Median wall ms over repeat calls, then peak KiB and held blocks of one traced call"""
+    run()  # warm imports, fonts and metric caches
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        samples.append((time.perf_counter() - start) * 1000)
+
+    gc.collect()
+    gc.disable()
+    tracemalloc.start()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+        blocks = len(tracemalloc.take_snapshot().traces)
+    finally:
+        tracemalloc.stop()
+        gc.enable()
+    median = statistics.median(samples)
+    mad = statistics.median(abs(sample - median) for sample in samples)
+    return {'ms': round(median, 3), 'ms_mad': round(mad, 3), 'peak_kib': round(peak / 1024, 1), 'blocks': blocks}
+
+
+def run_suite(repeat=20, only=None):
+    """Run every case (or those whose name starts with only); returns a results dict"""
+    results = {}
+    logging.disable(logging.WARNING)
+    try:
+        for case, build in CASES.items():
+            if only and not case.startswith(only):
+                continue
+            for name, resume in RESUMES.items():
+                # Every case measures a full render: no PDF or section cache hits
+                with patched(main, pdf_cache=PdfCache(max_bytes=0), pdf_pool=PdfRenderPool(workers=0),
+                             GROK_API_KEY='offline-benchmark'), \
+                        patched(main.generator, cache=main.GenerationCache(),
+                                grok_client=StubGrokClient(model_completion(resume))), \
+                        patched(pdf_themes, section_cache=SectionCache()):
+                    results[f'{case}/{name}'] = measure(build(resume), repeat)
+    finally:
+        logging.disable(logging.NOTSET)
+    return {
+        'created': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'repeat': repeat,
+        'cases': results
+    }
+
+
+def run_repeatedly(runs, repeat=20, only=None):
+    """run_suite() runs times; each metric is the median across runs, ms_spread their ms range"""
+    results = [run_suite(repeat, only) for _ in range(max(runs, 1))]
+    merged = dict(results[-1], runs=len(results), cases={})
+    for case in results[-1]['cases']:
+        measured = [result['cases'][case] for result in results]
+        merged['cases'][case] = {metric: statistics.median_low(m[metric] for m in measured)
+                                 for metric in measured[0]}
+        timings = [m['ms'] for m in measured]
+        merged['cases'][case]['ms_spread'] = round(max(timings) - min(timings), 3)
+    return merged
+
+
+def noise_band(*measurements):
+    """Wall-time change (ms) that the measurements cannot tell apart from noise"""
+    band = TIME_FLOOR_MS
+    for measured in measurements:
+        band = max(band, measured.get('ms_spread', 0), 3 * measured.get('ms_mad', 0))
+    return band
+
+
+def compare(baseline, current, threshold=0.10, time_threshold=0.30):
+    """Rows of (case, metric, baseline, current, change, regressed) for cases in both"""
+    rows = []
+    for case, measured in current['cases'].items():
+        expected = baseline['cases'].get(case)
+        if expected is None:
+            continue
+        for metric in METRICS:
+            before, after = expected[metric], measured[metric]
+            change = (after - before) / before if before else 0.0
+            if metric == 'ms':
+                regressed = change > time_threshold and after - before > noise_band(expected, measured)
+            else:
+                regressed = change > threshold
+            rows.append((case, metric, before, after, change, regressed))
+    return rows
+
+
+def print_results(results):
+    print(f"{'case':<26} {'ms':>9} {'peak KiB':>9} {'blocks':>8}")
+    for case, measured in results['cases'].items():
+        print(f"{case:<26} {measured['ms']:>9.2f} {measured['peak_kib']:>9.1f} {measured['blocks']:>8}")
+
+
+def load(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save(results, path):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def main_cli(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run = commands.add_parser('run', help='run the suite and print the results')
+    run.add_argument('--output', help='also write the results to this JSON file')
+    run.add_argument('--save-baseline', action='store_true', help=f'overwrite {BASELINE_PATH}')
+
+    check = commands.add_parser('compare', help='compare against the baselines; exit 1 on a regression')
+    check.add_argument('--baseline', default=BASELINE_PATH)
+    check.add_argument('--current', help='results file to compare instead of running the suite')
+    check.add_argument('--threshold', type=float, default=0.10, help='allowed growth of peak KiB and blocks')
+    check.add_argument('--time-threshold', type=float, default=0.30, help='allowed growth of wall time')
+
+    for command in (run, check):
+        command.add_argument('--repeat', type=int, default=20)
+        command.add_argument('--runs', type=int, default=3, help='suite runs to take the median of')
+        command.add_argument('--only', help='run only cases whose name starts with this')
+    args = parser.parse_args(argv)
+
+    if args.command == 'run':
+        results = run_repeatedly(args.runs, args.repeat, args.only)
+        print_results(results)
+        if args.output:
+            save(results, args.output)
+        if args.save_baseline:
+            save(results, BASELINE_PATH)
+        return 0
+
+    baseline = load(args.baseline)
+    current = load(args.current) if args.current else run_repeatedly(args.runs, args.repeat, args.only)
+    rows = compare(baseline, current, args.threshold, args.time_threshold)
+    print(f"{'case':<26} {'metric':<9} {'baseline':>10} {'current':>10} {'change':>8}")
+    for case, metric, before, after, change, regressed in rows:
+        flag = '  REGRESSION' if regressed else ''
+        print(f'{case:<26} {metric:<9} {before:>10} {after:>10} {change:>+8.1%}{flag}')
+    regressions = sum(row[-1] for row in rows)
+    print(f'\n{regressions} regression(s) in {len(rows)} measurements')
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main_cli())
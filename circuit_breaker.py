@@ -0,0 +1,316 @@
+"""
+Circuit breaker, latency budget and request hedging for upstream Grok calls.
+
+While Grok is healthy every call goes through. When the recent error rate or
+tail latency crosses its threshold the breaker opens and callers are told to
+serve the deterministic template instantly instead of waiting on a failing
+upstream. After a cool-down a single probe call is let through (half-open);
+its outcome closes or re-opens the circuit.
+
+Two optional knobs bound the wait on a healthy-but-slow upstream:
+a hedge delay sends a second identical request if the first has not answered
+in time (the first answer wins), and a latency budget gives up waiting and
+serves the template while the upstream call finishes in the background.
+"""
+
+import asyncio
+import logging
+import math
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+logger = logging.getLogger(__name__)
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+# Which tier produced a response, reported to clients as "tier"
+TIER_CACHE = 'cache'
+TIER_GROK = 'grok'
+TIER_TEMPLATE = 'template'
+
+
+class BudgetExceeded(Exception):
+    """Raised when no upstream answer arrived within the latency budget"""
+
+
+def _optional_float(name):
+    value = os.getenv(name)
+    return float(value) if value else None
+
+
+class CircuitBreaker:
+    """Track upstream health and gate, hedge and time-box calls"""
+
+    def __init__(self, window=None, min_calls=None, error_threshold=None, latency_threshold=None,
+                 latency_percentile=None, open_seconds=None, hedge_delay=None, latency_budget=None,
+                 max_workers=None, clock=time.monotonic):
+        if window is None:
+            window = int(os.getenv('BREAKER_WINDOW', 50))
+        if min_calls is None:
+            min_calls = int(os.getenv('BREAKER_MIN_CALLS', 10))
+        if error_threshold is None:
+            error_threshold = float(os.getenv('BREAKER_ERROR_RATE', 0.5))
+        if latency_threshold is None:
+            latency_threshold = float(os.getenv('BREAKER_LATENCY_THRESHOLD', 30))
+        if latency_percentile is None:
+            latency_percentile = float(os.getenv('BREAKER_LATENCY_PERCENTILE', 95))
+        if open_seconds is None:
+            open_seconds = float(os.getenv('BREAKER_OPEN_SECONDS', 30))
+        if hedge_delay is None:
+            hedge_delay = _optional_float('GROK_HEDGE_DELAY')
+        if latency_budget is None:
+            latency_budget = _optional_float('GROK_LATENCY_BUDGET')
+        if max_workers is None:
+            max_workers = int(os.getenv('BREAKER_MAX_WORKERS', 32))
+
+        self.min_calls = min_calls
+        self.error_threshold = error_threshold
+        self.latency_threshold = latency_threshold
+        self.latency_percentile = latency_percentile
+        self.open_seconds = open_seconds
+        self.hedge_delay = hedge_delay or None
+        self.latency_budget = latency_budget or None
+        self.max_workers = max_workers
+        self._clock = clock
+
+        self._lock = threading.Lock()
+        self._outcomes = deque(maxlen=window)
+        self._state = CLOSED
+        self._opened_at = None
+        self._probe_in_flight = False
+        self._probe_started = None
+        self._executor = None
+        self._counters = {
+            'successes': 0,
+            'failures': 0,
+            'trips': 0,
+            'short_circuited': 0,
+            'fallbacks': 0,
+            'hedges_sent': 0,
+            'hedges_won': 0,
+            'budget_exceeded': 0
+        }
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self):
+        if self._state == OPEN and self._clock() - self._opened_at >= self.open_seconds:
+            self._state = HALF_OPEN
+            self._probe_in_flight = False
+        return self._state
+
+    def allow_request(self):
+        """True if a call may go upstream now; False means serve the template"""
+        with self._lock:
+            state = self._current_state()
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN:
+                # A probe that never reported back (e.g. a dropped stream) is
+                # given up on after another cool-down
+                now = self._clock()
+                if not self._probe_in_flight or now - self._probe_started >= self.open_seconds:
+                    self._probe_in_flight = True
+                    self._probe_started = now
+                    return True
+            self._counters['short_circuited'] += 1
+            return False
+
+    def record_success(self, latency):
+        with self._lock:
+            self._counters['successes'] += 1
+            if self._state == HALF_OPEN:
+                self._close()
+                return
+            self._outcomes.append((True, latency))
+            self._evaluate()
+
+    def record_failure(self, latency):
+        with self._lock:
+            self._counters['failures'] += 1
+            if self._state == HALF_OPEN:
+                self._trip()
+                return
+            self._outcomes.append((False, latency))
+            self._evaluate()
+
+    def record_fallback(self):
+        """Count a response served by the template because of this breaker"""
+        with self._lock:
+            self._counters['fallbacks'] += 1
+
+    def _evaluate(self):
+        if self._state != CLOSED or len(self._outcomes) < self.min_calls:
+            return
+        if self._error_rate() >= self.error_threshold or self._latency_percentile() >= self.latency_threshold:
+            self._trip()
+
+    def _error_rate(self):
+        if not self._outcomes:
+            return 0.0
+        return sum(1 for ok, _ in self._outcomes if not ok) / len(self._outcomes)
+
+    def _latency_percentile(self):
+        latencies = sorted(latency for _, latency in self._outcomes)
+        if not latencies:
+            return 0.0
+        rank = max(math.ceil(self.latency_percentile / 100 * len(latencies)) - 1, 0)
+        return latencies[rank]
+
+    def _trip(self):
+        self._state = OPEN
+        self._opened_at = self._clock()
+        self._probe_in_flight = False
+        self._counters['trips'] += 1
+
+    def _close(self):
+        self._state = CLOSED
+        self._opened_at = None
+        self._probe_in_flight = False
+        self._outcomes.clear()
+
+    def call(self, fn, fallback):
+        """Run fn() under the breaker; return (result, tier)
+
+        Any failure, an open circuit or an exhausted latency budget yields
+        (fallback(), TIER_TEMPLATE) instead of an exception.
+        """
+        if not self.allow_request():
+            self.record_fallback()
+            return fallback(), TIER_TEMPLATE
+
+        start = self._clock()
+        try:
+            if self.hedge_delay is None and self.latency_budget is None:
+                result = fn()
+            else:
+                result = self._call_hedged(fn, start)
+        except Exception as e:
+            # A blown latency budget counts against upstream health too
+            logger.warning('Upstream call failed, serving template: %s', e)
+            self.record_failure(self._clock() - start)
+            self.record_fallback()
+            return fallback(), TIER_TEMPLATE
+
+        self.record_success(self._clock() - start)
+        return result, TIER_GROK
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                    thread_name_prefix='grok-call')
+            return self._executor
+
+    def _deadlines(self, start):
+        hedge_at = None if self.hedge_delay is None else start + self.hedge_delay
+        deadline = None if self.latency_budget is None else start + self.latency_budget
+        return hedge_at, deadline
+
+    def _next_step(self, calls, hedge_at, deadline):
+        """Decide what a hedged call does next: ('done', call), ('hedge', None),
+        ('expired', None) or ('wait', timeout)"""
+        for call in calls:
+            if call.done() and call.exception() is None:
+                if call is not calls[0]:
+                    with self._lock:
+                        self._counters['hedges_won'] += 1
+                return 'done', call
+        if all(call.done() for call in calls):
+            raise calls[-1].exception()
+
+        now = self._clock()
+        can_hedge = hedge_at is not None and len(calls) == 1
+        if can_hedge and now >= hedge_at:
+            with self._lock:
+                self._counters['hedges_sent'] += 1
+            return 'hedge', None
+        if deadline is not None and now >= deadline:
+            with self._lock:
+                self._counters['budget_exceeded'] += 1
+            return 'expired', None
+        timeouts = [moment - now for moment in (hedge_at if can_hedge else None, deadline) if moment is not None]
+        return 'wait', min(timeouts) if timeouts else None
+
+    def _call_hedged(self, fn, start):
+        executor = self._get_executor()
+        hedge_at, deadline = self._deadlines(start)
+        calls = [executor.submit(fn)]
+
+        while True:
+            step, value = self._next_step(calls, hedge_at, deadline)
+            if step == 'done':
+                return value.result()
+            if step == 'hedge':
+                calls.append(executor.submit(fn))
+            elif step == 'expired':
+                # Abandoned calls finish in the pool; their results are dropped
+                raise BudgetExceeded(f'No answer within {self.latency_budget}s')
+            else:
+                wait([call for call in calls if not call.done()], timeout=value, return_when=FIRST_COMPLETED)
+
+    async def acall(self, coro_fn, fallback):
+        """Async counterpart of call() for coroutine functions"""
+        if not self.allow_request():
+            self.record_fallback()
+            return fallback(), TIER_TEMPLATE
+
+        start = self._clock()
+        try:
+            if self.hedge_delay is None and self.latency_budget is None:
+                result = await coro_fn()
+            else:
+                result = await self._acall_hedged(coro_fn, start)
+        except Exception as e:
+            logger.warning('Upstream call failed, serving template: %s', e)
+            self.record_failure(self._clock() - start)
+            self.record_fallback()
+            return fallback(), TIER_TEMPLATE
+
+        self.record_success(self._clock() - start)
+        return result, TIER_GROK
+
+    async def _acall_hedged(self, coro_fn, start):
+        hedge_at, deadline = self._deadlines(start)
+        calls = [asyncio.ensure_future(coro_fn())]
+        try:
+            while True:
+                step, value = self._next_step(calls, hedge_at, deadline)
+                if step == 'done':
+                    return value.result()
+                if step == 'hedge':
+                    calls.append(asyncio.ensure_future(coro_fn()))
+                elif step == 'expired':
+                    raise BudgetExceeded(f'No answer within {self.latency_budget}s')
+                else:
+                    await asyncio.wait([call for call in calls if not call.done()], timeout=value,
+                                       return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for call in calls:
+                call.cancel()
+
+    def stats(self):
+        """Return breaker state and counters"""
+        with self._lock:
+            stats = dict(self._counters)
+            stats.update({
+                'state': self._current_state(),
+                'window_calls': len(self._outcomes),
+                'window_error_rate': round(self._error_rate(), 4),
+                'window_latency_percentile': round(self._latency_percentile(), 4),
+                'hedge_delay': self.hedge_delay,
+                'latency_budget': self.latency_budget
+            })
+        return stats
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
@@ -0,0 +1,355 @@
+"""
+Resume and cover-letter generation shared by the Flask entry points.
+
+app.py and main.py each build one Generator from their Grok client, cache,
+single-flight group and circuit breaker, then call register_routes() to add
+the generation endpoints (plain and Server-Sent Events) to their app, and
+register_preview_route() for the HTML preview. The async front
+(asgi_app.py) reuses the same prompts, keys and fallbacks.
+
+    generator = Generator(grok_client, generation_cache, single_flight, circuit_breaker,
+                          enabled=grok_enabled, logger=app.logger)
+    register_routes(app, generator, view_decorator=login_required, on_resume=record_resume)
+    register_preview_route(app, html_preview, view_decorator=login_required)
+"""
+
+import json
+import time
+
+from flask import Response, jsonify, request, stream_with_context
+
+from circuit_breaker import TIER_CACHE, TIER_GROK, TIER_TEMPLATE
+from generation_cache import make_key
+from prompt_builder import (PROMPT_VERSION, build_resume_prompt, build_cover_letter_prompt,
+                            resume_fields, cover_letter_fields)
+from resume_json import ResumeStreamParser, extract_resume
+
+# Generation settings, part of every cache key
+RESUME_PARAMS = {'model': 'grok-beta', 'temperature': 0.7}
+COVER_LETTER_PARAMS = {'model': 'grok-beta', 'temperature': 0.7}
+
+
+def resume_key(fields):
+    return make_key('resume', fields, prompt_version=PROMPT_VERSION, **RESUME_PARAMS)
+
+
+def cover_letter_key(fields):
+    return make_key('cover_letter', fields, prompt_version=PROMPT_VERSION, **COVER_LETTER_PARAMS)
+
+
+def resume_request(fields):
+    """Completion kwargs for a resume: the budgeted prompt plus model settings"""
+    prompt = build_resume_prompt(fields)
+    return dict(RESUME_PARAMS, messages=prompt['messages'], max_tokens=prompt['max_tokens'])
+
+
+def cover_letter_request(fields):
+    """Completion kwargs for a cover letter: the budgeted prompt plus model settings"""
+    prompt = build_cover_letter_prompt(fields)
+    return dict(COVER_LETTER_PARAMS, messages=prompt['messages'], max_tokens=prompt['max_tokens'])
+
+
+def fallback_resume(fields):
+    """Deterministic template resume used when Grok is unconfigured or unavailable"""
+    skills = fields['skills']
+    resume = {
+        "summary": f"Motivated student with strong background in {skills}. Seeking {fields['targetRole']} position to apply technical skills and contribute to innovative projects.",
+        "skills": skills.split(','),
+        "experience": [{"title": "Parse from experience", "company": "Various", "duration": fields['experience'], "description": "Details from input"}],
+        "education": [{"degree": fields['education'], "institution": "Educational Institution", "year": "Recent", "details": ""}],
+        "projects": [{"name": "Student Projects", "description": fields['projects'], "technologies": skills}]
+    }
+    return {name: resume[name] for name in fields['sections']}
+
+
+def resume_response(fields, resume_data, tier):
+    """JSON body returned by /api/generate-resume"""
+    return {
+        'success': True,
+        'resume': resume_data,
+        'personalInfo': {
+            'name': fields['name'],
+            'email': fields['email'],
+            'phone': fields['phone']
+        },
+        'cached': tier == TIER_CACHE,
+        'tier': tier
+    }
+
+
+def fallback_cover_letter(fields):
+    """Deterministic template cover letter used when Grok is unconfigured or unavailable"""
+    return f"""Dear Hiring Manager,
+
+I am writing to express my strong interest in the {fields['targetRole']} position at {fields['company']}. As a motivated student with skills in {fields['skills']}, I am excited about the opportunity to contribute to your team.
+
+{fields['experience']}
+
+I am confident that my technical skills, combined with my passion for learning and problem-solving, make me a strong candidate for this position. I look forward to the opportunity to discuss how I can contribute to {fields['company']}'s success.
+
+Thank you for your consideration.
+
+Sincerely,
+{fields['name']}"""
+
+
+def cover_letter_response(cover_letter, tier):
+    """JSON body returned by /api/generate-cover-letter"""
+    return {
+        'success': True,
+        'coverLetter': cover_letter,
+        'cached': tier == TIER_CACHE,
+        'tier': tier
+    }
+
+
+def sse_event(event, data):
+    """Format one Server-Sent Event with a JSON payload"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def sse_response(events):
+    """Stream an event generator to the client without proxy buffering"""
+    return Response(stream_with_context(events), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+
+class Generator:
+    """Cached, coalesced, breaker-guarded Grok generation with template fallbacks"""
+
+    def __init__(self, grok_client, cache, single_flight, circuit_breaker, enabled, logger):
+        self.grok_client = grok_client
+        self.cache = cache
+        self.single_flight = single_flight
+        self.circuit_breaker = circuit_breaker
+        # Called per request, so the entry point's API key setting can change
+        self.enabled = enabled
+        self.logger = logger
+
+    def parse_resume_content(self, ai_content):
+        """Extract the resume JSON object from a completion, repairing common defects"""
+        resume_data, missing = extract_resume(ai_content)
+        if missing:
+            self.logger.warning('Resume completion is missing sections: %s', ', '.join(missing))
+        return resume_data
+
+    def guarded(self, cache_key, call, fallback):
+        """Run an upstream generation behind the circuit breaker; returns (result, tier)
+
+        Only Grok output is cached; template fallbacks are served but not stored.
+        """
+        def generate():
+            result, tier = self.circuit_breaker.call(call, fallback)
+            if tier == TIER_GROK:
+                self.cache.set(cache_key, result)
+            return result, tier
+
+        def recheck():
+            result = self.cache.get(cache_key)
+            return None if result is None else (result, TIER_CACHE)
+
+        # Identical concurrent submissions share one upstream call
+        (result, tier), _ = self.single_flight.do(cache_key, generate, recheck=recheck)
+        return result, tier
+
+    def resume(self, fields, bypass_cache=False):
+        """Produce resume JSON for the given fields; returns (resume_data, tier)"""
+        if not self.enabled():
+            return fallback_resume(fields), TIER_TEMPLATE
+
+        cache_key = resume_key(fields)
+        resume_data = self.cache.lookup(cache_key, bypass=bypass_cache)
+        if resume_data is not None:
+            return resume_data, TIER_CACHE
+        return self.guarded(
+            cache_key,
+            lambda: self.parse_resume_content(self.grok_client.chat_completion(**resume_request(fields))),
+            lambda: fallback_resume(fields)
+        )
+
+    def cover_letter(self, fields, bypass_cache=False):
+        """Produce a cover letter for the given fields; returns (cover_letter, tier)"""
+        if not self.enabled():
+            return fallback_cover_letter(fields), TIER_TEMPLATE
+
+        cache_key = cover_letter_key(fields)
+        cover_letter = self.cache.lookup(cache_key, bypass=bypass_cache)
+        if cover_letter is not None:
+            return cover_letter, TIER_CACHE
+        return self.guarded(
+            cache_key,
+            lambda: self.grok_client.chat_completion(**cover_letter_request(fields)),
+            lambda: fallback_cover_letter(fields)
+        )
+
+    def resume_events(self, fields, bypass_cache=False, on_resume=None):
+        """Server-Sent Events for a resume: one per section as it completes, then done"""
+        try:
+            resume_data = None
+            tier = TIER_TEMPLATE
+            streamed = False
+
+            if self.enabled():
+                cache_key = resume_key(fields)
+                resume_data = self.cache.lookup(cache_key, bypass=bypass_cache)
+                if resume_data is not None:
+                    tier = TIER_CACHE
+                elif self.circuit_breaker.allow_request():
+                    # Forward each top-level section as soon as it is complete
+                    parser = ResumeStreamParser()
+                    start = time.monotonic()
+                    try:
+                        for delta in self.grok_client.stream_chat_completion(**resume_request(fields)):
+                            for name, value in parser.feed(delta):
+                                streamed = True
+                                yield sse_event('section', {'name': name, 'value': value})
+                        resume_data = self.parse_resume_content(parser.buffer)
+                    except Exception:
+                        self.circuit_breaker.record_failure(time.monotonic() - start)
+                        # Sections already shown can't be taken back; otherwise degrade quietly
+                        if streamed:
+                            raise
+                    else:
+                        self.circuit_breaker.record_success(time.monotonic() - start)
+                        self.cache.set(cache_key, resume_data)
+                        tier = TIER_GROK
+
+                if resume_data is None:
+                    self.circuit_breaker.record_fallback()
+
+            if resume_data is None:
+                resume_data = fallback_resume(fields)
+
+            if not streamed:
+                for name, value in resume_data.items():
+                    yield sse_event('section', {'name': name, 'value': value})
+
+            body = resume_response(fields, resume_data, tier)
+            if on_resume is not None:
+                on_resume(body, fields)
+            yield sse_event('done', body)
+
+        except Exception as e:
+            yield sse_event('error', {'success': False, 'error': str(e)})
+
+    def cover_letter_events(self, fields, bypass_cache=False):
+        """Server-Sent Events for a cover letter: its text as it is written, then done"""
+        try:
+            cover_letter = None
+            tier = TIER_TEMPLATE
+
+            if self.enabled():
+                cache_key = cover_letter_key(fields)
+                cover_letter = self.cache.lookup(cache_key, bypass=bypass_cache)
+                if cover_letter is not None:
+                    tier = TIER_CACHE
+                    yield sse_event('token', {'text': cover_letter})
+                elif self.circuit_breaker.allow_request():
+                    parts = []
+                    start = time.monotonic()
+                    try:
+                        for delta in self.grok_client.stream_chat_completion(**cover_letter_request(fields)):
+                            parts.append(delta)
+                            yield sse_event('token', {'text': delta})
+                    except Exception:
+                        self.circuit_breaker.record_failure(time.monotonic() - start)
+                        if parts:
+                            raise
+                    else:
+                        self.circuit_breaker.record_success(time.monotonic() - start)
+                        cover_letter = ''.join(parts)
+                        self.cache.set(cache_key, cover_letter)
+                        tier = TIER_GROK
+
+                if cover_letter is None:
+                    self.circuit_breaker.record_fallback()
+
+            if cover_letter is None:
+                cover_letter = fallback_cover_letter(fields)
+                yield sse_event('token', {'text': cover_letter})
+
+            yield sse_event('done', cover_letter_response(cover_letter, tier))
+
+        except Exception as e:
+            yield sse_event('error', {'success': False, 'error': str(e)})
+
+    def stats(self):
+        return {
+            'grok_client': self.grok_client.stats(),
+            'generation_cache': self.cache.stats(),
+            'single_flight': self.single_flight.stats(),
+            'circuit_breaker': self.circuit_breaker.stats()
+        }
+
+
+def register_routes(app, generator, view_decorator=None, on_resume=None):
+    """Add the generation endpoints to a Flask app
+
+    view_decorator wraps every view (app.py passes login_required);
+    on_resume(body, fields) may add to each generated resume's response body.
+    """
+    def generate_resume():
+        try:
+            data = request.json
+            fields = resume_fields(data)
+            resume_data, tier = generator.resume(fields, bypass_cache=bool(data.get('noCache')))
+            body = resume_response(fields, resume_data, tier)
+            if on_resume is not None:
+                on_resume(body, fields)
+            return jsonify(body)
+
+        except Exception as e:
+            return jsonify({'success': False, 'error': str(e)}), 500
+
+    def generate_cover_letter():
+        try:
+            data = request.json
+            fields = cover_letter_fields(data)
+            cover_letter, tier = generator.cover_letter(fields, bypass_cache=bool(data.get('noCache')))
+            return jsonify(cover_letter_response(cover_letter, tier))
+
+        except Exception as e:
+            return jsonify({'success': False, 'error': str(e)}), 500
+
+    def generate_resume_stream():
+        data = request.json
+        return sse_response(generator.resume_events(resume_fields(data), bool(data.get('noCache')), on_resume))
+
+    def generate_cover_letter_stream():
+        data = request.json
+        return sse_response(generator.cover_letter_events(cover_letter_fields(data), bool(data.get('noCache'))))
+
+    for rule, view in (('/api/generate-resume', generate_resume),
+                       ('/api/generate-cover-letter', generate_cover_letter),
+                       ('/api/generate-resume/stream', generate_resume_stream),
+                       ('/api/generate-cover-letter/stream', generate_cover_letter_stream)):
+        if view_decorator is not None:
+            view = view_decorator(view)
+        app.add_url_rule(rule, view.__name__, view, methods=['POST'])
+
+
+def register_preview_route(app, html_preview, view_decorator=None):
+    """Add /api/preview, the server-rendered HTML preview with ETag/304, to a Flask app"""
+    def preview_resume():
+        try:
+            data = request.json
+            resume_data = data.get('resumeData', {})
+            personal_info = data.get('personalInfo', {})
+
+            etag = html_preview.key(resume_data, personal_info)
+            if request.if_none_match.contains(etag):
+                html_preview.cache.record_not_modified(etag)
+                response = Response(status=304)
+                response.set_etag(etag)
+                return response
+
+            html, _ = html_preview.render(resume_data, personal_info)
+            response = Response(html, mimetype='text/html')
+            response.set_etag(etag)
+            return response
+
+        except Exception as e:
+            return jsonify({'success': False, 'error': str(e)}), 500
+
+    view = view_decorator(preview_resume) if view_decorator is not None else preview_resume
+    app.add_url_rule('/api/preview', view.__name__, view, methods=['POST'])
@@ -0,0 +1,180 @@
+"""
+Content-addressed cache for AI resume and cover-letter generations.
+
+Entries are keyed on a hash of the normalized form fields plus the model
+parameters, so retries, double-clicks and re-submitted forms are answered
+without another Grok round trip. A bounded in-memory LRU tier sits in front
+of an optional SQLite tier that survives worker restarts.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+def normalize_fields(fields):
+    """Trim and collapse whitespace so cosmetic differences share a key"""
+    normalized = {}
+    for name, value in fields.items():
+        if value is None:
+            value = ''
+        if isinstance(value, str):
+            value = ' '.join(value.split())
+        normalized[name] = value
+    return normalized
+
+
+def make_key(kind, fields, **params):
+    """Build a stable cache key for a generation request"""
+    material = {
+        'kind': kind,
+        'fields': normalize_fields(fields),
+        'params': params
+    }
+    encoded = json.dumps(material, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+class GenerationCache:
+    """Two-tier (memory LRU + optional SQLite) cache with TTL and size bounds"""
+
+    def __init__(self, max_entries=None, ttl=None, db_path=None, max_db_entries=None):
+        if max_entries is None:
+            max_entries = int(os.getenv('GENERATION_CACHE_SIZE', 256))
+        if ttl is None:
+            ttl = float(os.getenv('GENERATION_CACHE_TTL', 24 * 60 * 60))
+        if db_path is None:
+            db_path = os.getenv('GENERATION_CACHE_DB') or None
+        if max_db_entries is None:
+            max_db_entries = int(os.getenv('GENERATION_CACHE_DB_MAX_ENTRIES', 10000))
+
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.db_path = db_path
+        self.max_db_entries = max_db_entries
+
+        self._lock = threading.Lock()
+        self._memory = OrderedDict()
+        self._counters = {
+            'hits': 0,
+            'memory_hits': 0,
+            'disk_hits': 0,
+            'misses': 0,
+            'bypasses': 0,
+            'stores': 0,
+            'evictions': 0,
+            'expirations': 0
+        }
+
+        self._db = None
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+            self._db.execute('PRAGMA journal_mode=WAL')
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS generation_cache ('
+                'key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)'
+            )
+            self._db.execute(
+                'CREATE INDEX IF NOT EXISTS ix_generation_cache_expires_at '
+                'ON generation_cache (expires_at)'
+            )
+
+    def _count(self, name):
+        self._counters[name] += 1
+
+    def get(self, key):
+        """Return the cached value for key, or None on a miss"""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                expires_at, payload = entry
+                if expires_at > now:
+                    self._memory.move_to_end(key)
+                    self._count('hits')
+                    self._count('memory_hits')
+                    return json.loads(payload)
+                del self._memory[key]
+                self._count('expirations')
+
+            if self._db is not None:
+                row = self._db.execute(
+                    'SELECT value, expires_at FROM generation_cache WHERE key = ?', (key,)
+                ).fetchone()
+                if row is not None:
+                    payload, expires_at = row
+                    if expires_at > now:
+                        self._remember(key, payload, expires_at)
+                        self._count('hits')
+                        self._count('disk_hits')
+                        return json.loads(payload)
+                    self._db.execute('DELETE FROM generation_cache WHERE key = ?', (key,))
+                    self._count('expirations')
+
+            self._count('misses')
+            return None
+
+    def set(self, key, value):
+        """Store a JSON-serializable value in every configured tier"""
+        payload = json.dumps(value, ensure_ascii=False)
+        expires_at = time.time() + self.ttl
+        with self._lock:
+            self._remember(key, payload, expires_at)
+            self._count('stores')
+            if self._db is not None:
+                self._db.execute(
+                    'INSERT OR REPLACE INTO generation_cache (key, value, expires_at) VALUES (?, ?, ?)',
+                    (key, payload, expires_at)
+                )
+                self._trim_db()
+
+    def lookup(self, key, bypass=False):
+        """Like get(), but records an explicit cache bypass instead of a lookup"""
+        if bypass:
+            with self._lock:
+                self._count('bypasses')
+            return None
+        return self.get(key)
+
+    def _remember(self, key, payload, expires_at):
+        self._memory[key] = (expires_at, payload)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self._count('evictions')
+
+    def _trim_db(self):
+        self._db.execute('DELETE FROM generation_cache WHERE expires_at <= ?', (time.time(),))
+        count = self._db.execute('SELECT COUNT(*) FROM generation_cache').fetchone()[0]
+        overflow = count - self.max_db_entries
+        if overflow > 0:
+            self._db.execute(
+                'DELETE FROM generation_cache WHERE key IN ('
+                'SELECT key FROM generation_cache ORDER BY expires_at LIMIT ?)',
+                (overflow,)
+            )
+            self._counters['evictions'] += overflow
+
+    def clear(self):
+        """Drop every entry from both tiers"""
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute('DELETE FROM generation_cache')
+
+    def stats(self):
+        """Return hit/miss counters and tier sizes"""
+        with self._lock:
+            stats = dict(self._counters)
+            stats['memory_entries'] = len(self._memory)
+            if self._db is not None:
+                stats['disk_entries'] = self._db.execute(
+                    'SELECT COUNT(*) FROM generation_cache'
+                ).fetchone()[0]
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_ratio'] = round(stats['hits'] / lookups, 4) if lookups else 0.0
+        return stats
@@ -0,0 +1,257 @@
+"""
+Shared HTTP client for the xAI Grok chat completions API.
+
+Keeps a bounded pool of keep-alive connections so repeated generations reuse
+the same TCP+TLS session, and applies connect/read deadlines to every call so
+a stalled upstream can't hang a worker. AsyncGrokClient is the non-blocking
+counterpart used by the ASGI front (asgi_app.py).
+"""
+
+import asyncio
+import json
+import os
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import httpx
+except ImportError:  # only needed by AsyncGrokClient
+    httpx = None
+
+GROK_API_URL = 'https://api.x.ai/v1/chat/completions'
+
+
+class GrokAPIError(Exception):
+    """Raised when the Grok API answers with a non-200 status"""
+
+
+class GrokClient:
+    """Thread-safe, pooled client for the Grok chat completions endpoint"""
+
+    def __init__(self, api_key, api_url=GROK_API_URL, pool_size=None,
+                 connect_timeout=None, read_timeout=None):
+        # Settings are resolved here rather than at import so values from a
+        # .env file loaded by the entry point still apply
+        if pool_size is None:
+            pool_size = int(os.getenv('GROK_POOL_SIZE', 10))
+        if connect_timeout is None:
+            connect_timeout = float(os.getenv('GROK_CONNECT_TIMEOUT', 3.05))
+        if read_timeout is None:
+            read_timeout = float(os.getenv('GROK_READ_TIMEOUT', 60))
+
+        self.api_key = api_key
+        self.api_url = api_url
+        self.pool_size = pool_size
+        self.timeout = (connect_timeout, read_timeout)
+
+        # pool_block makes the pool a hard cap: extra callers wait for a free
+        # connection instead of opening throwaway ones
+        self._adapter = HTTPAdapter(pool_connections=2, pool_maxsize=pool_size, pool_block=True)
+        self.session = requests.Session()
+        self.session.mount('https://', self._adapter)
+        self.session.mount('http://', self._adapter)
+        self.session.headers.update({
+            'Content-Type': 'application/json',
+            'Authorization': f'Bearer {api_key}'
+        })
+
+        self._lock = threading.Lock()
+        self._calls = 0
+        self._errors = 0
+        self._timeouts = 0
+
+    def post(self, payload, stream=False):
+        """POST a raw payload to the completions endpoint and return the response"""
+        with self._lock:
+            self._calls += 1
+        try:
+            response = self.session.post(self.api_url, json=payload, timeout=self.timeout, stream=stream)
+        except requests.Timeout:
+            with self._lock:
+                self._timeouts += 1
+                self._errors += 1
+            raise
+        except requests.RequestException:
+            with self._lock:
+                self._errors += 1
+            raise
+
+        if response.status_code != 200:
+            with self._lock:
+                self._errors += 1
+            raise GrokAPIError(f"Grok API error: {response.text}")
+        return response
+
+    def chat_completion(self, messages, model='grok-beta', temperature=0.7, max_tokens=1500):
+        """Run a chat completion and return the assistant message content"""
+        payload = {
+            'model': model,
+            'messages': messages,
+            'temperature': temperature,
+            'max_tokens': max_tokens
+        }
+        response = self.post(payload)
+        return response.json()['choices'][0]['message']['content']
+
+    def stream_chat_completion(self, messages, model='grok-beta', temperature=0.7, max_tokens=1500):
+        """Run a streamed chat completion, yielding content deltas as they arrive"""
+        payload = {
+            'model': model,
+            'messages': messages,
+            'temperature': temperature,
+            'max_tokens': max_tokens,
+            'stream': True
+        }
+        response = self.post(payload, stream=True)
+        try:
+            # Read to the end of the body (past [DONE]) so the connection
+            # goes back to the pool instead of being discarded
+            for line in response.iter_lines(decode_unicode=True):
+                if not line or not line.startswith('data:'):
+                    continue
+                data = line[len('data:'):].strip()
+                if data == '[DONE]':
+                    continue
+                choices = json.loads(data).get('choices') or [{}]
+                delta = choices[0].get('delta', {}).get('content')
+                if delta:
+                    yield delta
+        finally:
+            response.close()
+
+    def stats(self):
+        """Return call counters and connection-pool reuse statistics"""
+        opened = 0
+        requests_sent = 0
+        pools = self._adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            opened += pool.num_connections
+            requests_sent += pool.num_requests
+
+        with self._lock:
+            calls, errors, timeouts = self._calls, self._errors, self._timeouts
+
+        pool_hits = max(requests_sent - opened, 0)
+        return {
+            'calls': calls,
+            'errors': errors,
+            'timeouts': timeouts,
+            'connections_opened': opened,
+            'pool_hits': pool_hits,
+            'pool_hit_ratio': round(pool_hits / requests_sent, 4) if requests_sent else 0.0,
+            'pool_size': self.pool_size,
+            'connect_timeout': self.timeout[0],
+            'read_timeout': self.timeout[1]
+        }
+
+    def close(self):
+        """Close all pooled connections"""
+        self.session.close()
+
+
+class AsyncGrokClient:
+    """Non-blocking Grok client with a cap on concurrent upstream calls"""
+
+    def __init__(self, api_key, api_url=GROK_API_URL, max_in_flight=None, pool_size=None,
+                 connect_timeout=None, read_timeout=None):
+        if httpx is None:
+            raise RuntimeError('AsyncGrokClient requires httpx (pip install httpx)')
+        if max_in_flight is None:
+            max_in_flight = int(os.getenv('GROK_MAX_IN_FLIGHT', 256))
+        if pool_size is None:
+            pool_size = int(os.getenv('GROK_POOL_SIZE', 10))
+        if connect_timeout is None:
+            connect_timeout = float(os.getenv('GROK_CONNECT_TIMEOUT', 3.05))
+        if read_timeout is None:
+            read_timeout = float(os.getenv('GROK_READ_TIMEOUT', 60))
+
+        self.api_key = api_key
+        self.api_url = api_url
+        self.max_in_flight = max_in_flight
+        self.pool_size = pool_size
+        self.timeout = httpx.Timeout(read_timeout, connect=connect_timeout)
+        self.limits = httpx.Limits(max_connections=max_in_flight, max_keepalive_connections=pool_size)
+
+        self._client = None
+        self._semaphore = None
+        self._in_flight = 0
+        self._peak_in_flight = 0
+        self._waiting = 0
+        self._calls = 0
+        self._errors = 0
+        self._timeouts = 0
+
+    def _get_client(self):
+        # Created lazily so the pool and semaphore bind to the running event loop
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_in_flight)
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=self.limits,
+                headers={
+                    'Content-Type': 'application/json',
+                    'Authorization': f'Bearer {self.api_key}'
+                }
+            )
+        return self._client
+
+    async def post(self, payload):
+        """POST a raw payload once a concurrency slot is free and return the response"""
+        client = self._get_client()
+        self._waiting += 1
+        async with self._semaphore:
+            self._waiting -= 1
+            self._calls += 1
+            self._in_flight += 1
+            self._peak_in_flight = max(self._peak_in_flight, self._in_flight)
+            try:
+                response = await client.post(self.api_url, json=payload)
+            except httpx.TimeoutException:
+                self._timeouts += 1
+                self._errors += 1
+                raise
+            except httpx.HTTPError:
+                self._errors += 1
+                raise
+            finally:
+                self._in_flight -= 1
+
+        if response.status_code != 200:
+            self._errors += 1
+            raise GrokAPIError(f"Grok API error: {response.text}")
+        return response
+
+    async def chat_completion(self, messages, model='grok-beta', temperature=0.7, max_tokens=1500):
+        """Run a chat completion and return the assistant message content"""
+        payload = {
+            'model': model,
+            'messages': messages,
+            'temperature': temperature,
+            'max_tokens': max_tokens
+        }
+        response = await self.post(payload)
+        return response.json()['choices'][0]['message']['content']
+
+    def stats(self):
+        """Return call counters and current concurrency"""
+        return {
+            'calls': self._calls,
+            'errors': self._errors,
+            'timeouts': self._timeouts,
+            'in_flight': self._in_flight,
+            'peak_in_flight': self._peak_in_flight,
+            'waiting': self._waiting,
+            'max_in_flight': self.max_in_flight
+        }
+
+    async def aclose(self):
+        """Close the underlying connection pool"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        self._semaphore = None
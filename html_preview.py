@@ -0,0 +1,73 @@
+"""
+Server-rendered HTML preview of a resume, so showing one never costs a PDF render.
+
+The preview template (templates/resume_preview.html) is compiled once and
+rendered with Jinja autoescaping; free-text fields (summary, descriptions,
+details) go through markdown2 in escape mode, so the model's **bold** and
+bullet lists display while any HTML in them stays inert. Rendered previews
+are cached by content hash, like PDFs; the key doubles as the ETag.
+
+    HtmlPreview().render(resume_data, personal_info) -> (html bytes, etag)
+"""
+
+import hashlib
+import json
+import os
+
+import markdown2
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+from markupsafe import Markup
+
+from pdf_cache import PdfCache
+
+TEMPLATES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates')
+PREVIEW_TEMPLATE = 'resume_preview.html'
+
+
+def markdown_filter(text):
+    """Render model-written text as Markdown, escaping any raw HTML in it"""
+    if not text:
+        return ''
+    return Markup(markdown2.markdown(str(text), safe_mode='escape'))
+
+
+class HtmlPreviewCache(PdfCache):
+    """Byte-bounded LRU of rendered previews (same policy as the PDF cache)"""
+
+    def __init__(self, max_bytes=None):
+        if max_bytes is None:
+            max_bytes = int(os.getenv('PREVIEW_CACHE_MAX_BYTES', 8 * 1024 * 1024))
+        super().__init__(max_bytes)
+
+
+class HtmlPreview:
+    """Compiled preview template plus the cache of its output"""
+
+    def __init__(self, cache=None, templates_dir=TEMPLATES_DIR):
+        env = Environment(loader=FileSystemLoader(templates_dir),
+                          autoescape=select_autoescape(['html']),
+                          auto_reload=False)
+        env.filters['markdown'] = markdown_filter
+        self.template = env.get_template(PREVIEW_TEMPLATE)
+        # Template edits must change the key, or clients would keep stale ETags
+        source, _, _ = env.loader.get_source(env, PREVIEW_TEMPLATE)
+        self.template_digest = hashlib.sha256(source.encode('utf-8')).hexdigest()[:16]
+        self.cache = cache if cache is not None else HtmlPreviewCache()
+
+    def key(self, resume_data, personal_info):
+        """Content hash of a preview request; also used as its ETag"""
+        material = {
+            'resumeData': resume_data,
+            'personalInfo': personal_info,
+            'template': self.template_digest
+        }
+        encoded = json.dumps(material, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+        return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+    def render(self, resume_data, personal_info):
+        """Return (html bytes, etag), rendering only on a cache miss"""
+        etag = self.key(resume_data, personal_info)
+        html = self.cache.get_or_render(etag, lambda: self.template.render(
+            resume=resume_data or {}, personal=personal_info or {}).encode('utf-8'))
+        return html, etag
+
@@ -0,0 +1,153 @@
+"""
+Process-local cache of logged-in user identities for Flask-Login.
+
+Flask-Login calls the user loader on every authenticated request. Instead of
+a User query per request, load_user() keeps a detached Identity snapshot
+(id, username, email, full name) per user id for a short TTL, in an
+entry-bounded LRU. Updates and deletes of User rows evict the entry when the
+session commits.
+
+In claims mode the same snapshot is also stored in the Flask session, which
+the session cookie signs with SECRET_KEY; API routes then trust it for up to
+IDENTITY_CLAIMS_MAX_AGE seconds and skip the database altogether.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from flask_login import UserMixin
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+
+CLAIM_FIELDS = ('id', 'username', 'email', 'full_name')
+
+
+class Identity(UserMixin):
+    """Detached snapshot of a User row, safe to share across requests"""
+
+    def __init__(self, id, username, email, full_name):
+        self.id = id
+        self.username = username
+        self.email = email
+        self.full_name = full_name
+
+    @classmethod
+    def from_user(cls, user):
+        return cls(user.id, user.username, user.email, user.full_name)
+
+    def claims(self):
+        """Session payload for claims mode, stamped with its issue time"""
+        claims = {field: getattr(self, field) for field in CLAIM_FIELDS}
+        claims['iat'] = int(time.time())
+        return claims
+
+    def __repr__(self):
+        return f'<Identity {self.username}>'
+
+
+def identity_from_claims(claims, user_id, max_age):
+    """Identity from session claims for user_id, or None if absent or stale"""
+    if not claims or str(claims.get('id')) != str(user_id):
+        return None
+    if time.time() - claims.get('iat', 0) > max_age:
+        return None
+    return Identity(*(claims.get(field) for field in CLAIM_FIELDS))
+
+
+class IdentityCache:
+    """Entry-bounded, TTL-limited LRU of identities keyed by user id"""
+
+    def __init__(self, max_entries=None, ttl=None):
+        if max_entries is None:
+            max_entries = int(os.getenv('IDENTITY_CACHE_SIZE', 1024))
+        if ttl is None:
+            ttl = int(os.getenv('IDENTITY_CACHE_TTL', 60))
+
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._counters = {
+            'hits': 0,
+            'claims_hits': 0,
+            'misses': 0,
+            'db_loads': 0,
+            'evictions': 0,
+            'expirations': 0,
+            'invalidations': 0
+        }
+
+    def load(self, user_id, loader):
+        """Cached identity for user_id; loader() returns the User row on a miss"""
+        key = str(user_id)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, identity = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self._counters['hits'] += 1
+                    return identity
+                del self._entries[key]
+                self._counters['expirations'] += 1
+            self._counters['misses'] += 1
+
+        user = loader()
+        with self._lock:
+            self._counters['db_loads'] += 1
+            if user is None:
+                return None
+            identity = Identity.from_user(user)
+            if self.max_entries > 0 and self.ttl > 0:
+                self._entries[key] = (now + self.ttl, identity)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self._counters['evictions'] += 1
+        return identity
+
+    def count_claims_hit(self):
+        with self._lock:
+            self._counters['claims_hits'] += 1
+
+    def invalidate(self, user_id):
+        with self._lock:
+            if self._entries.pop(str(user_id), None) is not None:
+                self._counters['invalidations'] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def watch(self, model):
+        """Evict a user's entry once an update or delete of its row commits"""
+        pending_key = ('identity_cache_invalidate', id(self))
+
+        def remember(mapper, connection, target):
+            session = object_session(target)
+            if session is not None:
+                session.info.setdefault(pending_key, set()).add(target.id)
+
+        def flush_pending(session):
+            for user_id in session.info.pop(pending_key, ()):
+                self.invalidate(user_id)
+
+        def drop_pending(session, previous_transaction):
+            session.info.pop(pending_key, None)
+
+        event.listen(model, 'after_update', remember)
+        event.listen(model, 'after_delete', remember)
+        event.listen(Session, 'after_commit', flush_pending)
+        event.listen(Session, 'after_soft_rollback', drop_pending)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._counters)
+            stats['entries'] = len(self._entries)
+        stats['db_hits_avoided'] = stats['hits'] + stats['claims_hits']
+        lookups = stats['db_hits_avoided'] + stats['misses']
+        stats['hit_ratio'] = round(stats['db_hits_avoided'] / lookups, 4) if lookups else 0.0
+        return stats
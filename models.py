@@ -1,9 +1,54 @@
+import hashlib
+import json
+import os
+import sqlite3
+import zlib
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import UserMixin
-from werkzeug.security import generate_password_hash, check_password_hash
+from sqlalchemy import event
 from datetime import datetime
+from password_hasher import PasswordHasher
 
 db = SQLAlchemy()
+# Every password hash in the app runs on this bounded pool
+password_hasher = PasswordHasher()
+
+def engine_options(uri):
+    """SQLALCHEMY_ENGINE_OPTIONS for uri, pool sizes and busy timeout from the environment"""
+    if not uri.startswith('sqlite'):
+        return {'pool_pre_ping': True}
+    if uri in ('sqlite://', 'sqlite:///:memory:'):
+        return {}  # a single shared in-memory connection; nothing to tune
+    return {
+        'pool_size': int(os.getenv('DB_POOL_SIZE', 10)),
+        'max_overflow': int(os.getenv('DB_MAX_OVERFLOW', 20)),
+        'pool_timeout': float(os.getenv('DB_POOL_TIMEOUT', 10)),
+        'connect_args': {'timeout': int(os.getenv('SQLITE_BUSY_TIMEOUT_MS', 5000)) / 1000}
+    }
+
+def sqlite_pragmas():
+    """Pragmas for many concurrent readers and a few writers"""
+    return (
+        'journal_mode=WAL',  # readers never wait for the writer
+        'synchronous=NORMAL',  # durable with WAL, one fsync per checkpoint
+        f"busy_timeout={int(os.getenv('SQLITE_BUSY_TIMEOUT_MS', 5000))}",
+        f"cache_size=-{int(os.getenv('SQLITE_CACHE_KIB', 16384))}",
+        'temp_store=MEMORY',
+        'foreign_keys=ON'
+    )
+
+def tune_sqlite(engine):
+    """Apply sqlite_pragmas() to every new connection of engine"""
+    pragmas = sqlite_pragmas()
+
+    def on_connect(dbapi_connection, connection_record):
+        if isinstance(dbapi_connection, sqlite3.Connection):
+            cursor = dbapi_connection.cursor()
+            for pragma in pragmas:
+                cursor.execute(f'PRAGMA {pragma}')
+            cursor.close()
+
+    event.listen(engine, 'connect', on_connect)
 
 class User(UserMixin, db.Model):
     __tablename__ = 'users'
@@ -16,12 +61,59 @@ class User(UserMixin, db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     def set_password(self, password):
-        """Hash and set the password"""
-        self.password_hash = generate_password_hash(password)
+        """Hash and set the password; raises HasherBusy when the hashing pool is full"""
+        self.password_hash = password_hasher.hash(password)
     
     def check_password(self, password):
-        """Check if the provided password matches the hash"""
-        return check_password_hash(self.password_hash, password)
+        """Check if the provided password matches the hash, upgrading the hash if its method is outdated"""
+        matches, rehashed = password_hasher.verify(self.password_hash, password)
+        if rehashed is not None:
+            self.password_hash = rehashed
+        return matches
     
     def __repr__(self):
         return f'<User {self.username}>'
+
+class Resume(db.Model):
+    """One generated resume in a user's history, stored as zlib-compressed JSON"""
+    __tablename__ = 'resumes'
+    __table_args__ = (db.Index('ix_resumes_user_id_created_at', 'user_id', 'created_at'),)
+    
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    target_role = db.Column(db.String(120))
+    digest = db.Column(db.String(64), nullable=False)
+    size = db.Column(db.Integer, nullable=False)
+    # Only loaded when a version is opened, never by listings
+    payload = db.deferred(db.Column(db.LargeBinary, nullable=False))
+    
+    @staticmethod
+    def pack(resume_data, personal_info):
+        """Return (compressed payload, content digest, uncompressed size)"""
+        encoded = json.dumps({'resume': resume_data, 'personal': personal_info}, sort_keys=True,
+                             ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        return zlib.compress(encoded, 9), hashlib.sha256(encoded).hexdigest(), len(encoded)
+    
+    @classmethod
+    def build(cls, user_id, resume_data, personal_info, target_role=None):
+        payload, digest, size = cls.pack(resume_data, personal_info)
+        return cls(user_id=user_id, target_role=(target_role or '')[:120], digest=digest,
+                   size=size, payload=payload)
+    
+    def unpack(self):
+        """Return (resume data, personal info)"""
+        data = json.loads(zlib.decompress(self.payload))
+        return data['resume'], data['personal']
+    
+    def summary(self):
+        """Listing entry: everything except the resume itself"""
+        return {
+            'id': self.id,
+            'createdAt': self.created_at.isoformat(),
+            'targetRole': self.target_role,
+            'bytes': self.size
+        }
+    
+    def __repr__(self):
+        return f'<Resume {self.id} of user {self.user_id}>'
@@ -0,0 +1,144 @@
+"""
+Password hashing on a small dedicated thread pool, with admission control.
+
+The KDF is deliberately slow (scrypt by default, ~100 ms a hash). Run inline,
+a burst of logins would hold every request thread and starve the resume
+endpoints. PasswordHasher runs hashes and verifications on at most
+PASSWORD_HASH_WORKERS threads (hashlib releases the GIL while it works) and
+admits at most PASSWORD_HASH_QUEUE more waiting requests. Past that, hash()
+and verify() raise HasherBusy at once and the views answer 429.
+
+The KDF is set with PASSWORD_HASH_METHOD, in Werkzeug's notation
+('scrypt:N:r:p' or 'pbkdf2:sha256:iterations'). verify() returns a fresh
+hash when a correct password was stored with other parameters, so stored
+hashes move to the new setting as users log in.
+"""
+
+import hashlib
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from werkzeug.security import DEFAULT_PBKDF2_ITERATIONS, check_password_hash, generate_password_hash
+
+DEFAULT_METHOD = 'scrypt:32768:8:1'
+
+
+class HasherBusy(Exception):
+    """Raised when too many hashes are already outstanding"""
+
+
+def canonical_method(method):
+    """Method string as Werkzeug writes it into a hash, defaults filled in
+
+    Raises ValueError for a method Werkzeug would reject, so a bad
+    PASSWORD_HASH_METHOD fails at startup rather than on a user's request.
+    """
+    name, *args = method.split(':')
+    if name == 'scrypt':
+        if not args:
+            return DEFAULT_METHOD
+        if len(args) != 3 or not all(arg.isdigit() for arg in args):
+            raise ValueError(f"Invalid password hash method '{method}': expected scrypt:N:r:p")
+        return method
+    if name == 'pbkdf2':
+        hash_name = args[0] if args else 'sha256'
+        iterations = args[1] if len(args) > 1 else str(DEFAULT_PBKDF2_ITERATIONS)
+        if len(args) > 2 or hash_name not in hashlib.algorithms_available or not iterations.isdigit():
+            raise ValueError(f"Invalid password hash method '{method}': expected pbkdf2:hash:iterations")
+        return f'pbkdf2:{hash_name}:{iterations}'
+    raise ValueError(f"Invalid password hash method '{method}': use scrypt or pbkdf2")
+
+
+class PasswordHasher:
+    """Bounded thread pool for password hashing and verification"""
+
+    def __init__(self, workers=None, max_queue=None, method=None):
+        if workers is None:
+            workers = int(os.getenv('PASSWORD_HASH_WORKERS', 2))
+        if max_queue is None:
+            max_queue = int(os.getenv('PASSWORD_HASH_QUEUE', 8))
+        if method is None:
+            method = os.getenv('PASSWORD_HASH_METHOD', DEFAULT_METHOD)
+
+        self.workers = max(workers, 1)
+        self.max_queue = max_queue
+        self.method = canonical_method(method)
+        # Hashes allowed in flight at once: one per worker plus the queue
+        self.capacity = self.workers + max_queue
+
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='password-hash')
+        self._outstanding = 0
+        self._dummy_hash = None
+        self._counters = {
+            'hashes': 0,
+            'verifications': 0,
+            'rehashes': 0,
+            'rejected': 0
+        }
+
+    def _acquire(self):
+        with self._lock:
+            if self._outstanding >= self.capacity:
+                self._counters['rejected'] += 1
+                raise HasherBusy('Too many sign-in attempts right now, please retry shortly')
+            self._outstanding += 1
+
+    def _release(self, *_):
+        with self._lock:
+            self._outstanding -= 1
+
+    def _run(self, fn, *args):
+        self._acquire()
+        future = self._executor.submit(fn, *args)
+        future.add_done_callback(self._release)
+        return future.result()
+
+    def _count(self, name):
+        with self._lock:
+            self._counters[name] += 1
+
+    def needs_rehash(self, pwhash):
+        return pwhash.split('$', 1)[0] != self.method
+
+    def hash(self, password):
+        """Hash a new password with the configured method"""
+        pwhash = self._run(generate_password_hash, password, self.method)
+        self._count('hashes')
+        return pwhash
+
+    def _verify(self, pwhash, password):
+        if pwhash is None:
+            # Unknown user: spend the same work so timing does not reveal it
+            if self._dummy_hash is None:
+                self._dummy_hash = generate_password_hash('', self.method)
+            check_password_hash(self._dummy_hash, password)
+            return False, None
+        if not check_password_hash(pwhash, password):
+            return False, None
+        if self.needs_rehash(pwhash):
+            return True, generate_password_hash(password, self.method)
+        return True, None
+
+    def verify(self, pwhash, password):
+        """Return (matches, new hash or None); pwhash None stands for an unknown user"""
+        matches, rehashed = self._run(self._verify, pwhash, password)
+        self._count('verifications')
+        if rehashed is not None:
+            self._count('rehashes')
+        return matches, rehashed
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._counters)
+            stats.update({
+                'workers': self.workers,
+                'capacity': self.capacity,
+                'outstanding': self._outstanding,
+                'method': self.method
+            })
+        return stats
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
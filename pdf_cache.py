@@ -0,0 +1,119 @@
+"""
+Cache of rendered resume PDFs, keyed on the content that produced them.
+
+The key is a hash of the canonicalized resumeData + personalInfo and the
+theme, renderer and output mode, so a preview, a re-download and a shared link of the same resume are
+rendered once. The key doubles as a strong ETag: a client that already holds
+the PDF gets a 304 without any rendering or body transfer. Memory is bounded
+by total PDF bytes, evicting least recently used documents first.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+
+def pdf_key(resume_data, personal_info, theme, renderer=None, compact=False):
+    """Content hash of a render request; also used as its ETag"""
+    material = {
+        'resumeData': resume_data,
+        'personalInfo': personal_info,
+        'theme': theme.name,
+        'renderer': theme.check_renderer(renderer),
+        'compact': bool(compact),
+        'variant': theme.cache_variant()
+    }
+    encoded = json.dumps(material, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+class PdfCache:
+    """Byte-bounded LRU of rendered PDF documents"""
+
+    def __init__(self, max_bytes=None):
+        if max_bytes is None:
+            max_bytes = int(os.getenv('PDF_CACHE_MAX_BYTES', 32 * 1024 * 1024))
+
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._counters = {
+            'hits': 0,
+            'misses': 0,
+            'stores': 0,
+            'evictions': 0,
+            'not_modified': 0,
+            'bytes_rendered': 0,
+            'bytes_served_from_cache': 0,
+            'bytes_not_sent': 0
+        }
+
+    def get(self, key):
+        """Return the cached PDF bytes for key, or None on a miss"""
+        with self._lock:
+            pdf = self._entries.get(key)
+            if pdf is None:
+                self._counters['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._counters['hits'] += 1
+            self._counters['bytes_served_from_cache'] += len(pdf)
+            return pdf
+
+    def peek(self, key):
+        """Cached PDF bytes for key, or None; not counted and not moved up the LRU"""
+        with self._lock:
+            return self._entries.get(key)
+
+    def set(self, key, pdf):
+        """Store a freshly rendered PDF, evicting old ones to stay in budget"""
+        with self._lock:
+            self._counters['bytes_rendered'] += len(pdf)
+            if len(pdf) > self.max_bytes:
+                return
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= len(previous)
+            self._entries[key] = pdf
+            self._bytes += len(pdf)
+            self._counters['stores'] += 1
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+                self._counters['evictions'] += 1
+
+    def get_or_render(self, key, render):
+        """Return cached bytes for key, calling render() on a miss"""
+        pdf = self.get(key)
+        if pdf is None:
+            pdf = render()
+            self.set(key, pdf)
+        return pdf
+
+    def record_not_modified(self, key):
+        """Count a 304 answer and the body bytes it avoided sending"""
+        with self._lock:
+            self._counters['not_modified'] += 1
+            pdf = self._entries.get(key)
+            if pdf is not None:
+                self._entries.move_to_end(key)
+                self._counters['bytes_not_sent'] += len(pdf)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        """Return hit/miss counters, bytes saved and current size"""
+        with self._lock:
+            stats = dict(self._counters)
+            stats['entries'] = len(self._entries)
+            stats['bytes'] = self._bytes
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_ratio'] = round(stats['hits'] / lookups, 4) if lookups else 0.0
+        stats['bytes_saved'] = stats['bytes_served_from_cache'] + stats['bytes_not_sent']
+        return stats
@@ -0,0 +1,265 @@
+"""
+Fast-path PDF renderer that draws a fixed resume layout straight onto a canvas.
+
+The platypus path builds Paragraph flowables, parses their markup and runs
+the frame layout passes for every download. The classic layout is fixed
+(name, contact line, up to five capped sections), so this renderer breaks
+lines itself from cached font metrics and draws each line where platypus
+would put it: same frame and padding, leading, collapsed spaceBefore/After,
+page breaks and orphan control. Resume text is drawn as plain text instead
+of being parsed as Paragraph markup.
+"""
+
+from functools import lru_cache
+from io import BytesIO
+
+from reportlab.lib.fonts import ps2tt, tt2ps
+from reportlab.lib.units import inch
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.pdfgen import canvas
+
+# Padding of the platypus Frame that SimpleDocTemplate places inside the margins
+FRAME_PADDING = 6
+
+
+@lru_cache(maxsize=16384)
+def text_width(text, font_name, font_size):
+    """stringWidth, memoized: resumes repeat the same words and separators"""
+    return stringWidth(text, font_name, font_size)
+
+
+@lru_cache(maxsize=None)
+def font_variant(font_name, bold=False, italic=False):
+    """The bold and/or italic face of font_name, as <b>/<i> markup selects it"""
+    family, is_bold, is_italic = ps2tt(font_name)
+    return tt2ps(family, is_bold or bold, is_italic or italic)
+
+
+def split_words(runs):
+    """Split (text, font_name) runs into words, each a list of (text, font_name)
+
+    A word continues across runs when no whitespace separates them.
+    """
+    words = []
+    joinable = False
+    for text, font_name in runs:
+        if not text:
+            continue
+        pieces = text.split()
+        for i, piece in enumerate(pieces):
+            if i == 0 and joinable and not text[0].isspace():
+                words[-1].append((piece, font_name))
+            else:
+                words.append([(piece, font_name)])
+        joinable = bool(pieces) and not text[-1].isspace()
+    return words
+
+
+def word_width(word, font_size):
+    return sum(text_width(text, font_name, font_size) for text, font_name in word)
+
+
+def split_long_word(word, font_size, first_width, max_width):
+    """Cut a word wider than a line into pieces: the first fills first_width,
+    the rest fill whole lines, as Paragraph's splitLongWords does"""
+    pieces = [[]]
+    limit = first_width
+    used = 0
+    for text, font_name in word:
+        for char in text:
+            width = text_width(char, font_name, font_size)
+            if used + width > limit:
+                pieces.append([])
+                limit = max_width
+                used = 0
+            piece = pieces[-1]
+            if piece and piece[-1][1] == font_name:
+                piece[-1] = (piece[-1][0] + char, font_name)
+            else:
+                piece.append((char, font_name))
+            used += width
+    return pieces
+
+
+def break_lines(runs, font_size, max_width, space_shrinkage=0):
+    """Greedy line breaking over (text, font_name) runs
+
+    Like Paragraph, a line may overrun max_width by space_shrinkage of a
+    space per word already on it. Returns a list of (width, [word, ...]) lines.
+    """
+    lines = []
+    line = []
+    width = 0
+    for word in split_words(runs):
+        space = text_width(' ', word[0][1], font_size) if line else 0
+        needed = word_width(word, font_size)
+        if needed > max_width:
+            first, *middle, last = split_long_word(word, font_size, max_width - width - space, max_width)
+            if first:
+                line.append(first)
+                width += space + word_width(first, font_size)
+            lines.append((width, line))
+            lines.extend((word_width(piece, font_size), [piece]) for piece in middle)
+            line, width = [last], word_width(last, font_size)
+        elif line and width + space + needed > max_width + space_shrinkage * space * len(line):
+            lines.append((width, line))
+            line, width = [word], needed
+        else:
+            line.append(word)
+            width += space + needed
+    if line:
+        lines.append((width, line))
+    return lines
+
+
+class CanvasFlow:
+    """Top-down cursor over the single frame of a SimpleDocTemplate page"""
+
+    def __init__(self, canv, page):
+        page_width, page_height = page['pagesize']
+        self.canv = canv
+        self.left = page['leftMargin'] + FRAME_PADDING
+        self.width = page_width - page['leftMargin'] - page['rightMargin'] - 2 * FRAME_PADDING
+        self.top = page_height - page['topMargin'] - FRAME_PADDING
+        self.bottom = page['bottomMargin'] + FRAME_PADDING
+        self._start_page()
+
+    def _start_page(self):
+        self.y = self.top
+        self.at_top = True
+        self.space_after = 0
+
+    def _new_page(self):
+        self.canv.showPage()
+        self._start_page()
+
+    def _space_before(self, space_before):
+        # The previous spaceAfter was already taken; only the excess is added
+        return 0 if self.at_top else max(space_before - self.space_after, 0)
+
+    def spacer(self, height):
+        if self.y - height < self.bottom and not self.at_top:
+            self._new_page()
+        self.y -= height
+        self.space_after = 0
+        if height:
+            self.at_top = False
+
+    def paragraph(self, runs, style):
+        """Lay out and draw one paragraph of (text, font_name) runs in style"""
+        lines = break_lines(runs, style.fontSize, self.width, style.spaceShrinkage)
+        while lines:
+            space = self._space_before(style.spaceBefore)
+            fit = int((self.y - self.bottom - space) / style.leading)
+            if fit >= len(lines):
+                self._draw(lines, style, self.y - space)
+                self.y -= space + len(lines) * style.leading + style.spaceAfter
+                self.space_after = style.spaceAfter
+                self.at_top = False
+                return
+            if self.at_top:
+                # Taller than a whole page: draw what fits, like a forced split
+                fit = max(fit, 1)
+            elif fit == 0 or (fit == 1 and not style.allowOrphans):
+                self._new_page()
+                continue
+            self._draw(lines[:fit], style, self.y - space)
+            lines = lines[fit:]
+            self._new_page()
+
+    def _draw(self, lines, style, top):
+        text = self.canv.beginText()
+        text.setFillColor(style.textColor)
+        baseline = top - style.fontSize
+        current_font = None
+        for width, words in lines:
+            x = self.left
+            if style.alignment == 1:
+                x += (self.width - width) / 2
+            elif style.alignment == 2:
+                x += self.width - width
+            text.setTextOrigin(x, baseline)
+            # One show operation per run of same-font text, not per word
+            for chunk, font_name in line_runs(words):
+                if font_name != current_font:
+                    text.setFont(font_name, style.fontSize, style.leading)
+                    current_font = font_name
+                text.textOut(chunk)
+            baseline -= style.leading
+        self.canv.drawText(text)
+
+
+def line_runs(words):
+    """Merge a line's words into (text, font_name) runs, spaces included"""
+    runs = []
+    for i, word in enumerate(words):
+        for j, (chunk, font_name) in enumerate(word):
+            if i and not j:
+                chunk = ' ' + chunk
+            if runs and runs[-1][1] == font_name:
+                runs[-1][0].append(chunk)
+            else:
+                runs.append(([chunk], font_name))
+    return [(''.join(chunks), font_name) for chunks, font_name in runs]
+
+
+def render_canvas(theme, draw, resume_data, personal_info, canvasmaker=canvas.Canvas):
+    """Render with a canvas layout function; returns a BytesIO at the start"""
+    buffer = BytesIO()
+    canv = canvasmaker(buffer, pagesize=theme.page['pagesize'])
+    flow = CanvasFlow(canv, theme.page)
+    draw(theme, flow, resume_data, personal_info)
+    canv.showPage()
+    canv.save()
+    buffer.seek(0)
+    return buffer
+
+
+def classic_canvas_layout(theme, flow, resume_data, personal_info):
+    """classic_layout drawn directly, with the same caps and spacing"""
+    styles = theme.styles
+    body = styles['body']
+    heading = styles['heading']
+    regular = body.fontName
+    bold = font_variant(regular, bold=True)
+    italic = font_variant(regular, italic=True)
+
+    flow.paragraph([(personal_info.get('name', 'N/A'), styles['title'].fontName)], styles['title'])
+    contact = f"{personal_info.get('email', '')} | {personal_info.get('phone', '')}"
+    flow.paragraph([(contact, regular)], body)
+    flow.spacer(0.2*inch)
+
+    if resume_data.get('summary'):
+        flow.paragraph([("PROFESSIONAL SUMMARY", heading.fontName)], heading)
+        flow.paragraph([(resume_data['summary'], regular)], body)
+        flow.spacer(0.15*inch)
+
+    if resume_data.get('skills'):
+        flow.paragraph([("SKILLS", heading.fontName)], heading)
+        flow.paragraph([(" • ".join(resume_data['skills'][:10]), regular)], body)
+        flow.spacer(0.15*inch)
+
+    if resume_data.get('experience'):
+        flow.paragraph([("EXPERIENCE", heading.fontName)], heading)
+        for exp in resume_data['experience'][:3]:
+            flow.paragraph([(exp.get('title', ''), bold), (f" - {exp.get('company', '')}", regular)], body)
+            flow.paragraph([(exp.get('duration', ''), regular)], body)
+            flow.paragraph([(exp.get('description', ''), regular)], body)
+            flow.spacer(0.1*inch)
+
+    if resume_data.get('education'):
+        flow.paragraph([("EDUCATION", heading.fontName)], heading)
+        for edu in resume_data['education'][:2]:
+            flow.paragraph([(edu.get('degree', ''), bold),
+                            (f" - {edu.get('institution', '')} ({edu.get('year', '')})", regular)], body)
+            if edu.get('details'):
+                flow.paragraph([(edu['details'], regular)], body)
+            flow.spacer(0.1*inch)
+
+    if resume_data.get('projects'):
+        flow.paragraph([("PROJECTS", heading.fontName)], heading)
+        for proj in resume_data['projects'][:3]:
+            flow.paragraph([(proj.get('name', ''), bold)], body)
+            flow.paragraph([(proj.get('description', ''), regular)], body)
+            flow.paragraph([(f"Technologies: {proj.get('technologies', '')}", italic)], body)
+            flow.spacer(0.1*inch)
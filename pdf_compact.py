@@ -0,0 +1,87 @@
+"""
+Compact PDF output: the same pages in fewer bytes.
+
+ReportLab's defaults are tuned for portability, not size: page streams are
+Flate-compressed and then ASCII85-encoded (about a quarter larger again),
+every page carries its own resource dictionary with a ProcSet array, an empty
+/Trans and /Rotate 0, and the Info dictionary and trailer are filled with
+placeholder metadata and comments. CompactCanvas writes binary Flate streams
+at the highest compression level, shares one resource dictionary between all
+pages and leaves out the placeholders. Everything is set per document, so
+compact and regular renders can run side by side in one process.
+
+Both renderers accept it: SimpleDocTemplate.build(canvasmaker=CompactCanvas)
+and render_canvas(..., canvasmaker=CompactCanvas).
+"""
+
+import zlib
+
+from reportlab.pdfbase import pdfdoc
+from reportlab.pdfgen import canvas
+
+
+class CompactFlate:
+    """FlateDecode filter at zlib's best compression"""
+
+    pdfname = 'FlateDecode'
+
+    def encode(self, text):
+        if isinstance(text, str):
+            text = text.encode('utf8')
+        return zlib.compress(text, 9)
+
+    def decode(self, encoded):
+        return zlib.decompress(encoded)
+
+
+COMPACT_FLATE = CompactFlate()
+
+
+class CompactInfo(pdfdoc.PDFInfo):
+    """Info dictionary without the placeholder title, author, dates and producer"""
+
+    def format(self, document):
+        return pdfdoc.PDFDictionary({}).format(document)
+
+
+class CompactDocument(pdfdoc.PDFDocument):
+    """PDFDocument whose trailer ID is not followed by a comment"""
+
+    def ID(self):
+        if not self._ID:
+            digest = pdfdoc.PDFText(self.signature.digest(), enc='raw').format(pdfdoc.DummyDoc())
+            self._ID = b'[' + digest + digest + b']'
+        return self._ID
+
+
+class CompactCanvas(canvas.Canvas):
+    """Canvas that writes the compact form of every page it shows"""
+
+    def __init__(self, *args, **kwargs):
+        kwargs['pageCompression'] = 1
+        super().__init__(*args, **kwargs)
+        # Only ID() differs, and the document was created (with the initial
+        # font registered) by Canvas.__init__
+        self._doc.__class__ = CompactDocument
+        self._doc.info = CompactInfo()
+        self._doc.Catalog.PageMode = None
+        self._shared_resources = None
+
+    def showPage(self):
+        super().showPage()
+        page = self._doc.Pages.pages[-1]
+        page.Contents = pdfdoc.PDFStream(content=page.stream, filters=[COMPACT_FLATE])
+        page.Trans = None
+        if not page.Rotate:
+            page.Rotate = None
+        if not (page.XObjects or page.ExtGState or page._colorsUsed or page._shadingUsed):
+            # Text-only pages all need the same fonts dictionary and nothing else
+            page.Resources = self._resources_reference()
+
+    def _resources_reference(self):
+        if self._shared_resources is None:
+            resources = pdfdoc.PDFResourceDictionary()
+            resources.basicFonts()
+            resources.ProcSet = []
+            self._shared_resources = self._doc.Reference(resources, 'CompactResources')
+        return self._shared_resources
@@ -0,0 +1,285 @@
+"""
+Render PDFs in a pool of worker processes, off the request threads.
+
+ReportLab layout is pure-Python and holds the GIL, so a large render in a
+threaded worker stalls every other request in the process. PdfRenderPool
+ships the resume dicts to separate processes and returns the PDF bytes, with
+a per-render timeout and a bounded number of outstanding renders: once it is
+full, render() raises PdfPoolFull at once (the views answer 503) instead of
+queueing without limit. The timeout runs from when a worker picks the render
+up, not from when it was queued; an overrunning render has its worker killed,
+freeing its slot. warm() starts every worker and builds the themes;
+the server entry points call warm_in_background() at startup, and a pool
+that was not warmed warms itself on its first render, so merely importing
+an app module never starts processes.
+
+Each worker keeps its own cache of built resume sections (pdf_sections), so
+renders are routed by affinity: the same person and theme go to the same
+worker, and a re-render after a one-section edit finds the other sections
+already built. A render only goes elsewhere when its worker is busy and
+another one is idle.
+
+PDF_RENDER_WORKERS=0 renders inline on the calling thread.
+"""
+
+import json
+import logging
+import multiprocessing
+import os
+import threading
+import zlib
+from concurrent.futures import (CancelledError, ProcessPoolExecutor, ThreadPoolExecutor,
+                                TimeoutError as FutureTimeoutError, wait)
+from concurrent.futures.process import BrokenProcessPool
+
+from pdf_themes import get_theme, theme_names
+
+logger = logging.getLogger(__name__)
+
+
+class PdfPoolFull(Exception):
+    """Raised when too many renders are already outstanding"""
+
+
+class PdfWorkerLost(PdfPoolFull):
+    """Raised when a render's worker process died or was restarted; safe to retry"""
+
+
+class PdfRenderTimeout(Exception):
+    """Raised when a render does not finish within the timeout"""
+
+
+def render_pdf_bytes(resume_data, personal_info, theme_name, renderer=None, compact=False):
+    """Worker entry point: render one resume and return the PDF bytes"""
+    return get_theme(theme_name).render(resume_data, personal_info, renderer, compact).getvalue()
+
+
+def affinity_shard(personal_info, theme_name, shards):
+    """Worker index for a resume; stable across edits to anything but the contact details"""
+    encoded = json.dumps([theme_name, personal_info], sort_keys=True, ensure_ascii=False, default=str)
+    return zlib.crc32(encoded.encode('utf-8')) % shards
+
+
+def _warm_worker(_):
+    for name in theme_names():
+        theme = get_theme(name)
+        for renderer in theme.renderers:
+            render_pdf_bytes({'summary': 'Warm-up'}, {'name': 'Warm-up'}, name, renderer)
+    return os.getpid()
+
+
+def _default_start_method():
+    # forkserver avoids forking a process that already runs server threads
+    methods = multiprocessing.get_all_start_methods()
+    return 'forkserver' if 'forkserver' in methods else 'spawn'
+
+
+class PdfRenderPool:
+    """Bounded process pool for PDF rendering"""
+
+    def __init__(self, workers=None, max_queue=None, timeout=None, start_method=None):
+        if workers is None:
+            workers = int(os.getenv('PDF_RENDER_WORKERS', min(os.cpu_count() or 1, 4)))
+        if max_queue is None:
+            max_queue = int(os.getenv('PDF_RENDER_QUEUE', 16))
+        if timeout is None:
+            timeout = float(os.getenv('PDF_RENDER_TIMEOUT', 30))
+        if start_method is None:
+            start_method = os.getenv('PDF_RENDER_START_METHOD') or _default_start_method()
+
+        self.workers = workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.start_method = start_method
+        # Renders allowed in flight at once: one per worker plus the queue
+        self.capacity = max(workers, 1) + max_queue
+
+        self._lock = threading.Lock()
+        # One single-process executor per worker, so a render can be sent to a given one
+        self._executors = [None] * max(workers, 1)
+        # Last job sent to each worker: the next one starts when it finishes
+        self._tails = [None] * max(workers, 1)
+        self._in_flight = [0] * max(workers, 1)
+        self._outstanding = 0
+        self._warm_started = False
+        self._counters = {
+            'renders': 0,
+            'errors': 0,
+            'timeouts': 0,
+            'rejected': 0,
+            'pool_restarts': 0,
+            'affinity_spills': 0
+        }
+
+    def _submit(self, shard, fn, *args):
+        """Queue fn on a worker; return (executor, future, job queued ahead of it or None)"""
+        for attempt in range(2):
+            with self._lock:
+                if self._executors[shard] is None:
+                    context = multiprocessing.get_context(self.start_method)
+                    self._executors[shard] = ProcessPoolExecutor(max_workers=1, mp_context=context)
+                    self._tails[shard] = None
+                executor = self._executors[shard]
+                previous = self._tails[shard]
+                try:
+                    future = executor.submit(fn, *args)
+                except RuntimeError:
+                    # BrokenProcessPool, or shut down by a restart: retry on a fresh worker
+                    if attempt:
+                        raise
+                else:
+                    self._tails[shard] = future
+                    return executor, future, previous
+            self._restart(shard, executor)
+
+    def _pick_shard(self, preferred):
+        """preferred, unless it is busy while another worker sits idle"""
+        with self._lock:
+            if self._in_flight[preferred] and 0 in self._in_flight:
+                self._counters['affinity_spills'] += 1
+                preferred = self._in_flight.index(0)
+            self._in_flight[preferred] += 1
+            return preferred
+
+    def _acquire(self):
+        with self._lock:
+            if self._outstanding >= self.capacity:
+                self._counters['rejected'] += 1
+                raise PdfPoolFull('PDF renderer is busy, please retry shortly')
+            self._outstanding += 1
+
+    def _release(self, *_):
+        with self._lock:
+            self._outstanding -= 1
+
+    def _count(self, name):
+        with self._lock:
+            self._counters[name] += 1
+
+    def warm(self):
+        """Start every worker process and build the themes in each"""
+        # Workers re-import the main module; only the server process warms up
+        if self.workers <= 0 or multiprocessing.current_process().name != 'MainProcess':
+            return []
+        self._warm_started = True
+        with ThreadPoolExecutor(max_workers=self.workers) as waiters:
+            return list(waiters.map(lambda shard: self._run(shard, _warm_worker, shard), range(self.workers)))
+
+    def _warm_quietly(self):
+        try:
+            self.warm()
+        except Exception:
+            logger.warning('PDF worker warm-up failed', exc_info=True)
+
+    def warm_in_background(self):
+        """warm() without delaying the caller; only the first call starts it"""
+        with self._lock:
+            if self._warm_started:
+                return None
+            self._warm_started = True
+        thread = threading.Thread(target=self._warm_quietly, name='pdf-pool-warmup', daemon=True)
+        thread.start()
+        return thread
+
+    def render(self, resume_data, personal_info, theme_name=None, renderer=None, compact=False):
+        """Render in a worker process and return the PDF bytes"""
+        self._acquire()
+        if self.workers <= 0:
+            try:
+                pdf = render_pdf_bytes(resume_data, personal_info, theme_name, renderer, compact)
+            except Exception:
+                self._count('errors')
+                raise
+            finally:
+                self._release()
+            self._count('renders')
+            return pdf
+
+        shard = self._pick_shard(affinity_shard(personal_info, theme_name, self.workers))
+        release = self._slot_release(shard)
+        try:
+            pdf = self._run(shard, render_pdf_bytes, resume_data, personal_info, theme_name, renderer, compact)
+        except PdfRenderTimeout:
+            self._count('timeouts')
+            raise
+        except Exception:
+            self._count('errors')
+            raise
+        finally:
+            release()
+        self._count('renders')
+        return pdf
+
+    def _run(self, shard, fn, *args):
+        """Run fn on a worker and return its result; the timeout counts from when the worker takes it"""
+        try:
+            executor, future, previous = self._submit(shard, fn, *args)
+        except RuntimeError as e:
+            raise PdfWorkerLost('PDF renderer is restarting, please retry shortly') from e
+        if not self._warm_started:
+            # Started after this job is queued, so it never delays it
+            self.warm_in_background()
+        if previous is not None:
+            # The worker takes this job once the one ahead of it is done; every
+            # job is waited on through _run, so that one is bounded by its timeout
+            wait([previous])
+
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            # A render still queued is just dropped; a running one cannot be
+            # stopped, so kill the worker holding it
+            if not future.cancel():
+                self._restart(shard, executor, kill=True)
+            raise PdfRenderTimeout(f'PDF rendering took longer than {self.timeout:g}s')
+        except (BrokenProcessPool, CancelledError) as e:
+            # The worker died, or was killed for a render queued ahead of this one
+            self._restart(shard, executor)
+            raise PdfWorkerLost('PDF renderer is restarting, please retry shortly') from e
+
+    def _slot_release(self, shard):
+        """Release callable for one admitted render; only the first call counts"""
+        held = [True]
+
+        def release(*_):
+            with self._lock:
+                if held:
+                    held.pop()
+                    self._outstanding -= 1
+                    self._in_flight[shard] -= 1
+        return release
+
+    def _restart(self, shard, executor, kill=False):
+        """Replace a broken (or, with kill, stuck) worker so later renders can proceed
+
+        Killing a worker also fails the renders queued behind it.
+        """
+        with self._lock:
+            if self._executors[shard] is not executor:
+                return  # already replaced by another caller
+            self._executors[shard] = None
+            self._tails[shard] = None
+            self._counters['pool_restarts'] += 1
+        if kill:
+            for process in list((getattr(executor, '_processes', None) or {}).values()):
+                process.terminate()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._counters)
+            stats.update({
+                'workers': self.workers,
+                'capacity': self.capacity,
+                'outstanding': self._outstanding,
+                'timeout': self.timeout
+            })
+        return stats
+
+    def shutdown(self):
+        with self._lock:
+            executors, self._executors = self._executors, [None] * len(self._executors)
+            self._tails = [None] * len(self._tails)
+        for executor in executors:
+            if executor is not None:
+                executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,107 @@
+"""
+Cache of built resume sections, so a re-render only rebuilds what changed.
+
+Theme layouts are split into sections (header, summary, skills, experience,
+education, projects, footer), each built from its own slice of the resume.
+SectionCache keeps the flowables of recent sections keyed by a hash of the
+theme, the section name and that slice: after a one-section edit the next
+render reuses every other section as built, including its line breaks
+(ReusableParagraph keeps them per width).
+
+Platypus flowables keep layout state while a document is built, so an entry
+is lent to one render at a time: take() removes it from the cache and
+give_back() returns it once the build has finished. A concurrent render of
+the same section simply builds its own copy.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+from reportlab.platypus import Paragraph
+
+
+class ReusableParagraph(Paragraph):
+    """Paragraph that remembers its line breaks per width across builds"""
+
+    def breakLines(self, width):
+        key = tuple(width) if isinstance(width, (list, tuple)) else width
+        memo = self.__dict__.setdefault('_line_memo', {})
+        lines = memo.get(key)
+        if lines is None:
+            lines = memo[key] = super().breakLines(width)
+        return lines
+
+
+def section_key(theme, name, data):
+    """Hash of one section's input under a theme"""
+    material = {'theme': theme.name, 'section': name, 'data': data}
+    encoded = json.dumps(material, sort_keys=True, ensure_ascii=False, separators=(',', ':'), default=str)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+class SectionCache:
+    """Entry-bounded LRU of section flowables, each lent to one render at a time"""
+
+    def __init__(self, max_entries=None):
+        if max_entries is None:
+            max_entries = int(os.getenv('PDF_SECTION_CACHE_SIZE', 256))
+
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._counters = {
+            'hits': 0,
+            'misses': 0,
+            'evictions': 0
+        }
+
+    def take(self, key):
+        """Remove and return the flowables for key, or None on a miss"""
+        with self._lock:
+            flowables = self._entries.pop(key, None)
+            self._counters['hits' if flowables is not None else 'misses'] += 1
+            return flowables
+
+    def give_back(self, key, flowables):
+        """Return flowables after a finished build, evicting old sections"""
+        if self.max_entries <= 0:
+            return
+        for flowable in flowables:
+            # Set when a flowable was pushed to the next frame; stale in a new build
+            flowable.__dict__.pop('_postponed', None)
+        with self._lock:
+            self._entries[key] = flowables
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._counters['evictions'] += 1
+
+    def build(self, theme, sections):
+        """Flowables for [(name, data, builder)]; returns [(key, flowables)]"""
+        built = []
+        for name, data, builder in sections:
+            key = section_key(theme, name, data)
+            flowables = self.take(key)
+            if flowables is None:
+                flowables = builder(theme, data)
+            built.append((key, flowables))
+        return built
+
+    def restore(self, built):
+        for key, flowables in built:
+            self.give_back(key, flowables)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._counters)
+            stats['entries'] = len(self._entries)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_ratio'] = round(stats['hits'] / lookups, 4) if lookups else 0.0
+        return stats
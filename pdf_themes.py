@@ -0,0 +1,482 @@
+"""
+Named PDF resume themes, built once and shared by every render.
+
+Each theme bundles page geometry, its ParagraphStyle/TableStyle objects and
+the sections that make up its layout. Styles are constructed the first time
+a theme is used and then reused read-only by all requests and threads,
+instead of calling getSampleStyleSheet() and rebuilding every style per PDF.
+Built sections are reused across renders while their slice of the resume is
+unchanged (see pdf_sections).
+
+Every theme renders through platypus; a theme with a fixed layout may also
+offer the faster 'canvas' renderer (see pdf_canvas). compact=True writes
+the same pages in fewer bytes (see pdf_compact).
+
+    render_pdf(resume_data, personal_info, theme='modern', renderer='platypus', compact=False) -> BytesIO
+"""
+
+import threading
+from datetime import datetime
+from io import BytesIO
+from types import MappingProxyType
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import inch
+from reportlab.pdfgen.canvas import Canvas
+from reportlab.platypus import SimpleDocTemplate, Spacer, Table, TableStyle
+
+from pdf_canvas import classic_canvas_layout, render_canvas
+from pdf_compact import CompactCanvas
+from pdf_sections import ReusableParagraph as Paragraph, SectionCache
+
+DEFAULT_THEME = 'classic'
+
+PLATYPUS = 'platypus'
+CANVAS = 'canvas'
+DEFAULT_RENDERER = PLATYPUS
+
+
+class UnknownThemeError(ValueError):
+    """Raised when a PDF theme name is not registered"""
+
+
+class UnknownRendererError(ValueError):
+    """Raised when a theme cannot render with the requested renderer"""
+
+
+class PdfTheme:
+    """Prebuilt, read-only styles and layout for one resume look"""
+
+    def __init__(self, name, page, styles, table_styles, sections, dated=False, canvas_layout=None):
+        self.name = name
+        self.dated = dated
+        self.page = MappingProxyType(dict(page))
+        self.styles = MappingProxyType(dict(styles))
+        self.table_styles = MappingProxyType(dict(table_styles))
+        self._sections = sections
+        self._canvas_layout = canvas_layout
+
+    @property
+    def renderers(self):
+        return (PLATYPUS, CANVAS) if self._canvas_layout else (PLATYPUS,)
+
+    def check_renderer(self, renderer=None):
+        """Return the renderer name to use, or raise UnknownRendererError"""
+        renderer = renderer or DEFAULT_RENDERER
+        if renderer not in self.renderers:
+            raise UnknownRendererError(f"Theme '{self.name}' cannot use renderer '{renderer}'. "
+                                       f"Available renderers: {', '.join(self.renderers)}")
+        return renderer
+
+    def cache_variant(self):
+        """Anything besides the resume itself that changes the rendered output"""
+        return datetime.now().strftime('%Y-%m-%d') if self.dated else ''
+
+    def sections(self, resume_data, personal_info):
+        """[(name, data, builder)] for one resume, in page order"""
+        return self._sections(resume_data, personal_info)
+
+    def elements(self, resume_data, personal_info):
+        """Build the flowables for one resume"""
+        return [flowable
+                for _, data, builder in self.sections(resume_data, personal_info)
+                for flowable in builder(self, data)]
+
+    def render(self, resume_data, personal_info, renderer=None, compact=False):
+        """Render a resume to a PDF buffer positioned at the start"""
+        canvasmaker = CompactCanvas if compact else Canvas
+        if self.check_renderer(renderer) == CANVAS:
+            return render_canvas(self, self._canvas_layout, resume_data, personal_info, canvasmaker)
+        buffer = BytesIO()
+        doc = SimpleDocTemplate(buffer, **self.page)
+        # Unchanged sections come from the cache; they go back only after a clean build
+        built = section_cache.build(self, self.sections(resume_data, personal_info))
+        doc.build([flowable for _, flowables in built for flowable in flowables], canvasmaker=canvasmaker)
+        section_cache.restore(built)
+        buffer.seek(0)
+        return buffer
+
+
+_builders = {}
+_themes = {}
+_lock = threading.Lock()
+
+# Built sections of recent renders in this process
+section_cache = SectionCache()
+
+
+def register_theme(name):
+    """Register a function that builds a PdfTheme the first time it is needed"""
+    def decorator(builder):
+        _builders[name] = builder
+        return builder
+    return decorator
+
+
+def theme_names():
+    return sorted(_builders)
+
+
+def get_theme(name=None):
+    """Return the shared PdfTheme for name, building it on first use"""
+    name = name or DEFAULT_THEME
+    theme = _themes.get(name)
+    if theme is not None:
+        return theme
+    if name not in _builders:
+        raise UnknownThemeError(f"Unknown theme '{name}'. Available themes: {', '.join(theme_names())}")
+    with _lock:
+        if name not in _themes:
+            _themes[name] = _builders[name](name)
+        return _themes[name]
+
+
+def render_pdf(resume_data, personal_info, theme=None, renderer=None, compact=False):
+    """Render a resume with a named theme; returns a BytesIO"""
+    return get_theme(theme).render(resume_data, personal_info, renderer, compact)
+
+
+@register_theme('classic')
+def build_classic(name):
+    """The original single-column look of the Flask app"""
+    sample = getSampleStyleSheet()
+    styles = {
+        'title': ParagraphStyle(
+            'CustomTitle',
+            parent=sample['Heading1'],
+            fontSize=24,
+            textColor=colors.HexColor('#2c3e50'),
+            spaceAfter=6,
+            alignment=1  # Center
+        ),
+        'heading': ParagraphStyle(
+            'CustomHeading',
+            parent=sample['Heading2'],
+            fontSize=14,
+            textColor=colors.HexColor('#3498db'),
+            spaceAfter=12,
+            spaceBefore=12
+        ),
+        'body': sample['Normal']
+    }
+    page = {'pagesize': letter, 'rightMargin': 72, 'leftMargin': 72, 'topMargin': 72, 'bottomMargin': 18}
+    return PdfTheme(name, page, styles, {}, classic_sections, canvas_layout=classic_canvas_layout)
+
+
+def classic_sections(resume_data, personal_info):
+    """The classic sections, each with the slice of the resume it is built from"""
+    return [
+        ('header', contact_data(personal_info), classic_header),
+        ('summary', resume_data.get('summary'), classic_summary),
+        ('skills', (resume_data.get('skills') or [])[:10], classic_skills),
+        ('experience', (resume_data.get('experience') or [])[:3], classic_experience),
+        ('education', (resume_data.get('education') or [])[:2], classic_education),
+        ('projects', (resume_data.get('projects') or [])[:3], classic_projects)
+    ]
+
+
+def contact_data(personal_info):
+    return {
+        'name': personal_info.get('name', 'N/A'),
+        'email': personal_info.get('email', ''),
+        'phone': personal_info.get('phone', '')
+    }
+
+
+def classic_header(theme, contact):
+    styles = theme.styles
+    return [
+        Paragraph(contact['name'], styles['title']),
+        Paragraph(f"{contact['email']} | {contact['phone']}", styles['body']),
+        Spacer(1, 0.2*inch)
+    ]
+
+
+def classic_summary(theme, summary):
+    if not summary:
+        return []
+    return [
+        Paragraph("PROFESSIONAL SUMMARY", theme.styles['heading']),
+        Paragraph(summary, theme.styles['body']),
+        Spacer(1, 0.15*inch)
+    ]
+
+
+def classic_skills(theme, skills):
+    if not skills:
+        return []
+    return [
+        Paragraph("SKILLS", theme.styles['heading']),
+        Paragraph(" • ".join(skills), theme.styles['body']),
+        Spacer(1, 0.15*inch)
+    ]
+
+
+def classic_experience(theme, experience):
+    if not experience:
+        return []
+    body = theme.styles['body']
+    elements = [Paragraph("EXPERIENCE", theme.styles['heading'])]
+    for exp in experience:
+        exp_title = f"<b>{exp.get('title', '')}</b> - {exp.get('company', '')}"
+        elements.append(Paragraph(exp_title, body))
+        elements.append(Paragraph(exp.get('duration', ''), body))
+        elements.append(Paragraph(exp.get('description', ''), body))
+        elements.append(Spacer(1, 0.1*inch))
+    return elements
+
+
+def classic_education(theme, education):
+    if not education:
+        return []
+    body = theme.styles['body']
+    elements = [Paragraph("EDUCATION", theme.styles['heading'])]
+    for edu in education:
+        edu_text = f"<b>{edu.get('degree', '')}</b> - {edu.get('institution', '')} ({edu.get('year', '')})"
+        elements.append(Paragraph(edu_text, body))
+        if edu.get('details'):
+            elements.append(Paragraph(edu['details'], body))
+        elements.append(Spacer(1, 0.1*inch))
+    return elements
+
+
+def classic_projects(theme, projects):
+    if not projects:
+        return []
+    body = theme.styles['body']
+    elements = [Paragraph("PROJECTS", theme.styles['heading'])]
+    for proj in projects:
+        proj_title = f"<b>{proj.get('name', '')}</b>"
+        elements.append(Paragraph(proj_title, body))
+        elements.append(Paragraph(proj.get('description', ''), body))
+        elements.append(Paragraph(f"<i>Technologies: {proj.get('technologies', '')}</i>", body))
+        elements.append(Spacer(1, 0.1*inch))
+    return elements
+
+
+@register_theme('modern')
+def build_modern(name):
+    """The blue, boxed look of the Streamlit app"""
+    sample = getSampleStyleSheet()
+    content_style = ParagraphStyle(
+        'CustomContent',
+        parent=sample['Normal'],
+        fontSize=10,
+        textColor=colors.HexColor('#212121'),
+        spaceAfter=6,
+        leading=14,
+        fontName='Helvetica'
+    )
+    styles = {
+        'title': ParagraphStyle(
+            'CustomTitle',
+            parent=sample['Heading1'],
+            fontSize=28,
+            textColor=colors.HexColor('#1a237e'),  # Deep blue
+            spaceAfter=4,
+            alignment=1,
+            fontName='Helvetica-Bold',
+            leading=32
+        ),
+        'subtitle': ParagraphStyle(
+            'CustomSubtitle',
+            parent=sample['Normal'],
+            fontSize=11,
+            textColor=colors.HexColor('#424242'),  # Dark gray
+            spaceAfter=16,
+            alignment=1,
+            fontName='Helvetica'
+        ),
+        'heading': ParagraphStyle(
+            'CustomHeading',
+            parent=sample['Heading2'],
+            fontSize=14,
+            textColor=colors.HexColor('#1976d2'),  # Blue
+            spaceAfter=8,
+            spaceBefore=16,
+            fontName='Helvetica-Bold',
+            borderWidth=0,
+            borderPadding=0,
+            leftIndent=0,
+            borderColor=colors.HexColor('#1976d2'),
+            borderRadius=None
+        ),
+        'content': content_style,
+        'bold_content': ParagraphStyle(
+            'BoldContent',
+            parent=content_style,
+            fontName='Helvetica-Bold',
+            fontSize=11,
+            textColor=colors.HexColor('#424242')
+        ),
+        'footer': ParagraphStyle(
+            'Footer',
+            parent=sample['Normal'],
+            fontSize=8,
+            textColor=colors.HexColor('#757575'),
+            alignment=1
+        )
+    }
+    table_styles = {
+        'header': TableStyle([
+            ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor('#e3f2fd')),  # Light blue background
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+            ('TOPPADDING', (0, 0), (-1, -1), 20),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
+            ('LEFTPADDING', (0, 0), (-1, -1), 12),
+            ('RIGHTPADDING', (0, 0), (-1, -1), 12),
+        ]),
+        'summary': TableStyle([
+            ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor('#f5f5f5')),
+            ('BOX', (0, 0), (-1, -1), 1, colors.HexColor('#1976d2')),
+            ('LEFTPADDING', (0, 0), (-1, -1), 12),
+            ('RIGHTPADDING', (0, 0), (-1, -1), 12),
+            ('TOPPADDING', (0, 0), (-1, -1), 10),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 10),
+        ]),
+        'skills': TableStyle([
+            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+            ('LEFTPADDING', (0, 0), (-1, -1), 8),
+            ('RIGHTPADDING', (0, 0), (-1, -1), 8),
+            ('TOPPADDING', (0, 0), (-1, -1), 4),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
+        ])
+    }
+    page = {'pagesize': letter, 'rightMargin': 50, 'leftMargin': 50, 'topMargin': 50, 'bottomMargin': 40}
+    # The footer carries today's date
+    return PdfTheme(name, page, styles, table_styles, modern_sections, dated=True)
+
+
+def modern_sections(resume_data, personal_info):
+    """The modern sections, each with the slice of the resume it is built from"""
+    return [
+        ('header', contact_data(personal_info), modern_header),
+        ('summary', resume_data.get('summary'), modern_summary),
+        ('skills', (resume_data.get('skills') or [])[:12], modern_skills),  # Top 12 skills
+        ('experience', (resume_data.get('experience') or [])[:3], modern_experience),
+        ('education', (resume_data.get('education') or [])[:2], modern_education),
+        ('projects', (resume_data.get('projects') or [])[:3], modern_projects),
+        ('footer', datetime.now().strftime('%B %d, %Y'), modern_footer)
+    ]
+
+
+def modern_header(theme, contact):
+    styles = theme.styles
+    # Header Section with blue background bar
+    header_data = [[Paragraph(contact['name'].upper(), styles['title'])]]
+    header_table = Table(header_data, colWidths=[500])
+    header_table.setStyle(theme.table_styles['header'])
+
+    # Contact Information
+    contact_line = f"📧 {contact['email']}  |  📱 {contact['phone']}"
+    return [
+        header_table,
+        Paragraph(contact_line, styles['subtitle']),
+        Spacer(1, 0.15*inch)
+    ]
+
+
+def modern_summary(theme, summary):
+    if not summary:
+        return []
+    # Professional Summary with accent
+    summary_data = [[Paragraph(summary, theme.styles['content'])]]
+    summary_table = Table(summary_data, colWidths=[500])
+    summary_table.setStyle(theme.table_styles['summary'])
+    return [
+        Paragraph("═══ PROFESSIONAL SUMMARY ═══", theme.styles['heading']),
+        summary_table,
+        Spacer(1, 0.2*inch)
+    ]
+
+
+def modern_skills(theme, skills_list):
+    if not skills_list:
+        return []
+    content_style = theme.styles['content']
+    # Create skill badges effect
+    skills_rows = []
+    row = []
+    for i, skill in enumerate(skills_list):
+        row.append(Paragraph(f"▪ {skill}", content_style))
+        if (i + 1) % 3 == 0:
+            skills_rows.append(row)
+            row = []
+    if row:
+        skills_rows.append(row)
+
+    skills_table = Table(skills_rows, colWidths=[166, 166, 166])
+    skills_table.setStyle(theme.table_styles['skills'])
+    return [
+        Paragraph("═══ TECHNICAL SKILLS ═══", theme.styles['heading']),
+        skills_table,
+        Spacer(1, 0.2*inch)
+    ]
+
+
+def modern_experience(theme, experience):
+    if not experience:
+        return []
+    styles = theme.styles
+    elements = [Paragraph("═══ PROFESSIONAL EXPERIENCE ═══", styles['heading'])]
+    for exp in experience:
+        exp_title = f"<b>{exp.get('title', '')}</b> | {exp.get('company', '')}"
+        elements.append(Paragraph(exp_title, styles['bold_content']))
+
+        if exp.get('duration'):
+            elements.append(Paragraph(f"<i>{exp.get('duration', '')}</i>", styles['content']))
+
+        elements.append(Paragraph(exp.get('description', ''), styles['content']))
+        elements.append(Spacer(1, 0.12*inch))
+    elements.append(Spacer(1, 0.1*inch))
+    return elements
+
+
+def modern_education(theme, education):
+    if not education:
+        return []
+    styles = theme.styles
+    elements = [Paragraph("═══ EDUCATION ═══", styles['heading'])]
+    for edu in education:
+        edu_title = f"<b>{edu.get('degree', '')}</b>"
+        elements.append(Paragraph(edu_title, styles['bold_content']))
+
+        edu_info = f"{edu.get('institution', '')} | {edu.get('year', '')}"
+        elements.append(Paragraph(edu_info, styles['content']))
+
+        if edu.get('details'):
+            elements.append(Paragraph(edu.get('details', ''), styles['content']))
+
+        elements.append(Spacer(1, 0.12*inch))
+    elements.append(Spacer(1, 0.1*inch))
+    return elements
+
+
+def modern_projects(theme, projects):
+    if not projects:
+        return []
+    styles = theme.styles
+    elements = [Paragraph("═══ KEY PROJECTS ═══", styles['heading'])]
+    for proj in projects:
+        proj_title = f"<b>{proj.get('name', '')}</b>"
+        elements.append(Paragraph(proj_title, styles['bold_content']))
+
+        elements.append(Paragraph(proj.get('description', ''), styles['content']))
+
+        if proj.get('technologies'):
+            tech_text = f"<i>Technologies: {proj.get('technologies', '')}</i>"
+            elements.append(Paragraph(tech_text, styles['content']))
+
+        elements.append(Spacer(1, 0.12*inch))
+    return elements
+
+
+def modern_footer(theme, date):
+    footer_text = f"Generated on {date} | AI Resume Builder"
+    return [
+        Spacer(1, 0.3*inch),
+        Paragraph(footer_text, theme.styles['footer'])
+    ]
@@ -0,0 +1,260 @@
+"""
+Prompt construction and token budgeting for Grok generations.
+
+Single home for the resume and cover-letter prompts used by app.py,
+main.py, asgi_app.py and streamlit_app.py. Prompts are laid out with the
+static instructions and schema first and the per-student details last, so
+provider-side prefix caching can reuse the shared prefix. Oversized free-text
+fields are trimmed against an input token budget, and the completion's
+max_tokens is sized from the sections actually requested.
+
+Token counts come from an offline approximation of a BPE tokenizer (about
+four characters per token for English, more for other scripts); it is
+meant for budgeting, not billing.
+"""
+
+import logging
+import math
+import os
+import re
+
+from resume_json import RESUME_SECTIONS
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever the prompt wording changes so cached generations made with
+# an older prompt are not served for the new one
+PROMPT_VERSION = 2
+
+_TOKEN_RE = re.compile(r'\w+|[^\w\s]', re.UNICODE)
+_SENTENCE_END_RE = re.compile(r'[.!?\n]\s')
+
+# Expected completion size per resume section, including JSON overhead
+SECTION_OUTPUT_TOKENS = {
+    'summary': 180,
+    'skills': 100,
+    'experience': 500,
+    'education': 220,
+    'projects': 400
+}
+RESUME_OUTPUT_OVERHEAD = 100
+
+SECTION_SCHEMAS = {
+    'summary': '"summary": "2-4 sentence professional summary"',
+    'skills': '"skills": ["skill", ...]',
+    'experience': '"experience": [{"title": "", "company": "", "duration": "", "description": ""}]',
+    'education': '"education": [{"degree": "", "institution": "", "year": "", "details": ""}]',
+    'projects': '"projects": [{"name": "", "description": "", "technologies": ""}]'
+}
+
+RESUME_SYSTEM_PROMPT = (
+    "You are an expert resume writer and career counselor. Create professional, "
+    "tailored resumes that highlight individual strengths."
+)
+RESUME_INSTRUCTIONS = (
+    "Generate professional, tailored resume content for the student described at the end. "
+    "Highlight the skills and experiences most relevant to the target role, use professional "
+    "language, and keep it ATS-friendly and impactful. Reply with only a JSON object of this shape:"
+)
+
+COVER_LETTER_SYSTEM_PROMPT = "You are an expert career counselor who writes compelling cover letters."
+COVER_LETTER_INSTRUCTIONS = (
+    "Write a compelling, professional cover letter for the applicant described at the end. "
+    "Make it personalized, showing enthusiasm, relevant skills, and fit for the role. "
+    "Keep it concise (3-4 paragraphs) and professional."
+)
+
+# Fields that may be trimmed to fit the budget, in the order they are listed
+RESUME_TEXT_FIELDS = ('skills', 'education', 'experience', 'projects')
+COVER_LETTER_TEXT_FIELDS = ('skills', 'experience')
+
+
+def count_tokens(text):
+    """Approximate the number of BPE tokens in text"""
+    total = 0
+    for match in _TOKEN_RE.finditer(text or ''):
+        piece = match.group()
+        if piece.isascii():
+            total += max(1, math.ceil(len(piece) / 4))
+        else:
+            total += max(1, math.ceil(len(piece.encode('utf-8')) / 3))
+    return total
+
+
+def truncate_to_tokens(text, limit):
+    """Cut text to roughly limit tokens, preferring a sentence boundary"""
+    if count_tokens(text) <= limit:
+        return text
+
+    used = 0
+    cut = 0
+    for match in _TOKEN_RE.finditer(text):
+        used += count_tokens(match.group())
+        if used > limit:
+            break
+        cut = match.end()
+
+    head = text[:cut]
+    # Back off to the last sentence end if that keeps most of the text
+    boundary = None
+    for boundary_match in _SENTENCE_END_RE.finditer(head):
+        boundary = boundary_match.start() + 1
+    if boundary and boundary >= len(head) * 0.6:
+        head = head[:boundary]
+    return head.rstrip() + ' …'
+
+
+def dedupe_list_text(text):
+    """Drop repeated entries from a comma-separated list, keeping order"""
+    seen = set()
+    items = []
+    for item in text.split(','):
+        key = item.strip().lower()
+        if key and key not in seen:
+            seen.add(key)
+            items.append(item.strip())
+    return ', '.join(items)
+
+
+def fit_fields(fields, text_fields, budget):
+    """Trim the largest free-text fields until they fit within budget tokens
+
+    Returns (fitted_fields, trimmed_field_names). Short fields are never
+    touched; long ones are cut to a common per-field cap chosen so the total
+    fits ("water-filling"), which keeps every field represented.
+    """
+    fitted = dict(fields)
+    if fitted.get('skills'):
+        fitted['skills'] = dedupe_list_text(fitted['skills'])
+
+    sizes = {name: count_tokens(fitted.get(name, '')) for name in text_fields}
+    if sum(sizes.values()) <= budget:
+        return fitted, []
+
+    remaining = budget
+    pending = sorted(sizes, key=sizes.get)
+    cap = 0
+    while pending:
+        cap = remaining // len(pending)
+        smallest = pending[0]
+        if sizes[smallest] > cap:
+            break
+        remaining -= sizes[smallest]
+        pending.pop(0)
+
+    trimmed = []
+    for name in pending:
+        fitted[name] = truncate_to_tokens(fitted[name], max(cap, 1))
+        trimmed.append(name)
+    return fitted, trimmed
+
+
+def requested_sections(sections):
+    """Validate a requested section list, defaulting to every section"""
+    if not sections:
+        return list(RESUME_SECTIONS)
+    chosen = [name for name in RESUME_SECTIONS if name in sections]
+    return chosen or list(RESUME_SECTIONS)
+
+
+def resume_output_tokens(sections):
+    """Pick max_tokens for a resume from the sections being generated"""
+    cap = int(os.getenv('RESUME_MAX_TOKENS', 1500))
+    estimate = RESUME_OUTPUT_OVERHEAD + sum(SECTION_OUTPUT_TOKENS[name] for name in sections)
+    return min(estimate, cap)
+
+
+def resume_fields(data):
+    """Extract the resume form fields from a request payload"""
+    return {
+        'name': data.get('name', ''),
+        'email': data.get('email', ''),
+        'phone': data.get('phone', ''),
+        'skills': data.get('skills', ''),
+        'education': data.get('education', ''),
+        'experience': data.get('experience', ''),
+        'projects': data.get('projects', ''),
+        'targetRole': data.get('targetRole', ''),
+        'sections': requested_sections(data.get('sections'))
+    }
+
+
+def cover_letter_fields(data):
+    """Extract the cover-letter form fields from a request payload"""
+    return {
+        'name': data.get('name', ''),
+        'targetRole': data.get('targetRole', ''),
+        'company': data.get('company', ''),
+        'skills': data.get('skills', ''),
+        'experience': data.get('experience', '')
+    }
+
+
+def _input_budget(input_budget):
+    if input_budget is None:
+        input_budget = int(os.getenv('PROMPT_INPUT_TOKEN_BUDGET', 1200))
+    return input_budget
+
+
+def build_resume_prompt(fields, input_budget=None):
+    """Build the resume messages and max_tokens within the input budget
+
+    Returns a dict with 'messages', 'max_tokens', 'input_tokens',
+    'sections' and 'trimmed' (names of fields that were shortened).
+    """
+    budget = _input_budget(input_budget)
+    sections = requested_sections(fields.get('sections'))
+    fitted, trimmed = fit_fields(fields, RESUME_TEXT_FIELDS, budget)
+
+    schema = '{' + ', '.join(SECTION_SCHEMAS[name] for name in sections) + '}'
+    details = (
+        f"Target Role: {fitted['targetRole']}\n"
+        f"Name: {fitted['name']}\n"
+        f"Email: {fitted['email']}\n"
+        f"Phone: {fitted['phone']}\n"
+        f"Skills: {fitted['skills']}\n"
+        f"Education: {fitted['education']}\n"
+        f"Experience: {fitted['experience']}\n"
+        f"Projects: {fitted['projects']}"
+    )
+    messages = [
+        {"role": "system", "content": RESUME_SYSTEM_PROMPT},
+        {"role": "user", "content": f"{RESUME_INSTRUCTIONS}\n{schema}\n\nStudent:\n{details}"}
+    ]
+    return _finish('resume', messages, resume_output_tokens(sections), budget, trimmed, sections)
+
+
+def build_cover_letter_prompt(fields, input_budget=None):
+    """Build the cover-letter messages within the input budget"""
+    budget = _input_budget(input_budget)
+    fitted, trimmed = fit_fields(fields, COVER_LETTER_TEXT_FIELDS, budget)
+
+    details = (
+        f"Target Role: {fitted['targetRole']}\n"
+        f"Company: {fitted['company']}\n"
+        f"Applicant: {fitted['name']}\n"
+        f"Skills: {fitted['skills']}\n"
+        f"Experience: {fitted['experience']}"
+    )
+    messages = [
+        {"role": "system", "content": COVER_LETTER_SYSTEM_PROMPT},
+        {"role": "user", "content": f"{COVER_LETTER_INSTRUCTIONS}\n\nApplicant:\n{details}"}
+    ]
+    max_tokens = int(os.getenv('COVER_LETTER_MAX_TOKENS', 800))
+    return _finish('cover_letter', messages, max_tokens, budget, trimmed, None)
+
+
+def _finish(kind, messages, max_tokens, budget, trimmed, sections):
+    input_tokens = sum(count_tokens(message['content']) for message in messages)
+    logger.info(
+        'prompt budget kind=%s input_tokens=%d field_budget=%d trimmed=%s max_tokens=%d sections=%s',
+        kind, input_tokens, budget, ','.join(trimmed) or '-', max_tokens,
+        ','.join(sections) if sections else '-'
+    )
+    return {
+        'messages': messages,
+        'max_tokens': max_tokens,
+        'input_tokens': input_tokens,
+        'sections': sections,
+        'trimmed': trimmed
+    }
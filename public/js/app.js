@@ -35,24 +35,25 @@ document.getElementById('resume-form').addEventListener('submit', async (e) => {
 
     showLoading(true);
 
+    // Render sections as they arrive instead of waiting for the whole resume
+    const partialResume = {};
+    const personalInfo = { name: formData.name, email: formData.email, phone: formData.phone };
+
     try {
-        const response = await fetch('/api/generate-resume', {
-            method: 'POST',
-            headers: {
-                'Content-Type': 'application/json'
-            },
-            body: JSON.stringify(formData)
+        await streamEvents('/api/generate-resume/stream', formData, (event, data) => {
+            if (event === 'section') {
+                partialResume[data.name] = data.value;
+                showLoading(false);
+                displayResume(partialResume, personalInfo);
+                document.getElementById('resume-preview').style.display = 'block';
+            } else if (event === 'done') {
+                displayResume(data.resume, data.personalInfo);
+                document.getElementById('resume-preview').style.display = 'block';
+                document.getElementById('resume-preview').scrollIntoView({ behavior: 'smooth' });
+            } else if (event === 'error') {
+                alert('Error generating resume: ' + data.error);
+            }
         });
-
-        const data = await response.json();
-
-        if (data.success) {
-            displayResume(data.resume, data.personalInfo);
-            document.getElementById('resume-preview').style.display = 'block';
-            document.getElementById('resume-preview').scrollIntoView({ behavior: 'smooth' });
-        } else {
-            alert('Error generating resume: ' + data.error);
-        }
     } catch (error) {
         alert('Error: ' + error.message);
     } finally {
@@ -74,24 +75,23 @@ document.getElementById('cover-letter-form').addEventListener('submit', async (e
 
     showLoading(true);
 
+    const content = document.getElementById('cover-letter-content');
+    content.textContent = '';
+
     try {
-        const response = await fetch('/api/generate-cover-letter', {
-            method: 'POST',
-            headers: {
-                'Content-Type': 'application/json'
-            },
-            body: JSON.stringify(formData)
+        await streamEvents('/api/generate-cover-letter/stream', formData, (event, data) => {
+            if (event === 'token') {
+                // Show the letter as it is written
+                showLoading(false);
+                content.textContent += data.text;
+                document.getElementById('cover-letter-preview').style.display = 'block';
+            } else if (event === 'done') {
+                content.textContent = data.coverLetter;
+                document.getElementById('cover-letter-preview').scrollIntoView({ behavior: 'smooth' });
+            } else if (event === 'error') {
+                alert('Error generating cover letter: ' + data.error);
+            }
         });
-
-        const data = await response.json();
-
-        if (data.success) {
-            document.getElementById('cover-letter-content').textContent = data.coverLetter;
-            document.getElementById('cover-letter-preview').style.display = 'block';
-            document.getElementById('cover-letter-preview').scrollIntoView({ behavior: 'smooth' });
-        } else {
-            alert('Error generating cover letter: ' + data.error);
-        }
     } catch (error) {
         alert('Error: ' + error.message);
     } finally {
@@ -99,6 +99,47 @@ document.getElementById('cover-letter-form').addEventListener('submit', async (e
     }
 });
 
+// POST a JSON body and dispatch each Server-Sent Event in the response
+async function streamEvents(url, body, onEvent) {
+    const response = await fetch(url, {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+            'Accept': 'text/event-stream'
+        },
+        body: JSON.stringify(body)
+    });
+
+    const contentType = response.headers.get('Content-Type') || '';
+    if (!response.ok || !contentType.includes('text/event-stream')) {
+        throw new Error('Request failed with status ' + response.status);
+    }
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+
+    while (true) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+
+        let boundary;
+        while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+            const block = buffer.slice(0, boundary);
+            buffer = buffer.slice(boundary + 2);
+
+            let event = 'message';
+            let data = '';
+            block.split('\n').forEach(line => {
+                if (line.startsWith('event:')) event = line.slice(6).trim();
+                else if (line.startsWith('data:')) data += line.slice(5).trim();
+            });
+            if (data) onEvent(event, JSON.parse(data));
+        }
+    }
+}
+
 // Display Resume
 function displayResume(resume, personalInfo) {
     let html = `
@@ -184,6 +225,9 @@ function displayResume(resume, personalInfo) {
     window.currentResume = { resumeData: resume, personalInfo: personalInfo };
 }
 
+// Last downloaded PDF, reused when the server answers 304 Not Modified
+let lastPdf = null;
+
 // Download PDF
 async function downloadPDF() {
     if (!window.currentResume) {
@@ -194,16 +238,26 @@ async function downloadPDF() {
     showLoading(true);
 
     try {
+        const headers = { 'Content-Type': 'application/json' };
+        if (lastPdf) {
+            headers['If-None-Match'] = lastPdf.etag;
+        }
+
         const response = await fetch('/api/download-pdf', {
             method: 'POST',
-            headers: {
-                'Content-Type': 'application/json'
-            },
+            headers: headers,
             body: JSON.stringify(window.currentResume)
         });
 
-        if (response.ok) {
-            const blob = await response.blob();
+        if (response.ok || response.status === 304) {
+            let blob;
+            if (response.status === 304) {
+                blob = lastPdf.blob;
+            } else {
+                blob = await response.blob();
+                const etag = response.headers.get('ETag');
+                lastPdf = etag ? { etag: etag, blob: blob } : null;
+            }
             const url = window.URL.createObjectURL(blob);
             const a = document.createElement('a');
             a.href = url;
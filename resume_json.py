@@ -0,0 +1,309 @@
+"""
+Tolerant, incremental parsing of the resume JSON produced by the model.
+
+ResumeStreamParser consumes a completion chunk by chunk and reports each
+top-level section ("summary", "skills", "experience", ...) as soon as its
+value has fully arrived, so streaming endpoints can forward it early.
+extract_resume() handles a complete completion. Both repair the defects
+LLMs commonly emit (code fences, surrounding prose, trailing commas,
+comments, raw newlines in strings, Python literals, single quotes, extra
+brace blocks, truncated output) instead of forcing a regeneration.
+"""
+
+import json
+
+RESUME_SECTIONS = ('summary', 'skills', 'experience', 'education', 'projects')
+
+_LITERALS = {'True': 'true', 'False': 'false', 'None': 'null'}
+_CLOSERS = {'{': '}', '[': ']'}
+
+
+class ResumeParseError(ValueError):
+    """Raised when no resume object can be recovered from model output"""
+
+
+def missing_sections(resume_data):
+    """Return the expected resume sections absent from resume_data"""
+    return [name for name in RESUME_SECTIONS if name not in resume_data]
+
+
+def repair_json(text):
+    """Best-effort rewrite of near-JSON into something json.loads accepts"""
+    out = []
+    stack = []
+    quote = None
+    escape = False
+    i = 0
+    length = len(text)
+
+    while i < length:
+        ch = text[i]
+
+        if quote is not None:
+            if escape:
+                escape = False
+                if ch == "'":
+                    # \' is not a JSON escape; a bare apostrophe is enough
+                    out[-1] = ch
+                else:
+                    out.append(ch)
+            elif ch == '\\':
+                escape = True
+                out.append(ch)
+            elif ch == quote:
+                quote = None
+                out.append('"')
+            elif ch == '"':
+                # Double quote inside a single-quoted string
+                out.append('\\"')
+            elif ch == '\n':
+                out.append('\\n')
+            elif ch == '\t':
+                out.append('\\t')
+            elif ch < ' ':
+                out.append('\\u%04x' % ord(ch))
+            else:
+                out.append(ch)
+            i += 1
+            continue
+
+        if ch in '"\'':
+            quote = ch
+            out.append('"')
+        elif ch == '/' and text.startswith('//', i):
+            end = text.find('\n', i)
+            i = length if end == -1 else end
+            continue
+        elif ch == '/' and text.startswith('/*', i):
+            end = text.find('*/', i + 2)
+            i = length if end == -1 else end + 2
+            continue
+        elif ch in '{[':
+            stack.append(ch)
+            out.append(ch)
+        elif ch in '}]':
+            _drop_trailing_comma(out)
+            if stack:
+                stack.pop()
+            out.append(ch)
+        elif ch.isalpha():
+            end = i
+            while end < length and (text[end].isalnum() or text[end] == '_'):
+                end += 1
+            word = text[i:end]
+            after = end
+            while after < length and text[after].isspace():
+                after += 1
+            if after < length and text[after] == ':':
+                # Unquoted object key
+                out.append(f'"{word}"')
+            else:
+                out.append(_LITERALS.get(word, word))
+            i = end
+            continue
+        else:
+            out.append(ch)
+        i += 1
+
+    # Close whatever a truncated completion left open
+    if quote is not None:
+        if escape:
+            out.pop()
+        out.append('"')
+    _drop_trailing_comma(out)
+    if out and out[-1].rstrip().endswith(':'):
+        out.append('null')
+    for opener in reversed(stack):
+        _drop_trailing_comma(out)
+        out.append(_CLOSERS[opener])
+    return ''.join(out)
+
+
+def _drop_trailing_comma(out):
+    j = len(out) - 1
+    while j >= 0 and out[j].isspace():
+        j -= 1
+    if j >= 0 and out[j] == ',':
+        del out[j]
+
+
+def _object_candidates(text):
+    """Yield balanced top-level {...} blocks, then any unterminated tail"""
+    depth = 0
+    start = None
+    in_string = False
+    escape = False
+
+    for i, ch in enumerate(text):
+        if in_string:
+            if escape:
+                escape = False
+            elif ch == '\\':
+                escape = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            if depth:
+                in_string = True
+        elif ch == '{':
+            if depth == 0:
+                start = i
+            depth += 1
+        elif ch == '}' and depth:
+            depth -= 1
+            if depth == 0:
+                yield text[start:i + 1]
+                start = None
+
+    if start is not None:
+        yield text[start:]
+
+
+def _loads_lenient(text):
+    try:
+        return json.loads(text)
+    except ValueError:
+        return json.loads(repair_json(text))
+
+
+def extract_resume(text):
+    """Recover the resume object from a complete completion
+
+    Returns (resume_data, missing) where missing lists the expected
+    sections that were not present.
+    """
+    for candidate in _object_candidates(text):
+        try:
+            value = _loads_lenient(candidate)
+        except ValueError:
+            continue
+        if isinstance(value, dict) and any(name in value for name in RESUME_SECTIONS):
+            return value, missing_sections(value)
+
+    # Last resort: salvage whatever whole sections the streaming parser finds
+    parser = ResumeStreamParser()
+    parser.feed(text)
+    sections, missing = parser.finish()
+    if sections:
+        return sections, missing
+    raise ResumeParseError('No resume JSON found in model output')
+
+
+class ResumeStreamParser:
+    """Incrementally split a streamed resume object into top-level sections"""
+
+    def __init__(self):
+        self.buffer = ''
+        self.sections = {}
+        self._pos = 0
+        self._depth = 0
+        self._quote = None
+        self._escape = False
+        self._comment = None
+        self._segment_start = None
+        self._key = None
+        self._value_start = None
+        self._closed = False
+
+    def feed(self, chunk):
+        """Consume a chunk and return the (name, value) sections it completed"""
+        self.buffer += chunk
+        completed = []
+        buffer = self.buffer
+
+        while self._pos < len(buffer) and not self._closed:
+            ch = buffer[self._pos]
+
+            if self._depth == 0:
+                # Skip any prose or code fence before the object starts
+                if ch == '{':
+                    self._depth = 1
+                    self._segment_start = self._pos + 1
+            elif self._comment is not None:
+                if self._comment == '//' and ch == '\n':
+                    self._comment = None
+                elif self._comment == '/*' and ch == '/' and buffer[self._pos - 1] == '*':
+                    self._comment = None
+            elif self._quote is not None:
+                if self._escape:
+                    self._escape = False
+                elif ch == '\\':
+                    self._escape = True
+                elif ch == self._quote:
+                    self._quote = None
+            elif ch == '/':
+                if self._pos + 1 == len(buffer):
+                    # Wait for the next chunk to tell a comment from a stray slash
+                    break
+                if buffer[self._pos + 1] in '/*':
+                    self._comment = buffer[self._pos:self._pos + 2]
+                    self._pos += 1
+            elif ch in '"\'':
+                self._quote = ch
+            elif ch in '{[':
+                self._depth += 1
+            elif ch in '}]':
+                if self._depth == 1:
+                    self._complete(self._pos, completed)
+                    # A brace block without resume sections (e.g. a "{role}"
+                    # placeholder in leading prose) is skipped, not final
+                    self._closed = bool(self.sections)
+                    self._key = None
+                self._depth = max(self._depth - 1, 0)
+            elif self._depth == 1:
+                if ch == ':' and self._key is None:
+                    self._key = buffer[self._segment_start:self._pos]
+                    self._value_start = self._pos + 1
+                elif ch == ',':
+                    self._complete(self._pos, completed)
+                    self._segment_start = self._pos + 1
+
+            self._pos += 1
+
+        return completed
+
+    def _complete(self, end, completed):
+        if self._key is None:
+            return
+        raw_key, raw_value = self._key, self.buffer[self._value_start:end]
+        self._key = self._value_start = None
+        try:
+            name = _parse_key(raw_key)
+            value = _loads_lenient(raw_value)
+        except ValueError:
+            return
+        if name in self.sections:
+            return
+        self.sections[name] = value
+        completed.append((name, value))
+
+    def finish(self):
+        """Return (sections, missing) once the stream has ended
+
+        A section cut off by a truncated completion is repaired and kept
+        only if it is one of the expected resume sections.
+        """
+        if not self._closed and self._key is not None:
+            try:
+                name = _parse_key(self._key)
+                value = json.loads(repair_json(self.buffer[self._value_start:]))
+            except ValueError:
+                name = None
+            if name in RESUME_SECTIONS and name not in self.sections:
+                self.sections[name] = value
+            self._key = None
+        return self.sections, missing_sections(self.sections)
+
+    @property
+    def done(self):
+        """True once the closing brace of the top-level object was seen"""
+        return self._closed
+
+
+def _parse_key(raw_key):
+    """Decode an object key written with double, single or no quotes"""
+    key = repair_json(raw_key).strip()
+    name = json.loads(key) if key.startswith('"') else key
+    if not isinstance(name, str) or not name:
+        raise ValueError(f'Invalid key: {raw_key!r}')
+    return name
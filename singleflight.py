@@ -0,0 +1,148 @@
+"""
+Single-flight coalescing of identical in-flight generation calls.
+
+Concurrent callers that present the same key wait on one leader call and
+share its result instead of each hitting Grok. With a lock directory set,
+leaders in different worker processes also serialize on a lock file; a
+process that had to wait re-checks the shared (disk) cache before
+generating, so one upstream call can serve every worker. Keys hash into a
+fixed number of lock files, so the directory stays bounded; two keys that
+share a bucket only serialize, the waiter's recheck misses and it generates.
+"""
+
+import hashlib
+import os
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows: cross-process coalescing is unavailable
+    fcntl = None
+
+
+class _Call:
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Collapse concurrent calls with the same key into one execution"""
+
+    def __init__(self, lock_dir=None, wait_timeout=None, lock_buckets=None):
+        if lock_dir is None:
+            lock_dir = os.getenv('SINGLEFLIGHT_LOCK_DIR') or None
+        if wait_timeout is None:
+            wait_timeout = float(os.getenv('SINGLEFLIGHT_WAIT_TIMEOUT', 90))
+        if lock_buckets is None:
+            lock_buckets = int(os.getenv('SINGLEFLIGHT_LOCK_BUCKETS', 1024))
+
+        self.lock_dir = lock_dir if fcntl is not None else None
+        self.wait_timeout = wait_timeout
+        self.lock_buckets = max(lock_buckets, 1)
+        if self.lock_dir:
+            os.makedirs(self.lock_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._counters = {
+            'leaders': 0,
+            'coalesced': 0,
+            'cross_process_waits': 0,
+            'cross_process_coalesced': 0,
+            'wait_timeouts': 0
+        }
+
+    def do(self, key, fn, recheck=None):
+        """Run fn() once per key at a time; return (result, shared)
+
+        recheck is called after waiting on another process's lock and may
+        return that process's stored result to skip calling fn.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                self._counters['coalesced'] += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                self._counters['leaders'] += 1
+                leader = True
+
+        if not leader:
+            if not call.event.wait(self.wait_timeout):
+                with self._lock:
+                    self._counters['wait_timeouts'] += 1
+                return fn(), False
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result, shared = self._run_leader(key, fn, recheck)
+            return call.result, shared
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+
+    def _run_leader(self, key, fn, recheck):
+        if not self.lock_dir:
+            return fn(), False
+
+        with open(self._lock_path(key), 'a') as lock_file:
+            locked, waited = self._acquire(lock_file)
+            try:
+                if waited and recheck is not None:
+                    result = recheck()
+                    if result is not None:
+                        with self._lock:
+                            self._counters['cross_process_coalesced'] += 1
+                        return result, True
+                return fn(), False
+            finally:
+                if locked:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _lock_path(self, key):
+        """Lock file of key's bucket; files are never unlinked, so flock stays sound"""
+        digest = hashlib.sha256(str(key).encode('utf-8')).digest()
+        bucket = int.from_bytes(digest[:8], 'big') % self.lock_buckets
+        return os.path.join(self.lock_dir, f'bucket-{bucket}.lock')
+
+    def _acquire(self, lock_file):
+        """Take the bucket's file lock; return (locked, waited_on_other_process)"""
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True, False
+        except BlockingIOError:
+            pass
+
+        with self._lock:
+            self._counters['cross_process_waits'] += 1
+        deadline = time.monotonic() + self.wait_timeout
+        while time.monotonic() < deadline:
+            time.sleep(0.05)
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return True, True
+            except BlockingIOError:
+                continue
+
+        # Give up waiting and generate unlocked rather than fail the request
+        with self._lock:
+            self._counters['wait_timeouts'] += 1
+        return False, True
+
+    def stats(self):
+        """Return coalescing counters"""
+        with self._lock:
+            stats = dict(self._counters)
+            stats['in_flight'] = len(self._calls)
+        stats['cross_process'] = bool(self.lock_dir)
+        return stats
@@ -35,24 +35,26 @@ document.getElementById('resume-form').addEventListener('submit', async (e) => {
 
     showLoading(true);
 
+    // Render sections as they arrive instead of waiting for the whole resume
+    const partialResume = {};
+    const personalInfo = { name: formData.name, email: formData.email, phone: formData.phone };
+
     try {
-        const response = await fetch('/api/generate-resume', {
-            method: 'POST',
-            headers: {
-                'Content-Type': 'application/json'
-            },
-            body: JSON.stringify(formData)
+        await streamEvents('/api/generate-resume/stream', formData, (event, data) => {
+            if (event === 'section') {
+                partialResume[data.name] = data.value;
+                showLoading(false);
+                schedulePreview(partialResume, personalInfo);
+                document.getElementById('resume-preview').style.display = 'block';
+            } else if (event === 'done') {
+                clearTimeout(previewTimer);
+                displayResume(data.resume, data.personalInfo);
+                document.getElementById('resume-preview').style.display = 'block';
+                document.getElementById('resume-preview').scrollIntoView({ behavior: 'smooth' });
+            } else if (event === 'error') {
+                alert('Error generating resume: ' + data.error);
+            }
         });
-
-        const data = await response.json();
-
-        if (data.success) {
-            displayResume(data.resume, data.personalInfo);
-            document.getElementById('resume-preview').style.display = 'block';
-            document.getElementById('resume-preview').scrollIntoView({ behavior: 'smooth' });
-        } else {
-            alert('Error generating resume: ' + data.error);
-        }
     } catch (error) {
         alert('Error: ' + error.message);
     } finally {
@@ -74,24 +76,23 @@ document.getElementById('cover-letter-form').addEventListener('submit', async (e
 
     showLoading(true);
 
+    const content = document.getElementById('cover-letter-content');
+    content.textContent = '';
+
     try {
-        const response = await fetch('/api/generate-cover-letter', {
-            method: 'POST',
-            headers: {
-                'Content-Type': 'application/json'
-            },
-            body: JSON.stringify(formData)
+        await streamEvents('/api/generate-cover-letter/stream', formData, (event, data) => {
+            if (event === 'token') {
+                // Show the letter as it is written
+                showLoading(false);
+                content.textContent += data.text;
+                document.getElementById('cover-letter-preview').style.display = 'block';
+            } else if (event === 'done') {
+                content.textContent = data.coverLetter;
+                document.getElementById('cover-letter-preview').scrollIntoView({ behavior: 'smooth' });
+            } else if (event === 'error') {
+                alert('Error generating cover letter: ' + data.error);
+            }
         });
-
-        const data = await response.json();
-
-        if (data.success) {
-            document.getElementById('cover-letter-content').textContent = data.coverLetter;
-            document.getElementById('cover-letter-preview').style.display = 'block';
-            document.getElementById('cover-letter-preview').scrollIntoView({ behavior: 'smooth' });
-        } else {
-            alert('Error generating cover letter: ' + data.error);
-        }
     } catch (error) {
         alert('Error: ' + error.message);
     } finally {
@@ -99,91 +100,89 @@ document.getElementById('cover-letter-form').addEventListener('submit', async (e
     }
 });
 
-// Display Resume
-function displayResume(resume, personalInfo) {
-    let html = `
-        <div class="resume-header">
-            <h2 class="resume-name">${personalInfo.name}</h2>
-            <p class="resume-contact">${personalInfo.email} | ${personalInfo.phone}</p>
-        </div>
-    `;
+// POST a JSON body and dispatch each Server-Sent Event in the response
+async function streamEvents(url, body, onEvent) {
+    const response = await fetch(url, {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+            'Accept': 'text/event-stream'
+        },
+        body: JSON.stringify(body)
+    });
 
-    // Summary
-    if (resume.summary) {
-        html += `
-            <div class="resume-section">
-                <h3>Professional Summary</h3>
-                <p>${resume.summary}</p>
-            </div>
-        `;
+    const contentType = response.headers.get('Content-Type') || '';
+    if (!response.ok || !contentType.includes('text/event-stream')) {
+        throw new Error('Request failed with status ' + response.status);
     }
 
-    // Skills
-    if (resume.skills && resume.skills.length > 0) {
-        html += `
-            <div class="resume-section">
-                <h3>Skills</h3>
-                <div class="skills-list">
-                    ${resume.skills.map(skill => `<span class="skill-tag">${skill.trim()}</span>`).join('')}
-                </div>
-            </div>
-        `;
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+
+    while (true) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+
+        let boundary;
+        while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+            const block = buffer.slice(0, boundary);
+            buffer = buffer.slice(boundary + 2);
+
+            let event = 'message';
+            let data = '';
+            block.split('\n').forEach(line => {
+                if (line.startsWith('event:')) event = line.slice(6).trim();
+                else if (line.startsWith('data:')) data += line.slice(5).trim();
+            });
+            if (data) onEvent(event, JSON.parse(data));
+        }
     }
+}
 
-    // Experience
-    if (resume.experience && resume.experience.length > 0) {
-        html += `
-            <div class="resume-section">
-                <h3>Experience</h3>
-                ${resume.experience.map(exp => `
-                    <div class="experience-item">
-                        <div class="item-title">${exp.title} - ${exp.company}</div>
-                        <div class="item-subtitle">${exp.duration}</div>
-                        <div class="item-description">${exp.description}</div>
-                    </div>
-                `).join('')}
-            </div>
-        `;
-    }
+// Preview requests in flight; only the newest response is shown
+let previewSequence = 0;
 
-    // Education
-    if (resume.education && resume.education.length > 0) {
-        html += `
-            <div class="resume-section">
-                <h3>Education</h3>
-                ${resume.education.map(edu => `
-                    <div class="education-item">
-                        <div class="item-title">${edu.degree}</div>
-                        <div class="item-subtitle">${edu.institution} - ${edu.year}</div>
-                        ${edu.details ? `<div class="item-description">${edu.details}</div>` : ''}
-                    </div>
-                `).join('')}
-            </div>
-        `;
-    }
+// Sections often arrive in bursts, so partial previews wait for a pause
+const PREVIEW_DEBOUNCE_MS = 300;
+let previewTimer = null;
 
-    // Projects
-    if (resume.projects && resume.projects.length > 0) {
-        html += `
-            <div class="resume-section">
-                <h3>Projects</h3>
-                ${resume.projects.map(proj => `
-                    <div class="project-item">
-                        <div class="item-title">${proj.name}</div>
-                        <div class="item-description">${proj.description}</div>
-                        <div class="item-subtitle">Technologies: ${proj.technologies}</div>
-                    </div>
-                `).join('')}
-            </div>
-        `;
-    }
+function schedulePreview(resume, personalInfo) {
+    clearTimeout(previewTimer);
+    previewTimer = setTimeout(() => displayResume({ ...resume }, personalInfo), PREVIEW_DEBOUNCE_MS);
+}
 
-    document.getElementById('resume-content').innerHTML = html;
-    
+// Display Resume: the server renders the HTML, so no PDF is built until a download
+async function displayResume(resume, personalInfo) {
     // Store resume data for PDF download
     window.currentResume = { resumeData: resume, personalInfo: personalInfo };
+
+    const sequence = ++previewSequence;
+    const content = document.getElementById('resume-content');
+    try {
+        const response = await fetch('/api/preview', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify(window.currentResume)
+        });
+        if (!response.ok) {
+            throw new Error('Preview failed with status ' + response.status);
+        }
+        const html = await response.text();
+        if (sequence === previewSequence) {
+            content.innerHTML = html;
+        }
+    } catch (error) {
+        if (sequence === previewSequence) {
+            content.textContent = 'Preview unavailable: ' + error.message;
+        }
+    }
 }
 
+// Last downloaded PDF, reused when the server answers 304 Not Modified
+let lastPdf = null;
+
 // Download PDF
 async function downloadPDF() {
     if (!window.currentResume) {
@@ -194,16 +193,26 @@ async function downloadPDF() {
     showLoading(true);
 
     try {
+        const headers = { 'Content-Type': 'application/json' };
+        if (lastPdf) {
+            headers['If-None-Match'] = lastPdf.etag;
+        }
+
         const response = await fetch('/api/download-pdf', {
             method: 'POST',
-            headers: {
-                'Content-Type': 'application/json'
-            },
+            headers: headers,
             body: JSON.stringify(window.currentResume)
         });
 
-        if (response.ok) {
-            const blob = await response.blob();
+        if (response.ok || response.status === 304) {
+            let blob;
+            if (response.status === 304) {
+                blob = lastPdf.blob;
+            } else {
+                blob = await response.blob();
+                const etag = response.headers.get('ETag');
+                lastPdf = etag ? { etag: etag, blob: blob } : null;
+            }
             const url = window.URL.createObjectURL(blob);
             const a = document.createElement('a');
             a.href = url;
@@ -1,16 +1,15 @@
 import streamlit as st
-import requests
-import json
 from datetime import datetime
 import os
 from dotenv import load_dotenv
-from io import BytesIO
-from reportlab.lib.pagesizes import letter
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-from reportlab.lib import colors
 import hashlib
+from grok_client import GrokClient
+from generation_cache import GenerationCache, make_key
+from resume_json import extract_resume
+from pdf_themes import get_theme
+from pdf_cache import PdfCache, pdf_key
+from prompt_builder import PROMPT_VERSION, build_resume_prompt, resume_fields
+from user_store import open_user_store
 
 load_dotenv()
 
@@ -60,101 +59,61 @@ if 'logged_in' not in st.session_state:
     st.session_state.logged_in = False
 if 'username' not in st.session_state:
     st.session_state.username = None
-if 'users' not in st.session_state:
-    st.session_state.users = {}
 if 'resume_data' not in st.session_state:
     st.session_state.resume_data = None
 
 # Persistent storage functions
-USERS_FILE = 'users_data.json'
-
 def hash_password(password):
     """Hash password for security"""
     return hashlib.sha256(password.encode()).hexdigest()
 
-def load_users():
-    """Load users from JSON file"""
-    try:
-        if os.path.exists(USERS_FILE):
-            with open(USERS_FILE, 'r') as f:
-                return json.load(f)
-    except Exception as e:
-        st.error(f"Error loading users: {str(e)}")
-    return {}
-
-def save_users(users):
-    """Save users to JSON file"""
-    try:
-        with open(USERS_FILE, 'w') as f:
-            json.dump(users, f, indent=4)
-        return True
-    except Exception as e:
-        st.error(f"Error saving users: {str(e)}")
-        return False
-
-# Load existing users on startup
-if not st.session_state.users:
-    st.session_state.users = load_users()
+@st.cache_resource
+def get_user_store():
+    """Shared indexed user store; imports users_data.json on first use"""
+    return open_user_store()
 
 # Configure API
 GROK_API_KEY = os.getenv('XAI_API_KEY', st.secrets.get('XAI_API_KEY', ''))
-GROK_API_URL = 'https://api.x.ai/v1/chat/completions'
-
-def generate_resume_with_ai(name, email, phone, skills, education, experience, projects, target_role):
-    """Generate resume using Grok API"""
-    prompt = f"""Generate a professional, tailored resume content for the following student:
+GROK_API_URL = os.getenv('GROK_API_URL', 'https://api.x.ai/v1/chat/completions')
 
-Name: {name}
-Email: {email}
-Phone: {phone}
-Target Role: {target_role}
+@st.cache_resource
+def get_grok_client():
+    """Shared pooled Grok client that survives Streamlit reruns"""
+    return GrokClient(GROK_API_KEY, GROK_API_URL)
 
-Skills: {skills}
-Education: {education}
-Experience: {experience}
-Projects: {projects}
+@st.cache_resource
+def get_generation_cache():
+    """Shared generation cache that survives Streamlit reruns"""
+    return GenerationCache()
 
-Create a compelling, well-structured resume that highlights the most relevant skills and experiences for the {target_role} position. Use professional language and format it with clear sections. Make it ATS-friendly and impactful.
-
-Return the resume in the following JSON format:
-{{
-    "summary": "Professional summary paragraph",
-    "skills": ["skill1", "skill2", "skill3"],
-    "experience": [
-        {{"title": "Job Title", "company": "Company Name", "duration": "Duration", "description": "What you did"}}
-    ],
-    "education": [
-        {{"degree": "Degree", "institution": "School Name", "year": "Year", "details": "Details"}}
-    ],
-    "projects": [
-        {{"name": "Project Name", "description": "What it does", "technologies": "Tech stack"}}
-    ]
-}}"""
+def generate_resume_with_ai(name, email, phone, skills, education, experience, projects, target_role,
+                            bypass_cache=False):
+    """Generate resume using Grok API"""
+    fields = resume_fields({
+        'name': name, 'email': email, 'phone': phone, 'targetRole': target_role,
+        'skills': skills, 'education': education, 'experience': experience, 'projects': projects
+    })
 
     if GROK_API_KEY and GROK_API_KEY != '':
+        cache = get_generation_cache()
+        cache_key = make_key('resume', fields, prompt_version=PROMPT_VERSION, model='grok-beta', temperature=0.7)
+        cached = cache.lookup(cache_key, bypass=bypass_cache)
+        if cached is not None:
+            return cached
+        
         try:
-            headers = {
-                'Content-Type': 'application/json',
-                'Authorization': f'Bearer {GROK_API_KEY}'
-            }
-            
-            payload = {
-                'model': 'grok-beta',
-                'messages': [
-                    {"role": "system", "content": "You are an expert resume writer and career counselor. Create professional, tailored resumes that highlight individual strengths."},
-                    {"role": "user", "content": prompt}
-                ],
-                'temperature': 0.7,
-                'max_tokens': 1500
-            }
+            prompt = build_resume_prompt(fields)
+            ai_content = get_grok_client().chat_completion(
+                messages=prompt['messages'],
+                temperature=0.7,
+                max_tokens=prompt['max_tokens']
+            )
             
-            response = requests.post(GROK_API_URL, headers=headers, json=payload)
-            
-            if response.status_code == 200:
-                ai_content = response.json()['choices'][0]['message']['content']
-                start_idx = ai_content.find('{')
-                end_idx = ai_content.rfind('}') + 1
-                return json.loads(ai_content[start_idx:end_idx])
+            resume_data, missing = extract_resume(ai_content)
+            if missing:
+                st.warning(f"The AI response was missing: {', '.join(missing)}")
+            cache.set(cache_key, resume_data)
+            return resume_data
         except Exception as e:
             st.error(f"AI Generation Error: {str(e)}")
     
@@ -167,201 +126,20 @@ Return the resume in the following JSON format:
         "projects": [{"name": "Projects", "description": projects, "technologies": skills}]
     }
 
-def generate_pdf(resume_data, personal_info):
-    """Generate enhanced professional PDF from resume data"""
-    buffer = BytesIO()
-    doc = SimpleDocTemplate(
-        buffer, 
-        pagesize=letter, 
-        rightMargin=50, 
-        leftMargin=50,
-        topMargin=50, 
-        bottomMargin=40
-    )
-    
-    elements = []
-    styles = getSampleStyleSheet()
-    
-    # Enhanced styles with modern colors and fonts
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=28,
-        textColor=colors.HexColor('#1a237e'),  # Deep blue
-        spaceAfter=4,
-        alignment=1,
-        fontName='Helvetica-Bold',
-        leading=32
-    )
-    
-    subtitle_style = ParagraphStyle(
-        'CustomSubtitle',
-        parent=styles['Normal'],
-        fontSize=11,
-        textColor=colors.HexColor('#424242'),  # Dark gray
-        spaceAfter=16,
-        alignment=1,
-        fontName='Helvetica'
-    )
-    
-    heading_style = ParagraphStyle(
-        'CustomHeading',
-        parent=styles['Heading2'],
-        fontSize=14,
-        textColor=colors.HexColor('#1976d2'),  # Blue
-        spaceAfter=8,
-        spaceBefore=16,
-        fontName='Helvetica-Bold',
-        borderWidth=0,
-        borderPadding=0,
-        leftIndent=0,
-        borderColor=colors.HexColor('#1976d2'),
-        borderRadius=None
-    )
-    
-    content_style = ParagraphStyle(
-        'CustomContent',
-        parent=styles['Normal'],
-        fontSize=10,
-        textColor=colors.HexColor('#212121'),
-        spaceAfter=6,
-        leading=14,
-        fontName='Helvetica'
-    )
-    
-    bold_content_style = ParagraphStyle(
-        'BoldContent',
-        parent=content_style,
-        fontName='Helvetica-Bold',
-        fontSize=11,
-        textColor=colors.HexColor('#424242')
-    )
-    
-    # Header Section with blue background bar
-    header_data = [[Paragraph(personal_info.get('name', 'N/A').upper(), title_style)]]
-    header_table = Table(header_data, colWidths=[500])
-    header_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor('#e3f2fd')),  # Light blue background
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ('TOPPADDING', (0, 0), (-1, -1), 20),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
-        ('LEFTPADDING', (0, 0), (-1, -1), 12),
-        ('RIGHTPADDING', (0, 0), (-1, -1), 12),
-    ]))
-    elements.append(header_table)
-    
-    # Contact Information
-    contact = f"📧 {personal_info.get('email', '')}  |  📱 {personal_info.get('phone', '')}"
-    elements.append(Paragraph(contact, subtitle_style))
-    elements.append(Spacer(1, 0.15*inch))
-    
-    # Professional Summary with accent
-    if resume_data.get('summary'):
-        section_header = Paragraph("═══ PROFESSIONAL SUMMARY ═══", heading_style)
-        elements.append(section_header)
-        
-        summary_data = [[Paragraph(resume_data['summary'], content_style)]]
-        summary_table = Table(summary_data, colWidths=[500])
-        summary_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor('#f5f5f5')),
-            ('BOX', (0, 0), (-1, -1), 1, colors.HexColor('#1976d2')),
-            ('LEFTPADDING', (0, 0), (-1, -1), 12),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 12),
-            ('TOPPADDING', (0, 0), (-1, -1), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 10),
-        ]))
-        elements.append(summary_table)
-        elements.append(Spacer(1, 0.2*inch))
-    
-    # Skills Section with visual styling
-    if resume_data.get('skills'):
-        elements.append(Paragraph("═══ TECHNICAL SKILLS ═══", heading_style))
-        
-        skills_list = resume_data['skills'][:12]  # Top 12 skills
-        if skills_list:
-            # Create skill badges effect
-            skills_rows = []
-            row = []
-            for i, skill in enumerate(skills_list):
-                row.append(Paragraph(f"▪ {skill}", content_style))
-                if (i + 1) % 3 == 0:
-                    skills_rows.append(row)
-                    row = []
-            if row:
-                skills_rows.append(row)
-            
-            skills_table = Table(skills_rows, colWidths=[166, 166, 166])
-            skills_table.setStyle(TableStyle([
-                ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-                ('LEFTPADDING', (0, 0), (-1, -1), 8),
-                ('RIGHTPADDING', (0, 0), (-1, -1), 8),
-                ('TOPPADDING', (0, 0), (-1, -1), 4),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
-            ]))
-            elements.append(skills_table)
-        elements.append(Spacer(1, 0.2*inch))
-    
-    # Experience Section
-    if resume_data.get('experience'):
-        elements.append(Paragraph("═══ PROFESSIONAL EXPERIENCE ═══", heading_style))
-        for exp in resume_data['experience'][:3]:
-            exp_title = f"<b>{exp.get('title', '')}</b> | {exp.get('company', '')}"
-            elements.append(Paragraph(exp_title, bold_content_style))
-            
-            if exp.get('duration'):
-                elements.append(Paragraph(f"<i>{exp.get('duration', '')}</i>", content_style))
-            
-            elements.append(Paragraph(exp.get('description', ''), content_style))
-            elements.append(Spacer(1, 0.12*inch))
-        elements.append(Spacer(1, 0.1*inch))
-    
-    # Education Section
-    if resume_data.get('education'):
-        elements.append(Paragraph("═══ EDUCATION ═══", heading_style))
-        for edu in resume_data['education'][:2]:
-            edu_title = f"<b>{edu.get('degree', '')}</b>"
-            elements.append(Paragraph(edu_title, bold_content_style))
-            
-            edu_info = f"{edu.get('institution', '')} | {edu.get('year', '')}"
-            elements.append(Paragraph(edu_info, content_style))
-            
-            if edu.get('details'):
-                elements.append(Paragraph(edu.get('details', ''), content_style))
-            
-            elements.append(Spacer(1, 0.12*inch))
-        elements.append(Spacer(1, 0.1*inch))
-    
-    # Projects Section
-    if resume_data.get('projects'):
-        elements.append(Paragraph("═══ KEY PROJECTS ═══", heading_style))
-        for proj in resume_data['projects'][:3]:
-            proj_title = f"<b>{proj.get('name', '')}</b>"
-            elements.append(Paragraph(proj_title, bold_content_style))
-            
-            elements.append(Paragraph(proj.get('description', ''), content_style))
-            
-            if proj.get('technologies'):
-                tech_text = f"<i>Technologies: {proj.get('technologies', '')}</i>"
-                elements.append(Paragraph(tech_text, content_style))
-            
-            elements.append(Spacer(1, 0.12*inch))
-    
-    # Footer
-    elements.append(Spacer(1, 0.3*inch))
-    footer_text = f"Generated on {datetime.now().strftime('%B %d, %Y')} | AI Resume Builder"
-    footer_style = ParagraphStyle(
-        'Footer',
-        parent=styles['Normal'],
-        fontSize=8,
-        textColor=colors.HexColor('#757575'),
-        alignment=1
-    )
-    elements.append(Paragraph(footer_text, footer_style))
-    
-    doc.build(elements)
-    buffer.seek(0)
-    return buffer
+# Default for the "Compact PDF" option; the regular writer is used when it is off
+PDF_COMPACT = os.getenv('STREAMLIT_PDF_COMPACT', 'true').lower() == 'true'
+
+@st.cache_resource
+def get_pdf_cache():
+    """Shared rendered-PDF cache that survives Streamlit reruns"""
+    return PdfCache()
+
+def generate_pdf(resume_data, personal_info, compact=PDF_COMPACT):
+    """Generate enhanced professional PDF from resume data, rendered once per content"""
+    theme = get_theme('modern')
+    key = pdf_key(resume_data, personal_info, theme, compact=compact)
+    return get_pdf_cache().get_or_render(
+        key, lambda: theme.render(resume_data, personal_info, compact=compact).getvalue())
 
 def login_page():
     """Login page"""
@@ -377,11 +155,10 @@ def login_page():
             
             if submit:
                 hashed_pwd = hash_password(password)
-                users = load_users()
-                if username in users and users[username].get('password') == hashed_pwd:
+                user = get_user_store().get(username)
+                if user is not None and user.get('password') == hashed_pwd:
                     st.session_state.logged_in = True
                     st.session_state.username = username
-                    st.session_state.users = users
                     st.success("Login successful!")
                     st.rerun()
                 else:
@@ -408,35 +185,81 @@ def register_page():
             submit = st.form_submit_button("Create Account")
             
             if submit:
-                users = load_users()
                 if not all([full_name, username, email, password, confirm_password]):
                     st.error("Please fill in all fields")
                 elif password != confirm_password:
                     st.error("Passwords don't match")
                 elif len(password) < 6:
                     st.error("Password must be at least 6 characters")
-                elif username in users:
-                    st.error("Username already exists")
                 else:
-                    users[username] = {
-                        'password': hash_password(password),
-                        'full_name': full_name,
-                        'email': email,
-                        'created_at': datetime.now().isoformat()
-                    }
-                    if save_users(users):
-                        st.session_state.users = users
-                        st.success("Registration successful! Please login.")
-                        st.session_state.page = 'login'
-                        st.rerun()
+                    try:
+                        created = get_user_store().add(username, {
+                            'password': hash_password(password),
+                            'full_name': full_name,
+                            'email': email,
+                            'created_at': datetime.now().isoformat()
+                        })
+                    except Exception as e:
+                        st.error(f"Registration failed: {str(e)}")
                     else:
-                        st.error("Registration failed. Please try again.")
+                        if not created:
+                            st.error("Username already exists")
+                        else:
+                            st.success("Registration successful! Please login.")
+                            st.session_state.page = 'login'
+                            st.rerun()
         
         st.markdown("---")
         if st.button("Already have an account? Login here"):
             st.session_state.page = 'login'
             st.rerun()
 
+@st.fragment
+def resume_preview():
+    """Preview and PDF download; interacting here reruns only this fragment"""
+    if not st.session_state.resume_data:
+        return
+    
+    st.subheader("📄 Your AI-Generated Resume")
+    
+    resume = st.session_state.resume_data['resume']
+    personal = st.session_state.resume_data['personal']
+    
+    st.markdown(f"### {personal['name']}")
+    st.markdown(f"📧 {personal['email']} | 📱 {personal['phone']}")
+    
+    st.markdown("#### Professional Summary")
+    st.write(resume.get('summary', ''))
+    
+    st.markdown("#### Skills")
+    st.write(" • ".join(resume.get('skills', [])))
+    
+    if resume.get('experience'):
+        st.markdown("#### Experience")
+        for exp in resume['experience']:
+            st.markdown(f"**{exp.get('title', '')}** - {exp.get('company', '')}")
+            st.write(exp.get('description', ''))
+    
+    if resume.get('education'):
+        st.markdown("#### Education")
+        for edu in resume['education']:
+            st.markdown(f"**{edu.get('degree', '')}** - {edu.get('institution', '')}")
+    
+    if resume.get('projects'):
+        st.markdown("#### Projects")
+        for proj in resume['projects']:
+            st.markdown(f"**{proj.get('name', '')}**")
+            st.write(proj.get('description', ''))
+    
+    # Download button; the PDF is only rendered when the resume or the option changed
+    compact = st.checkbox("Compact PDF (smaller file)", value=PDF_COMPACT, key="compact_pdf")
+    st.download_button(
+        label="📥 Download PDF",
+        data=generate_pdf(resume, personal, compact),
+        file_name=f"resume_{personal['name'].replace(' ', '_')}.pdf",
+        mime="application/pdf"
+    )
+
 def main_app():
     """Main application"""
     st.markdown(f"<div class='main-header'><h1>🎓 AI Resume & Portfolio Builder</h1><p>Welcome, {st.session_state.username}!</p></div>", unsafe_allow_html=True)
@@ -458,24 +281,29 @@ def main_app():
         col1, col2 = st.columns(2)
         
         with col1:
-            st.subheader("Personal Information")
-            name = st.text_input("Full Name*", placeholder="John Doe")
-            email = st.text_input("Email*", placeholder="john@example.com")
-            phone = st.text_input("Phone*", placeholder="+1 234 567 8900")
-            target_role = st.text_input("Target Role*", placeholder="Software Engineer")
-            
-            st.subheader("Professional Details")
-            skills = st.text_area("Skills (comma-separated)*", placeholder="Python, JavaScript, React, Machine Learning")
-            education = st.text_area("Education*", placeholder="Bachelor of Technology in Computer Science\nXYZ University, 2024")
-            experience = st.text_area("Experience", placeholder="Software Engineering Intern at ABC Corp\nJune 2023 - August 2023")
-            projects = st.text_area("Projects*", placeholder="1. E-commerce Platform\n2. ML Image Classifier")
+            # A form, so typing in the inputs does not rerun the page
+            with st.form("resume_form"):
+                st.subheader("Personal Information")
+                name = st.text_input("Full Name*", placeholder="John Doe")
+                email = st.text_input("Email*", placeholder="john@example.com")
+                phone = st.text_input("Phone*", placeholder="+1 234 567 8900")
+                target_role = st.text_input("Target Role*", placeholder="Software Engineer")
+                
+                st.subheader("Professional Details")
+                skills = st.text_area("Skills (comma-separated)*", placeholder="Python, JavaScript, React, Machine Learning")
+                education = st.text_area("Education*", placeholder="Bachelor of Technology in Computer Science\nXYZ University, 2024")
+                experience = st.text_area("Experience", placeholder="Software Engineering Intern at ABC Corp\nJune 2023 - August 2023")
+                projects = st.text_area("Projects*", placeholder="1. E-commerce Platform\n2. ML Image Classifier")
+                regenerate = st.checkbox("Force a fresh generation (skip cached result)")
+                submitted = st.form_submit_button("✨ Generate AI Resume", type="primary")
             
-            if st.button("✨ Generate AI Resume", type="primary"):
+            if submitted:
                 if all([name, email, phone, target_role, skills, education, projects]):
                     with st.spinner("Generating your professional resume with AI..."):
                         resume_data = generate_resume_with_ai(
                             name, email, phone, skills, education, 
-                            experience, projects, target_role
+                            experience, projects, target_role,
+                            bypass_cache=regenerate
                         )
                         st.session_state.resume_data = {
                             'resume': resume_data,
@@ -486,46 +314,7 @@ def main_app():
                     st.error("Please fill in all required fields (*)")
         
         with col2:
-            if st.session_state.resume_data:
-                st.subheader("📄 Your AI-Generated Resume")
-                
-                resume = st.session_state.resume_data['resume']
-                personal = st.session_state.resume_data['personal']
-                
-                st.markdown(f"### {personal['name']}")
-                st.markdown(f"📧 {personal['email']} | 📱 {personal['phone']}")
-                
-                st.markdown("#### Professional Summary")
-                st.write(resume.get('summary', ''))
-                
-                st.markdown("#### Skills")
-                st.write(" • ".join(resume.get('skills', [])))
-                
-                if resume.get('experience'):
-                    st.markdown("#### Experience")
-                    for exp in resume['experience']:
-                        st.markdown(f"**{exp.get('title', '')}** - {exp.get('company', '')}")
-                        st.write(exp.get('description', ''))
-                
-                if resume.get('education'):
-                    st.markdown("#### Education")
-                    for edu in resume['education']:
-                        st.markdown(f"**{edu.get('degree', '')}** - {edu.get('institution', '')}")
-                
-                if resume.get('projects'):
-                    st.markdown("#### Projects")
-                    for proj in resume['projects']:
-                        st.markdown(f"**{proj.get('name', '')}**")
-                        st.write(proj.get('description', ''))
-                
-                # Download button
-                pdf_buffer = generate_pdf(resume, personal)
-                st.download_button(
-                    label="📥 Download PDF",
-                    data=pdf_buffer,
-                    file_name=f"resume_{personal['name'].replace(' ', '_')}.pdf",
-                    mime="application/pdf"
-                )
+            resume_preview()
     
     elif page == "Cover Letter":
         st.header("✉️ Cover Letter Generator")
@@ -0,0 +1,140 @@
+"""
+Tests for the async generation endpoints
+Run with: pytest test_asgi_app.py
+"""
+
+import asyncio
+
+import httpx
+import pytest
+from flask import has_app_context
+from starlette.testclient import TestClient
+
+import app as flask_module
+from app import app as flask_app
+from asgi_app import application
+from grok_client import AsyncGrokClient
+
+RESUME_DATA = {
+    'name': 'Test User',
+    'email': 'test@example.com',
+    'phone': '+1234567890',
+    'targetRole': 'Software Engineer',
+    'skills': 'Python, JavaScript',
+    'education': 'B.Tech CS',
+    'experience': 'Intern at Tech Corp',
+    'projects': 'Built web apps'
+}
+
+
+@pytest.fixture
+def saved(monkeypatch):
+    """Record resume history writes instead of touching the database"""
+    calls = []
+
+    def store_resume_version(user_id, resume_data, personal_info, target_role):
+        calls.append((user_id, personal_info['name'], target_role, has_app_context()))
+        return len(calls)
+
+    monkeypatch.setattr(flask_module, 'store_resume_version', store_resume_version)
+    return calls
+
+
+@pytest.fixture
+def client(saved):
+    """Create an ASGI test client"""
+    with TestClient(application) as client:
+        yield client
+
+
+def session_cookie(user_id):
+    serializer = flask_app.session_interface.get_signing_serializer(flask_app)
+    return serializer.dumps({'_user_id': user_id})
+
+
+def test_requires_login(client):
+    """Anonymous callers are rejected without reaching Grok"""
+    response = client.post('/api/generate-resume', json=RESUME_DATA)
+    assert response.status_code == 401
+
+
+def test_resume_contract_matches_flask(client):
+    """Async resume endpoint returns the same JSON shape as the Flask view"""
+    client.cookies.set(flask_app.config['SESSION_COOKIE_NAME'], session_cookie('1'))
+    response = client.post('/api/generate-resume', json=RESUME_DATA)
+
+    assert response.status_code == 200
+    result = response.json()
+    assert result['success'] is True
+    assert set(result) >= {'resume', 'personalInfo'}
+    assert result['personalInfo']['name'] == 'Test User'
+
+
+def test_resume_is_saved_to_history(client, saved):
+    """The async endpoint records history like the Flask view and returns the id"""
+    client.cookies.set(flask_app.config['SESSION_COOKIE_NAME'], session_cookie('7'))
+    response = client.post('/api/generate-resume', json=RESUME_DATA)
+
+    assert response.json()['resumeId'] == 1
+    assert saved == [('7', 'Test User', 'Software Engineer', True)]
+
+
+class LoopCheckingCache:
+    """Generation cache that records whether each call ran on the event loop"""
+
+    def __init__(self):
+        self.on_loop = []
+
+    def _record(self):
+        try:
+            asyncio.get_running_loop()
+            self.on_loop.append(True)
+        except RuntimeError:
+            self.on_loop.append(False)
+
+    def lookup(self, key, bypass=False):
+        self._record()
+        return 'Cached letter'
+
+    def set(self, key, value):
+        self._record()
+
+
+def test_cache_io_runs_off_the_event_loop(client, monkeypatch):
+    """The cache's disk tier blocks, so lookups must not run on the loop"""
+    cache = LoopCheckingCache()
+    monkeypatch.setattr(flask_module, 'GROK_API_KEY', 'xai-test-key')
+    monkeypatch.setattr(flask_module.generator, 'cache', cache)
+    client.cookies.set(flask_app.config['SESSION_COOKIE_NAME'], session_cookie('1'))
+    response = client.post('/api/generate-cover-letter', json={'name': 'Test User', 'company': 'Tech Corp'})
+
+    assert response.json()['coverLetter'] == 'Cached letter'
+    assert cache.on_loop == [False]
+
+
+def test_cover_letter_and_flask_fallthrough(client):
+    """Non-async routes are still served by the mounted Flask app"""
+    client.cookies.set(flask_app.config['SESSION_COOKIE_NAME'], session_cookie('1'))
+    response = client.post('/api/generate-cover-letter', json={'name': 'Test User', 'company': 'Tech Corp'})
+    assert response.json()['coverLetter'].startswith('Dear Hiring Manager')
+    assert client.get('/login').status_code == 200
+
+
+def test_in_flight_cap():
+    """No more than max_in_flight upstream calls run at once"""
+    async def handler(request):
+        await asyncio.sleep(0.02)
+        return httpx.Response(200, json={'choices': [{'message': {'content': 'ok'}}]})
+
+    async def run():
+        grok = AsyncGrokClient('test-key', 'http://grok.test/v1/chat/completions', max_in_flight=3)
+        grok._get_client()
+        grok._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        results = await asyncio.gather(*[grok.chat_completion([]) for _ in range(20)])
+        await grok.aclose()
+        return results, grok.stats()
+
+    results, stats = asyncio.run(run())
+    assert results == ['ok'] * 20
+    assert stats['calls'] == 20
+    assert stats['peak_in_flight'] == 3
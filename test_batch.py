@@ -0,0 +1,154 @@
+"""
+Tests for bulk resume generation
+Run with: pytest test_batch.py
+"""
+
+import io
+import json
+import zipfile
+
+import pytest
+
+import app as app_module
+from app import app
+from benchmarks.fixtures import PERSONAL_INFO, TYPICAL_RESUME
+from pdf_cache import PdfCache, pdf_key
+from pdf_pool import PdfRenderPool
+from pdf_themes import get_theme
+from zip_stream import stream_zip
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """Create test client with authentication disabled"""
+    app.config['TESTING'] = True
+    monkeypatch.setitem(app.config, 'LOGIN_DISABLED', True)
+    monkeypatch.setattr(app_module, 'pdf_pool', PdfRenderPool(workers=0))
+    with app.test_client() as client:
+        yield client
+
+
+def read_lines(response):
+    return [json.loads(line) for line in response.data.decode().splitlines()]
+
+
+def test_batch_json_list(client):
+    """Every profile in a JSON list gets one NDJSON result tagged with its index"""
+    profiles = [{'name': f'Student {i}', 'skills': 'Python'} for i in range(5)]
+    response = client.post('/api/generate-resumes/batch?parallelism=2', json=profiles)
+
+    assert response.status_code == 200
+    assert response.mimetype == 'application/x-ndjson'
+    results = read_lines(response)
+    assert sorted(result['index'] for result in results) == list(range(5))
+    by_index = {result['index']: result for result in results}
+    assert by_index[3]['personalInfo']['name'] == 'Student 3'
+
+
+def test_batch_ndjson_with_bad_lines(client):
+    """Malformed entries fail individually without aborting the batch"""
+    body = '\n'.join([
+        json.dumps({'name': 'Ada', 'skills': 'Go'}),
+        '{not json',
+        json.dumps(['not', 'an', 'object']),
+        json.dumps({'name': 'Grace', 'skills': 'COBOL'})
+    ])
+    response = client.post('/api/generate-resumes/batch', data=body, content_type='application/x-ndjson')
+
+    by_index = {result['index']: result for result in read_lines(response)}
+    assert by_index[0]['success'] and by_index[3]['success']
+    assert not by_index[1]['success'] and not by_index[2]['success']
+
+
+def test_stream_zip_yields_each_member_before_the_next():
+    """Members are written as they are produced, not after the archive is built"""
+    produced = []
+
+    def members():
+        for name in ('a.pdf', 'b.pdf'):
+            produced.append(name)
+            yield name, name.encode() * 100
+
+    chunks = []
+    for chunk in stream_zip(members()):
+        chunks.append((len(produced), chunk))
+
+    assert [count for count, _ in chunks[:2]] == [1, 2]
+    archive = zipfile.ZipFile(io.BytesIO(b''.join(chunk for _, chunk in chunks)))
+    assert archive.read('b.pdf') == b'b.pdf' * 100
+
+
+def test_bulk_pdf_export_zip_with_manifest(client):
+    """Each good entry becomes a PDF in the archive; failures are listed in the manifest"""
+    resumes = [
+        {'resumeData': TYPICAL_RESUME, 'personalInfo': PERSONAL_INFO},
+        {'resumeData': TYPICAL_RESUME, 'personalInfo': {'name': 'Grace Hopper'}, 'theme': 'modern'},
+        {'resumeData': TYPICAL_RESUME, 'personalInfo': PERSONAL_INFO, 'theme': 'no-such-theme'},
+        'not an object'
+    ]
+    response = client.post('/api/download-pdf/batch?parallelism=2', json={'resumes': resumes})
+
+    assert response.status_code == 200
+    assert response.mimetype == 'application/zip'
+    archive = zipfile.ZipFile(io.BytesIO(response.data))
+    manifest = json.loads(archive.read('manifest.json'))
+    assert (manifest['total'], manifest['succeeded'], manifest['failed']) == (4, 2, 2)
+    assert [entry['index'] for entry in manifest['entries']] == [0, 1, 2, 3]
+
+    files = [entry['file'] for entry in manifest['entries'] if entry['success']]
+    assert files[1] == '0001_Grace_Hopper.pdf'
+    for name in files:
+        assert archive.read(name).startswith(b'%PDF')
+    assert 'no-such-theme' in manifest['entries'][2]['error']
+
+
+def test_bulk_pdf_export_does_not_count_toward_cache_stats(client, monkeypatch):
+    """Bulk lookups reuse cached PDFs without skewing the download hit ratio"""
+    cache = PdfCache()
+    cache.set(pdf_key(TYPICAL_RESUME, PERSONAL_INFO, get_theme(None)), b'%PDF cached')
+    monkeypatch.setattr(app_module, 'pdf_cache', cache)
+    resumes = [{'resumeData': TYPICAL_RESUME, 'personalInfo': PERSONAL_INFO},
+               {'resumeData': TYPICAL_RESUME, 'personalInfo': {'name': 'Grace Hopper'}}]
+    response = client.post('/api/download-pdf/batch', json=resumes)
+
+    archive = zipfile.ZipFile(io.BytesIO(response.data))
+    files = [entry['file'] for entry in json.loads(archive.read('manifest.json'))['entries']]
+    assert archive.read(files[0]) == b'%PDF cached'
+    stats = cache.stats()
+    assert stats['hits'] == 0 and stats['misses'] == 0
+
+
+def test_bulk_pdf_export_rejects_unknown_default_theme(client):
+    response = client.post('/api/download-pdf/batch?theme=no-such-theme', json=[])
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize('kwargs', [
+    {'data': 'name=Ada', 'content_type': 'text/plain'},
+    {'data': '{not json', 'content_type': 'application/json'},
+    {'json': 'just a string'},
+    {'json': {'foo': 1}},
+    {'json': {'profiles': 'not a list'}}
+])
+def test_batch_rejects_malformed_bodies_before_streaming(client, kwargs):
+    response = client.post('/api/generate-resumes/batch', **kwargs)
+
+    assert response.status_code == 400 and response.mimetype == 'application/json'
+    assert response.json['success'] is False
+
+
+def test_batch_accepts_object_with_profiles(client):
+    response = client.post('/api/generate-resumes/batch', json={'profiles': [{'name': 'Ada'}]})
+    assert response.status_code == 200 and [r['index'] for r in read_lines(response)] == [0]
+
+
+@pytest.mark.parametrize('kwargs', [
+    {'data': 'garbage', 'content_type': 'text/plain'},
+    {'data': '[{"resumeData"', 'content_type': 'application/json'},
+    {'json': {'profiles': []}}
+])
+def test_bulk_pdf_export_rejects_malformed_bodies_before_zipping(client, kwargs):
+    response = client.post('/api/download-pdf/batch', **kwargs)
+
+    assert response.status_code == 400 and response.mimetype == 'application/json'
+    assert 'resumes' in response.json['error']
@@ -0,0 +1,60 @@
+"""
+Tests for the offline benchmark suite
+Run with: pytest test_benchmark_suite.py
+"""
+
+from benchmarks import suite
+from benchmarks.fixtures import RESUMES
+
+
+def test_suite_runs_offline_and_measures_every_fixture():
+    results = suite.run_suite(repeat=1, only='generate_resume')
+
+    assert sorted(results['cases']) == sorted(f'generate_resume/{name}' for name in RESUMES)
+    for measured in results['cases'].values():
+        assert measured['ms'] > 0 and measured['peak_kib'] > 0 and measured['blocks'] > 0
+
+
+def test_baselines_cover_every_case():
+    baseline = suite.load(suite.BASELINE_PATH)
+    assert sorted(baseline['cases']) == sorted(f'{case}/{name}' for case in suite.CASES for name in RESUMES)
+
+
+def test_compare_flags_regressions_beyond_threshold():
+    baseline = {'cases': {'parse_resume/typical': {'ms': 1.0, 'peak_kib': 10.0, 'blocks': 100}}}
+    current = {'cases': {'parse_resume/typical': {'ms': 1.2, 'peak_kib': 12.0, 'blocks': 105},
+                         'parse_resume/new': {'ms': 1.0, 'peak_kib': 1.0, 'blocks': 1}}}
+
+    rows = suite.compare(baseline, current, threshold=0.10, time_threshold=0.30)
+    assert {metric: regressed for _, metric, _, _, _, regressed in rows} == \
+        {'ms': False, 'peak_kib': True, 'blocks': False}
+
+    tiny = {'cases': {'parse_resume/typical': {'ms': 0.02, 'peak_kib': 10.0, 'blocks': 100}}}
+    slower = {'cases': {'parse_resume/typical': {'ms': 0.04, 'peak_kib': 10.0, 'blocks': 100}}}
+    assert not any(row[-1] for row in suite.compare(tiny, slower))
+
+
+def test_compare_ignores_timing_changes_within_the_noise_band():
+    baseline = {'cases': {'download_pdf/typical': {'ms': 2.0, 'ms_mad': 0.4, 'peak_kib': 10.0, 'blocks': 100}}}
+    noisy = {'cases': {'download_pdf/typical': {'ms': 3.0, 'ms_mad': 0.1, 'ms_spread': 0.5,
+                                                 'peak_kib': 10.0, 'blocks': 100}}}
+    assert not any(row[-1] for row in suite.compare(baseline, noisy))
+
+    slower = {'cases': {'download_pdf/typical': {'ms': 3.5, 'ms_mad': 0.1, 'ms_spread': 0.5,
+                                                  'peak_kib': 10.0, 'blocks': 100}}}
+    assert [row[1] for row in suite.compare(baseline, slower) if row[-1]] == ['ms']
+
+
+def test_repeated_runs_keep_the_median_of_each_case(monkeypatch):
+    timings = iter([1.0, 5.0, 2.0])
+
+    def fake_run_suite(repeat, only):
+        return {'repeat': repeat, 'cases': {'parse_resume/typical': {
+            'ms': next(timings), 'ms_mad': 0.1, 'peak_kib': 10.0, 'blocks': 100}}}
+
+    monkeypatch.setattr(suite, 'run_suite', fake_run_suite)
+    results = suite.run_repeatedly(3, repeat=1)
+
+    assert results['runs'] == 3
+    assert results['cases']['parse_resume/typical'] == {
+        'ms': 2.0, 'ms_mad': 0.1, 'peak_kib': 10.0, 'blocks': 100, 'ms_spread': 4.0}
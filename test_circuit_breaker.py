@@ -0,0 +1,149 @@
+"""
+Tests for the upstream circuit breaker, hedging and latency budget
+Run with: pytest test_circuit_breaker.py
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+import app as app_module
+from app import app
+from circuit_breaker import CircuitBreaker, CLOSED, OPEN, HALF_OPEN, TIER_GROK, TIER_TEMPLATE
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def failing():
+    raise RuntimeError('upstream down')
+
+
+def breaker(**kwargs):
+    settings = dict(window=10, min_calls=4, error_threshold=0.5, latency_threshold=5,
+                    open_seconds=30, hedge_delay=0, latency_budget=0)
+    settings.update(kwargs)
+    return CircuitBreaker(**settings)
+
+
+def test_trips_on_errors_and_recovers_through_half_open():
+    clock = FakeClock()
+    cb = breaker(clock=clock)
+    for _ in range(4):
+        assert cb.call(failing, lambda: 'template') == ('template', TIER_TEMPLATE)
+    assert cb.state == OPEN
+
+    # While open the upstream is not called at all
+    calls = []
+    assert cb.call(lambda: calls.append(1), lambda: 'template') == ('template', TIER_TEMPLATE)
+    assert calls == []
+    assert cb.stats()['short_circuited'] == 1
+
+    clock.now = 31
+    assert cb.state == HALF_OPEN
+    assert cb.call(failing, lambda: 'template')[1] == TIER_TEMPLATE
+    assert cb.state == OPEN
+
+    clock.now = 62
+    assert cb.call(lambda: 'ai', lambda: 'template') == ('ai', TIER_GROK)
+    assert cb.state == CLOSED
+    assert cb.stats()['trips'] == 2
+
+
+def test_trips_on_tail_latency():
+    clock = FakeClock()
+    cb = breaker(clock=clock)
+
+    def slow():
+        clock.now += 6
+        return 'ai'
+
+    for _ in range(4):
+        assert cb.call(slow, lambda: 'template')[1] == TIER_GROK
+    assert cb.state == OPEN
+
+
+def test_half_open_allows_a_single_probe():
+    clock = FakeClock()
+    cb = breaker(clock=clock)
+    for _ in range(4):
+        cb.record_failure(0.1)
+    clock.now = 31
+    assert cb.allow_request()
+    assert not cb.allow_request()
+
+
+def test_hedged_request_wins_when_first_stalls():
+    cb = breaker(hedge_delay=0.05)
+    release = threading.Event()
+    attempts = []
+
+    def call():
+        attempts.append(1)
+        if len(attempts) == 1:
+            release.wait(2)
+            return 'slow'
+        return 'fast'
+
+    assert cb.call(call, lambda: 'template') == ('fast', TIER_GROK)
+    release.set()
+    stats = cb.stats()
+    assert stats['hedges_sent'] == 1 and stats['hedges_won'] == 1
+
+
+def test_latency_budget_serves_template():
+    cb = breaker(latency_budget=0.1)
+    start = time.monotonic()
+    assert cb.call(lambda: time.sleep(1) or 'ai', lambda: 'template') == ('template', TIER_TEMPLATE)
+    assert time.monotonic() - start < 0.5
+    assert cb.stats()['budget_exceeded'] == 1
+
+
+def test_async_hedge_and_budget():
+    cb = breaker(hedge_delay=0.05, latency_budget=0.5)
+    attempts = []
+
+    async def call():
+        attempts.append(1)
+        await asyncio.sleep(1 if len(attempts) == 1 else 0.01)
+        return len(attempts)
+
+    result, tier = asyncio.run(cb.acall(call, lambda: 'template'))
+    assert (result, tier) == (2, TIER_GROK)
+
+    async def stalled():
+        await asyncio.sleep(5)
+
+    cb = breaker(latency_budget=0.05)
+    assert asyncio.run(cb.acall(stalled, lambda: 'template')) == ('template', TIER_TEMPLATE)
+
+
+@pytest.fixture
+def client(monkeypatch):
+    app.config['TESTING'] = True
+    monkeypatch.setitem(app.config, 'LOGIN_DISABLED', True)
+    monkeypatch.setattr(app_module, 'GROK_API_KEY', 'xai-test-key')
+    monkeypatch.setattr(app_module.generator, 'circuit_breaker', breaker())
+    with app.test_client() as client:
+        yield client
+
+
+def test_failing_upstream_degrades_to_template(client, monkeypatch):
+    """An upstream failure is answered with the template, flagged by tier"""
+    def boom(**kwargs):
+        raise RuntimeError('upstream down')
+
+    monkeypatch.setattr(app_module.generator.grok_client, 'chat_completion', boom)
+    response = client.post('/api/generate-resume', json={'name': 'Ada', 'skills': 'Go', 'noCache': True})
+
+    assert response.status_code == 200
+    assert response.json['tier'] == 'template'
+    assert response.json['cached'] is False
+    assert app_module.generator.circuit_breaker.stats()['fallbacks'] == 1
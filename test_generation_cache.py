@@ -0,0 +1,54 @@
+"""
+Tests for the generation response cache
+Run with: pytest test_generation_cache.py
+"""
+
+import time
+
+from generation_cache import GenerationCache, make_key
+
+
+def test_key_ignores_cosmetic_whitespace():
+    """Re-submitted forms with stray whitespace share a cache entry"""
+    first = make_key('resume', {'skills': 'Python,  SQL '}, model='grok-beta', temperature=0.7)
+    second = make_key('resume', {'skills': ' Python, SQL'}, model='grok-beta', temperature=0.7)
+    other_model = make_key('resume', {'skills': 'Python, SQL'}, model='grok-2', temperature=0.7)
+    assert first == second
+    assert first != other_model
+
+
+def test_lru_eviction_and_counters():
+    """Oldest entries are evicted once the memory tier is full"""
+    cache = GenerationCache(max_entries=2, ttl=60, db_path='')
+    cache.set('a', {'summary': 'A'})
+    cache.set('b', {'summary': 'B'})
+    assert cache.get('a') == {'summary': 'A'}
+    cache.set('c', {'summary': 'C'})
+
+    assert cache.get('b') is None
+    assert cache.get('c') == {'summary': 'C'}
+    stats = cache.stats()
+    assert stats['hits'] == 2
+    assert stats['misses'] == 1
+    assert stats['evictions'] == 1
+
+
+def test_ttl_and_bypass():
+    """Expired entries miss, and bypassed lookups never read the cache"""
+    cache = GenerationCache(max_entries=10, ttl=0.05, db_path='')
+    cache.set('key', 'letter')
+    assert cache.lookup('key', bypass=True) is None
+    assert cache.lookup('key') == 'letter'
+    time.sleep(0.1)
+    assert cache.get('key') is None
+    assert cache.stats()['bypasses'] == 1
+
+
+def test_disk_tier_survives_restart(tmp_path):
+    """A new cache instance on the same SQLite file sees earlier entries"""
+    db_path = str(tmp_path / 'cache.db')
+    GenerationCache(max_entries=10, ttl=60, db_path=db_path).set('key', {'skills': ['Go']})
+
+    restarted = GenerationCache(max_entries=10, ttl=60, db_path=db_path)
+    assert restarted.get('key') == {'skills': ['Go']}
+    assert restarted.stats()['disk_hits'] == 1
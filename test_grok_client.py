@@ -0,0 +1,94 @@
+"""
+Tests for the pooled Grok HTTP client
+Run with: pytest test_grok_client.py
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from grok_client import GrokClient, GrokAPIError
+
+
+class FakeGrokHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        if payload.get('stream'):
+            chunks = [{'choices': [{'delta': {'content': word}}]} for word in ('Dear ', 'Hiring ', 'Manager')]
+            body = ''.join(f'data: {json.dumps(chunk)}\n\n' for chunk in chunks) + 'data: [DONE]\n\n'
+            body = body.encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/event-stream')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        if payload.get('model') == 'slow':
+            time.sleep(0.5)
+        status = 500 if payload.get('model') == 'broken' else 200
+        body = json.dumps({'choices': [{'message': {'content': 'hello'}}]}).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server_url():
+    """Start a local keep-alive server speaking the completions protocol"""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FakeGrokHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_address[1]}/v1/chat/completions'
+    server.shutdown()
+    server.server_close()
+
+
+def test_connections_are_reused(server_url):
+    """Sequential calls should share one keep-alive connection"""
+    client = GrokClient('test-key', server_url, pool_size=2)
+    for _ in range(3):
+        assert client.chat_completion([{'role': 'user', 'content': 'hi'}]) == 'hello'
+
+    stats = client.stats()
+    assert stats['calls'] == 3
+    assert stats['connections_opened'] == 1
+    assert stats['pool_hits'] == 2
+    client.close()
+
+
+def test_read_timeout_is_enforced(server_url):
+    """A stalled upstream should raise instead of hanging the caller"""
+    client = GrokClient('test-key', server_url, read_timeout=0.1)
+    with pytest.raises(requests.Timeout):
+        client.chat_completion([], model='slow')
+    assert client.stats()['timeouts'] == 1
+    client.close()
+
+
+def test_error_status_raises(server_url):
+    """Non-200 responses surface as GrokAPIError"""
+    client = GrokClient('test-key', server_url)
+    with pytest.raises(GrokAPIError):
+        client.chat_completion([], model='broken')
+    assert client.stats()['errors'] == 1
+    client.close()
+
+
+def test_stream_yields_deltas_and_reuses_connection(server_url):
+    """Streamed completions yield content deltas and release the connection"""
+    client = GrokClient('test-key', server_url)
+    assert list(client.stream_chat_completion([])) == ['Dear ', 'Hiring ', 'Manager']
+    assert client.chat_completion([]) == 'hello'
+    assert client.stats()['connections_opened'] == 1
+    client.close()
@@ -0,0 +1,68 @@
+"""
+Tests for the server-rendered HTML resume preview
+Run with: pytest test_html_preview.py
+"""
+
+import pytest
+
+import main
+from benchmarks.fixtures import PERSONAL_INFO, TYPICAL_RESUME, UNICODE_RESUME
+from html_preview import HtmlPreview, HtmlPreviewCache, PREVIEW_TEMPLATE
+
+
+@pytest.fixture
+def preview():
+    return HtmlPreview()
+
+
+def test_preview_escapes_markup_and_renders_markdown(preview):
+    resume = {
+        'summary': 'Ships **reliable** services <script>alert(1)</script>',
+        'skills': ['Python', '<b>SQL</b>'],
+        'experience': [{'title': 'Intern', 'company': 'A & B', 'duration': '2024',
+                        'description': '- built APIs\n- wrote tests'}]
+    }
+    html, _ = preview.render(resume, {'name': '<i>Jordan</i>', 'email': 'j@example.com', 'phone': '1'})
+    html = html.decode('utf-8')
+
+    assert '<strong>reliable</strong>' in html
+    assert '<script>' not in html and '&lt;script&gt;' in html
+    assert '&lt;b&gt;SQL&lt;/b&gt;' in html and '&lt;i&gt;Jordan&lt;/i&gt;' in html
+    assert '<li>built APIs</li>' in html and 'A &amp; B' in html
+    assert 'Education' not in html
+
+
+def test_preview_is_rendered_once_per_content(preview):
+    first, etag = preview.render(UNICODE_RESUME, PERSONAL_INFO)
+    again, same_etag = preview.render(dict(reversed(list(UNICODE_RESUME.items()))), PERSONAL_INFO)
+
+    assert again is first and same_etag == etag
+    assert preview.cache.stats()['hits'] == 1 and preview.cache.stats()['stores'] == 1
+
+
+def test_template_changes_change_the_key(tmp_path, preview):
+    template = tmp_path / PREVIEW_TEMPLATE
+    template.write_text('<p>{{ personal.name }}</p>')
+    edited = HtmlPreview(templates_dir=str(tmp_path))
+
+    assert edited.key(TYPICAL_RESUME, PERSONAL_INFO) != preview.key(TYPICAL_RESUME, PERSONAL_INFO)
+    assert edited.render(TYPICAL_RESUME, PERSONAL_INFO)[0] == f"<p>{PERSONAL_INFO['name']}</p>".encode()
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(main.html_preview, 'cache', HtmlPreviewCache())
+    with main.app.test_client() as client:
+        yield client
+
+
+def test_preview_endpoint_answers_html_and_304(client):
+    body = {'resumeData': TYPICAL_RESUME, 'personalInfo': PERSONAL_INFO}
+    response = client.post('/api/preview', json=body)
+
+    assert response.status_code == 200 and response.mimetype == 'text/html'
+    assert PERSONAL_INFO['name'] in response.get_data(as_text=True)
+
+    repeat = client.post('/api/preview', json=body, headers={'If-None-Match': response.headers['ETag']})
+    assert repeat.status_code == 304 and repeat.data == b''
+    assert client.get('/api/metrics').json['preview_cache']['not_modified'] == 1
@@ -0,0 +1,87 @@
+"""
+Tests for the Flask-Login identity cache
+Run with: pytest test_identity_cache.py
+"""
+
+import pytest
+from flask import Flask, session
+
+import app as app_module
+from identity_cache import Identity, IdentityCache
+from models import db, User
+
+
+class Row:
+    def __init__(self, id):
+        self.id, self.username, self.email, self.full_name = id, f'user{id}', f'{id}@example.com', 'Name'
+
+
+def test_cache_serves_hits_and_respects_ttl_and_bound(monkeypatch):
+    loads = []
+    cache = IdentityCache(max_entries=2, ttl=60)
+
+    def load(user_id):
+        return cache.load(user_id, lambda: loads.append(user_id) or Row(user_id))
+
+    assert load(1).username == 'user1' and load('1') is load(1)
+    load(2), load(3), load(1)
+    assert loads == [1, 2, 3, 1]
+
+    clock = [0.0]
+    monkeypatch.setattr('identity_cache.time.monotonic', lambda: clock[0])
+    stale = IdentityCache(ttl=60)
+    stale.load(7, lambda: Row(7))
+    clock[0] = 61.0
+    stale.load(7, lambda: Row(7))
+
+    stats = cache.stats()
+    assert stats['db_hits_avoided'] == 2 and stats['db_loads'] == 4 and stats['evictions'] == 2
+    assert stale.stats()['expirations'] == 1
+
+
+@pytest.fixture
+def memory_app(monkeypatch):
+    flask_app = Flask('identity_cache_test')
+    flask_app.config.update(SECRET_KEY='test', SQLALCHEMY_DATABASE_URI='sqlite:///:memory:')
+    db.init_app(flask_app)
+    monkeypatch.setattr(app_module, 'identity_cache', IdentityCache())
+    app_module.identity_cache.watch(User)
+    with flask_app.app_context():
+        db.create_all()
+        user = User(username='ada', email='ada@example.com', full_name='Ada')
+        user.set_password('secret1')
+        db.session.add(user)
+        db.session.commit()
+        yield flask_app, user.id
+
+
+def test_committed_user_updates_evict_the_cached_identity(memory_app):
+    flask_app, user_id = memory_app
+    with flask_app.test_request_context('/'):
+        assert app_module.load_user(str(user_id)).full_name == 'Ada'
+        assert app_module.load_user(str(user_id)).full_name == 'Ada'
+
+        db.session.get(User, user_id).full_name = 'Ada Lovelace'
+        db.session.commit()
+
+        assert app_module.load_user(str(user_id)).full_name == 'Ada Lovelace'
+    stats = app_module.identity_cache.stats()
+    assert stats['invalidations'] == 1 and stats['db_loads'] == 2 and stats['hits'] == 1
+
+
+def test_claims_mode_skips_the_database_on_api_routes(memory_app, monkeypatch):
+    flask_app, user_id = memory_app
+    monkeypatch.setattr(app_module, 'IDENTITY_CLAIMS', True)
+
+    with flask_app.test_request_context('/'):
+        assert isinstance(app_module.load_user(str(user_id)), Identity)
+        claims = session['identity']
+    with flask_app.test_request_context('/api/download-pdf'):
+        session['identity'] = claims
+        assert app_module.load_user(str(user_id)).username == 'ada'
+    with flask_app.test_request_context('/'):
+        session['identity'] = claims
+        assert app_module.load_user(str(user_id)).username == 'ada'
+
+    stats = app_module.identity_cache.stats()
+    assert stats['claims_hits'] == 1 and stats['hits'] == 1 and stats['db_loads'] == 1
@@ -0,0 +1,46 @@
+"""
+Tests for the database setup and registration checks
+Run with: pytest test_models.py
+"""
+
+from flask import Flask
+from sqlalchemy import text
+
+import app as app_module
+from models import db, User, engine_options, tune_sqlite
+
+
+def make_app(uri):
+    flask_app = Flask('models_test')
+    flask_app.config.update(SQLALCHEMY_DATABASE_URI=uri, SQLALCHEMY_ENGINE_OPTIONS=engine_options(uri))
+    db.init_app(flask_app)
+    return flask_app
+
+
+def test_file_databases_get_wal_and_a_busy_timeout(tmp_path, monkeypatch):
+    monkeypatch.setenv('SQLITE_BUSY_TIMEOUT_MS', '2500')
+    flask_app = make_app(f"sqlite:///{tmp_path / 'users.db'}")
+    with flask_app.app_context():
+        tune_sqlite(db.engine)
+        with db.engine.connect() as connection:
+            assert connection.execute(text('PRAGMA journal_mode')).scalar() == 'wal'
+            assert connection.execute(text('PRAGMA busy_timeout')).scalar() == 2500
+            assert connection.execute(text('PRAGMA synchronous')).scalar() == 1  # NORMAL
+        assert db.engine.pool.size() == 10
+        db.engine.dispose()
+    assert engine_options('sqlite:///:memory:') == {}
+
+
+def test_registration_checks_and_lost_races_report_which_field_is_taken():
+    flask_app = make_app('sqlite:///:memory:')
+    with flask_app.app_context():
+        db.create_all()
+        assert app_module.taken_message('ada', 'ada@example.com') is None
+        assert app_module.create_user('ada', 'ada@example.com', 'Ada', 'hash') is None
+
+        assert app_module.taken_message('ada', 'other@example.com') == 'Username already exists'
+        assert app_module.taken_message('bob', 'ada@example.com') == 'Email already registered'
+        # A sign-up that passed the check before a concurrent one committed
+        assert app_module.create_user('ada', 'new@example.com', 'Ada', 'hash') == 'Username already exists'
+        assert app_module.create_user('bob', 'ada@example.com', 'Bob', 'hash') == 'Email already registered'
+        assert User.query.count() == 1
@@ -0,0 +1,84 @@
+"""
+Tests for the bounded password-hashing pool
+Run with: pytest test_password_hasher.py
+"""
+
+import threading
+
+import pytest
+
+import app as app_module
+import models
+import password_hasher
+from models import User
+from password_hasher import PasswordHasher, HasherBusy, canonical_method
+
+FAST = 'pbkdf2:sha256:1000'
+
+
+def test_verify_rehashes_when_the_method_changes():
+    old = PasswordHasher(method='pbkdf2:sha256:500')
+    stored = old.hash('secret1')
+    hasher = PasswordHasher(method=FAST)
+
+    assert hasher.verify(stored, 'wrong') == (False, None)
+    matches, rehashed = hasher.verify(stored, 'secret1')
+    assert matches and rehashed.startswith(FAST + '$')
+    assert hasher.verify(rehashed, 'secret1') == (True, None)
+    assert hasher.verify(None, 'secret1') == (False, None)
+    assert hasher.stats()['rehashes'] == 1 and hasher.stats()['verifications'] == 4
+
+
+@pytest.mark.parametrize('method', ['scrypt:16384', 'pbkdf2:nohash:1000', 'pbkdf2:sha256:many', 'bcrypt'])
+def test_invalid_methods_fail_at_construction(method):
+    assert canonical_method('pbkdf2') == f'pbkdf2:sha256:{password_hasher.DEFAULT_PBKDF2_ITERATIONS}'
+    with pytest.raises(ValueError):
+        PasswordHasher(method=method)
+
+
+def test_user_password_helpers_use_the_shared_pool(monkeypatch):
+    monkeypatch.setattr(models, 'password_hasher', PasswordHasher(method=FAST))
+    user = User(username='ada')
+    user.set_password('secret1')
+    assert user.password_hash.startswith(FAST + '$')
+
+    monkeypatch.setattr(models, 'password_hasher', PasswordHasher(method='pbkdf2:sha256:2000'))
+    assert not user.check_password('wrong') and user.check_password('secret1')
+    assert user.password_hash.startswith('pbkdf2:sha256:2000$')
+    assert models.password_hasher.stats()['verifications'] == 2
+
+
+@pytest.fixture
+def full_hasher(monkeypatch):
+    """A one-slot hasher whose only slot is held until the test ends"""
+    release = threading.Event()
+    started = threading.Event()
+    generate = password_hasher.generate_password_hash
+
+    def blocking_generate(password, method):
+        started.set()
+        release.wait(5)
+        return generate(password, method)
+
+    monkeypatch.setattr(password_hasher, 'generate_password_hash', blocking_generate)
+    hasher = PasswordHasher(workers=1, max_queue=0, method=FAST)
+    holder = threading.Thread(target=hasher.hash, args=('secret1',))
+    holder.start()
+    started.wait(5)
+    yield hasher
+    release.set()
+    holder.join()
+
+
+def test_full_pool_rejects_at_once(full_hasher):
+    with pytest.raises(HasherBusy):
+        full_hasher.verify(None, 'secret1')
+    assert full_hasher.stats()['rejected'] == 1 and full_hasher.stats()['outstanding'] == 1
+
+
+def test_login_answers_429_when_hashing_is_saturated(full_hasher, monkeypatch):
+    monkeypatch.setattr(app_module, 'password_hasher', full_hasher)
+    with app_module.app.test_client() as client:
+        response = client.post('/login', data={'username': 'nobody', 'password': 'secret1'})
+
+    assert response.status_code == 429 and response.headers['Retry-After'] == '1'
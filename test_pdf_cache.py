@@ -0,0 +1,60 @@
+"""
+Tests for the rendered-PDF cache and conditional downloads
+Run with: pytest test_pdf_cache.py
+"""
+
+import pytest
+
+import main
+from benchmarks.fixtures import PERSONAL_INFO, TYPICAL_RESUME
+from pdf_cache import PdfCache, pdf_key
+from pdf_themes import get_theme
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(main, 'pdf_cache', PdfCache())
+    with main.app.test_client() as client:
+        yield client
+
+
+def test_key_ignores_field_order_but_not_theme():
+    reordered = dict(reversed(list(TYPICAL_RESUME.items())))
+    classic = get_theme('classic')
+    assert pdf_key(TYPICAL_RESUME, PERSONAL_INFO, classic) == pdf_key(reordered, PERSONAL_INFO, classic)
+    assert pdf_key(TYPICAL_RESUME, PERSONAL_INFO, classic) != pdf_key(TYPICAL_RESUME, PERSONAL_INFO, get_theme('modern'))
+
+
+def test_eviction_is_bounded_by_bytes():
+    cache = PdfCache(max_bytes=10)
+    cache.set('a', b'12345')
+    cache.set('b', b'12345')
+    cache.get('a')
+    cache.set('c', b'12345')
+
+    assert cache.get('b') is None
+    assert cache.get('a') == b'12345'
+    stats = cache.stats()
+    assert stats['bytes'] == 10 and stats['evictions'] == 1
+
+
+def test_repeat_download_is_cached_and_revalidated(client):
+    body = {'resumeData': TYPICAL_RESUME, 'personalInfo': PERSONAL_INFO}
+
+    first = client.post('/api/download-pdf', json=body)
+    second = client.post('/api/download-pdf', json=body)
+    assert first.status_code == second.status_code == 200
+    assert first.data == second.data
+    etag = first.headers['ETag']
+    assert etag.startswith('"') and second.headers['ETag'] == etag
+
+    not_modified = client.post('/api/download-pdf', json=body, headers={'If-None-Match': etag})
+    assert not_modified.status_code == 304
+    assert not_modified.data == b''
+
+    changed = client.post('/api/download-pdf', json=dict(body, theme='modern'), headers={'If-None-Match': etag})
+    assert changed.status_code == 200
+
+    stats = client.get('/api/metrics').json['pdf_cache']
+    assert stats['hits'] == 1 and stats['not_modified'] == 1
+    assert stats['bytes_saved'] == 2 * len(first.data)
@@ -0,0 +1,130 @@
+"""
+Tests for the canvas fast-path PDF renderer
+Run with: pytest test_pdf_canvas.py
+"""
+
+import re
+
+import pytest
+from reportlab import rl_config
+from reportlab.pdfbase.pdfmetrics import stringWidth
+
+import main
+from benchmarks.fixtures import PERSONAL_INFO, MINIMAL_RESUME, TYPICAL_RESUME, MAXIMAL_RESUME
+from pdf_cache import PdfCache, pdf_key
+from pdf_canvas import break_lines
+from pdf_pool import PdfRenderPool
+from pdf_themes import get_theme, UnknownRendererError
+
+TOKEN = re.compile(rb'\((?:\\.|[^\\)])*\)|/[^\s/\[\]()<>]+|[-+]?\d*\.?\d+|[A-Za-z*]+')
+NUMBER = re.compile(rb'[-+]?\d*\.?\d+')
+
+
+def pdf_string(token):
+    text = re.sub(rb'\\([0-7]{1,3})', lambda m: bytes([int(m.group(1), 8)]), token[1:-1])
+    return re.sub(rb'\\(.)', rb'\1', text).decode('cp1252', 'replace')
+
+
+def text_lines(pdf):
+    """Visible text of an uncompressed PDF as (page, baseline, x, text, fonts) per line"""
+    fonts = {name.decode(): base.decode()
+             for base, name in re.findall(rb'/BaseFont /(\S+) .*?/Name /(F\d+)', pdf)}
+    shown = {}
+    streams = [s for s in re.findall(rb'stream\r?\n(.*?)endstream', pdf, re.S) if b'BT' in s]
+    for page, stream in enumerate(streams, 1):
+        stack, origin, line, cursor, leading, font, args = [], (0, 0), (0, 0), 0, 0, None, []
+        for token in TOKEN.findall(stream):
+            if token[:1] in b'(/' or NUMBER.fullmatch(token):
+                args.append(token)
+                continue
+            op = token.decode()
+            if op == 'q':
+                stack.append(origin)
+            elif op == 'Q':
+                origin = stack.pop()
+            elif op == 'cm':
+                origin = (origin[0] + float(args[4]), origin[1] + float(args[5]))
+            elif op in ('Tm', 'Td', 'T*'):
+                if op == 'Tm':
+                    line = (float(args[4]), float(args[5]))
+                elif op == 'Td':
+                    line = (line[0] + float(args[0]), line[1] + float(args[1]))
+                else:
+                    line = (line[0], line[1] - leading)
+                cursor = line[0]
+            elif op == 'TL':
+                leading = float(args[0])
+            elif op == 'Tf':
+                font = (fonts[args[0][1:].decode()], float(args[1]))
+            elif op == 'Tj':
+                text = pdf_string(args[0])
+                key = (page, round(origin[1] + line[1], 2))
+                shown.setdefault(key, []).append((round(origin[0] + cursor, 2), text, font))
+                cursor += stringWidth(text, *font)
+            args = []
+    result = []
+    for (page, y), items in sorted(shown.items(), key=lambda item: (item[0][0], -item[0][1])):
+        items.sort()
+        fonts_used = sorted({font for _, text, font in items if text.strip()})
+        result.append((page, y, items[0][0], ''.join(text for _, text, _ in items).strip(), fonts_used))
+    return result
+
+
+@pytest.fixture
+def uncompressed(monkeypatch):
+    monkeypatch.setattr(rl_config, 'invariant', 1)
+    monkeypatch.setattr(rl_config, 'pageCompression', 0)
+
+
+@pytest.mark.parametrize('resume', [MINIMAL_RESUME, TYPICAL_RESUME, MAXIMAL_RESUME],
+                         ids=['minimal', 'typical', 'maximal'])
+def test_canvas_matches_platypus_layout(uncompressed, resume):
+    """Same text, fonts, line breaks, positions and page breaks as the platypus path"""
+    theme = get_theme('classic')
+    expected = text_lines(theme.render(resume, PERSONAL_INFO, 'platypus').getvalue())
+    actual = text_lines(theme.render(resume, PERSONAL_INFO, 'canvas').getvalue())
+
+    assert [(page, text, fonts) for page, _, _, text, fonts in actual] == \
+        [(page, text, fonts) for page, _, _, text, fonts in expected]
+    for (_, y, x, _, _), (_, want_y, want_x, _, _) in zip(actual, expected):
+        assert y == pytest.approx(want_y, abs=0.05) and x == pytest.approx(want_x, abs=0.05)
+
+
+def test_break_lines_is_greedy_and_splits_long_words():
+    width = stringWidth('aaa bbb', 'Helvetica', 10)
+    lines = break_lines([('aaa bbb ccc', 'Helvetica')], 10, width)
+    assert [[word[0][0] for word in words] for _, words in lines] == [['aaa', 'bbb'], ['ccc']]
+
+    long_word = 'x' * 200
+    lines = break_lines([(long_word, 'Helvetica')], 10, 100)
+    assert ''.join(word[0][0] for _, words in lines for word in words) == long_word
+    assert all(line_width <= 100 for line_width, _ in lines)
+
+
+def test_renderer_is_per_theme_and_part_of_the_key():
+    classic = get_theme('classic')
+    assert pdf_key(TYPICAL_RESUME, PERSONAL_INFO, classic, 'canvas') != \
+        pdf_key(TYPICAL_RESUME, PERSONAL_INFO, classic)
+    with pytest.raises(UnknownRendererError):
+        get_theme('modern').render(TYPICAL_RESUME, PERSONAL_INFO, 'canvas')
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(main, 'pdf_cache', PdfCache())
+    monkeypatch.setattr(main, 'pdf_pool', PdfRenderPool(workers=0))
+    with main.app.test_client() as client:
+        yield client
+
+
+def test_download_selects_renderer_per_request(client):
+    body = {'resumeData': TYPICAL_RESUME, 'personalInfo': PERSONAL_INFO}
+    platypus = client.post('/api/download-pdf', json=body)
+    fast = client.post('/api/download-pdf', json=dict(body, renderer='canvas'))
+
+    assert fast.status_code == 200 and fast.data.startswith(b'%PDF')
+    assert fast.headers['ETag'] != platypus.headers['ETag']
+
+    unsupported = client.post('/api/download-pdf', json=dict(body, theme='modern', renderer='canvas'))
+    assert unsupported.status_code == 400
+    assert 'platypus' in unsupported.json['error']
@@ -0,0 +1,76 @@
+"""
+Tests for compact PDF output
+Run with: pytest test_pdf_compact.py
+"""
+
+import re
+import zlib
+
+import pytest
+from reportlab.pdfbase.pdfutils import asciiBase85Decode
+
+import main
+from benchmarks.fixtures import PERSONAL_INFO, RESUMES, TYPICAL_RESUME
+from pdf_cache import PdfCache, pdf_key
+from pdf_pool import PdfRenderPool
+from pdf_themes import get_theme, theme_names
+
+CORPUS = [(theme, renderer, name)
+          for theme in theme_names()
+          for renderer in get_theme(theme).renderers
+          for name in RESUMES]
+
+STREAM = re.compile(rb'<<([^>]*?)>>\s*stream\r?\n(.*?)endstream', re.S)
+
+
+def page_contents(pdf):
+    """Decoded content streams of a PDF, in file order"""
+    contents = []
+    for dictionary, data in STREAM.findall(pdf):
+        if b'ASCII85Decode' in dictionary:
+            data = asciiBase85Decode(data.strip())
+        if b'FlateDecode' in dictionary:
+            data = zlib.decompress(data)
+        contents.append(data)
+    return contents
+
+
+def render(theme, renderer, name, compact):
+    return get_theme(theme).render(RESUMES[name], PERSONAL_INFO, renderer, compact).getvalue()
+
+
+@pytest.mark.parametrize('theme, renderer, name', CORPUS)
+def test_compact_draws_the_same_pages(theme, renderer, name):
+    regular = render(theme, renderer, name, False)
+    compact = render(theme, renderer, name, True)
+
+    assert compact.startswith(b'%PDF') and compact.rstrip().endswith(b'%%EOF')
+    assert page_contents(compact) == page_contents(regular)
+    assert b'ASCII85Decode' not in compact and b'/ProcSet' not in compact
+    assert len(compact) < len(regular)
+
+
+def test_compact_size_reduction():
+    regular_bytes = sum(len(render(theme, renderer, name, False)) for theme, renderer, name in CORPUS)
+    compact_bytes = sum(len(render(theme, renderer, name, True)) for theme, renderer, name in CORPUS)
+
+    assert compact_bytes <= 0.85 * regular_bytes
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(main, 'pdf_cache', PdfCache())
+    monkeypatch.setattr(main, 'pdf_pool', PdfRenderPool(workers=0))
+    with main.app.test_client() as client:
+        yield client
+
+
+def test_download_compact_is_cached_separately(client):
+    body = {'resumeData': TYPICAL_RESUME, 'personalInfo': PERSONAL_INFO}
+    regular = client.post('/api/download-pdf', json=body)
+    compact = client.post('/api/download-pdf', json=dict(body, compact=True))
+
+    assert compact.status_code == 200 and len(compact.data) < len(regular.data)
+    assert compact.headers['ETag'] != regular.headers['ETag']
+    assert compact.headers['ETag'].strip('"') == \
+        pdf_key(TYPICAL_RESUME, PERSONAL_INFO, get_theme(None), compact=True)
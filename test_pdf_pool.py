@@ -0,0 +1,193 @@
+"""
+Tests for the PDF render process pool
+Run with: pytest test_pdf_pool.py
+"""
+
+import threading
+import time
+
+import pytest
+
+import main
+import pdf_pool
+from benchmarks.fixtures import PERSONAL_INFO, TYPICAL_RESUME
+from pdf_cache import PdfCache
+from pdf_pool import PdfRenderPool, PdfPoolFull, PdfRenderTimeout, PdfWorkerLost
+
+
+def test_worker_process_renders_pdf():
+    pool = PdfRenderPool(workers=1, max_queue=1, timeout=30)
+    try:
+        pids = pool.warm()
+        pdf = pool.render(TYPICAL_RESUME, PERSONAL_INFO, 'classic')
+    finally:
+        pool.shutdown()
+
+    assert len(pids) == 1
+    assert pdf.startswith(b'%PDF')
+    stats = pool.stats()
+    assert stats['renders'] == 1 and stats['outstanding'] == 0
+
+
+def test_full_pool_rejects_instead_of_queueing(monkeypatch):
+    release = threading.Event()
+    started = threading.Event()
+
+    def blocking_render(*args):
+        started.set()
+        release.wait(5)
+        return b'%PDF'
+
+    monkeypatch.setattr(pdf_pool, 'render_pdf_bytes', blocking_render)
+    pool = PdfRenderPool(workers=0, max_queue=0)
+    worker = threading.Thread(target=pool.render, args=({}, {}))
+    worker.start()
+    started.wait(5)
+
+    with pytest.raises(PdfPoolFull):
+        pool.render({}, {})
+    release.set()
+    worker.join(5)
+
+    assert pool.render({}, {}) == b'%PDF'
+    assert pool.stats()['rejected'] == 1
+
+
+def hang_forever(*args):
+    time.sleep(3600)
+
+
+def test_pool_warms_on_first_render_not_on_creation():
+    pool = PdfRenderPool(workers=2, max_queue=0, timeout=30)
+    try:
+        assert pool._executors == [None, None]
+        pool.render(TYPICAL_RESUME, PERSONAL_INFO, 'classic')
+        deadline = time.monotonic() + 30
+        while None in pool._executors and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert None not in pool._executors
+        assert pool.warm_in_background() is None
+    finally:
+        pool.shutdown()
+
+
+def test_timeout_kills_a_hung_render_and_frees_its_slot(monkeypatch):
+    # fork, so the worker inherits the patched render function
+    monkeypatch.setattr(pdf_pool, 'render_pdf_bytes', hang_forever)
+    pool = PdfRenderPool(workers=1, max_queue=0, timeout=1, start_method='fork')
+    try:
+        with pytest.raises(PdfRenderTimeout):
+            pool.render(TYPICAL_RESUME, PERSONAL_INFO)
+        stats = pool.stats()
+        assert stats['timeouts'] == 1 and stats['outstanding'] == 0 and stats['pool_restarts'] == 1
+
+        monkeypatch.undo()
+        assert pool.render(TYPICAL_RESUME, PERSONAL_INFO).startswith(b'%PDF')
+    finally:
+        pool.shutdown()
+
+
+def slow_render(*args):
+    time.sleep(0.7)
+    return b'%PDF'
+
+
+def quick_warm(shard):
+    return shard
+
+
+def test_time_spent_queued_does_not_count_toward_the_timeout(monkeypatch):
+    monkeypatch.setattr(pdf_pool, 'render_pdf_bytes', slow_render)
+    monkeypatch.setattr(pdf_pool, '_warm_worker', quick_warm)
+    pool = PdfRenderPool(workers=1, max_queue=2, timeout=1, start_method='fork')
+    results = []
+
+    def render():
+        try:
+            results.append(pool.render(TYPICAL_RESUME, PERSONAL_INFO))
+        except Exception as e:
+            results.append(e)
+
+    try:
+        pool.warm()
+        threads = [threading.Thread(target=render) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(10)
+    finally:
+        pool.shutdown()
+
+    assert results == [b'%PDF'] * 3
+    stats = pool.stats()
+    assert stats['timeouts'] == 0 and stats['pool_restarts'] == 0 and stats['outstanding'] == 0
+
+
+class ShutDownExecutor:
+    def submit(self, *args):
+        raise RuntimeError('cannot schedule new futures after shutdown')
+
+    def shutdown(self, **kwargs):
+        pass
+
+
+def test_submit_to_a_shut_down_worker_retries_on_a_fresh_one():
+    pool = PdfRenderPool(workers=1, max_queue=0, timeout=30)
+    pool._executors[0] = ShutDownExecutor()
+    try:
+        assert pool.render(TYPICAL_RESUME, PERSONAL_INFO, 'classic').startswith(b'%PDF')
+    finally:
+        pool.shutdown()
+
+    stats = pool.stats()
+    assert stats['outstanding'] == 0 and stats['pool_restarts'] == 1
+
+
+class BrokenPool:
+    def render(self, *args):
+        raise PdfWorkerLost('PDF renderer is restarting, please retry shortly')
+
+    def stats(self):
+        return {}
+
+
+def test_download_answers_503_when_the_worker_was_lost(monkeypatch):
+    monkeypatch.setattr(main, 'pdf_cache', PdfCache())
+    monkeypatch.setattr(main, 'pdf_pool', BrokenPool())
+    with main.app.test_client() as client:
+        response = client.post('/api/download-pdf',
+                               json={'resumeData': TYPICAL_RESUME, 'personalInfo': PERSONAL_INFO})
+
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '1'
+
+
+class FullPool:
+    def render(self, *args):
+        raise PdfPoolFull('PDF renderer is busy, please retry shortly')
+
+    def stats(self):
+        return {}
+
+
+def test_download_answers_503_when_pool_is_full(monkeypatch):
+    monkeypatch.setattr(main, 'pdf_cache', PdfCache())
+    monkeypatch.setattr(main, 'pdf_pool', FullPool())
+    with main.app.test_client() as client:
+        response = client.post('/api/download-pdf',
+                               json={'resumeData': TYPICAL_RESUME, 'personalInfo': PERSONAL_INFO})
+
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '1'
+    assert response.json['success'] is False
+
+
+def test_renders_of_one_person_go_to_one_worker_unless_it_is_busy():
+    pool = PdfRenderPool(workers=4, max_queue=0)
+    edits = [pdf_pool.affinity_shard(PERSONAL_INFO, 'classic', 4) for _ in range(3)]
+    assert len(set(edits)) == 1
+
+    shard = edits[0]
+    assert pool._pick_shard(shard) == shard
+    spilled = pool._pick_shard(shard)
+    assert spilled != shard and pool.stats()['affinity_spills'] == 1
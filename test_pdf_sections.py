@@ -0,0 +1,63 @@
+"""
+Tests for the section-level flowable cache
+Run with: pytest test_pdf_sections.py
+"""
+
+import pytest
+from reportlab import rl_config
+from reportlab.platypus import Spacer
+
+import pdf_themes
+from benchmarks.fixtures import PERSONAL_INFO, RESUMES, MAXIMAL_RESUME, TYPICAL_RESUME
+from pdf_sections import SectionCache
+
+
+@pytest.fixture
+def section_cache(monkeypatch):
+    monkeypatch.setattr(rl_config, 'invariant', 1)
+    monkeypatch.setattr(rl_config, 'pageCompression', 0)
+    cache = SectionCache()
+    monkeypatch.setattr(pdf_themes, 'section_cache', cache)
+    return cache
+
+
+def render_uncached(theme, resume):
+    pdf_themes.section_cache.clear()
+    return theme.render(resume, PERSONAL_INFO).getvalue()
+
+
+@pytest.mark.parametrize('theme_name', pdf_themes.theme_names())
+def test_cached_sections_render_identical_pdfs(section_cache, theme_name):
+    theme = pdf_themes.get_theme(theme_name)
+    # Summaries of varying length move the later (cached) sections across page breaks
+    resumes = list(RESUMES.values()) + [dict(MAXIMAL_RESUME, summary='Edited summary. ' * n) for n in (1, 60, 5, 120)]
+    expected = [render_uncached(theme, resume) for resume in resumes]
+
+    section_cache.clear()
+    for _ in range(2):
+        assert [theme.render(resume, PERSONAL_INFO).getvalue() for resume in resumes] == expected
+    assert section_cache.stats()['hits'] > 0
+
+
+def test_single_section_edit_rebuilds_only_that_section(section_cache):
+    theme = pdf_themes.get_theme('classic')
+    theme.render(TYPICAL_RESUME, PERSONAL_INFO)
+    before = section_cache.stats()
+
+    theme.render(dict(TYPICAL_RESUME, summary='A different summary.'), PERSONAL_INFO)
+    after = section_cache.stats()
+    assert after['misses'] - before['misses'] == 1
+    assert after['hits'] - before['hits'] == len(theme.sections(TYPICAL_RESUME, PERSONAL_INFO)) - 1
+
+
+def test_sections_are_lent_to_one_render_at_a_time():
+    cache = SectionCache(max_entries=1)
+    flowables = [Spacer(1, 10)]
+    flowables[0]._postponed = 1
+    cache.give_back('a', flowables)
+    assert cache.take('a') is flowables and not hasattr(flowables[0], '_postponed')
+    assert cache.take('a') is None
+
+    cache.give_back('a', [Spacer(1, 10)])
+    cache.give_back('b', [Spacer(1, 10)])
+    assert cache.stats()['entries'] == 1 and cache.stats()['evictions'] == 1
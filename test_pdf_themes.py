@@ -0,0 +1,47 @@
+"""
+Tests for the shared PDF theme registry
+Run with: pytest test_pdf_themes.py
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from benchmarks.fixtures import PERSONAL_INFO, TYPICAL_RESUME
+from main import app
+from pdf_themes import get_theme, render_pdf, theme_names, UnknownThemeError
+
+
+def test_themes_are_built_once():
+    assert {'classic', 'modern'} <= set(theme_names())
+    assert get_theme('modern') is get_theme('modern')
+    assert get_theme() is get_theme('classic')
+    with pytest.raises(TypeError):
+        get_theme('classic').styles['title'] = None
+
+
+def test_concurrent_renders_share_styles():
+    """Renders on many threads reuse one theme and produce the same document"""
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        pdfs = list(pool.map(lambda _: render_pdf(TYPICAL_RESUME, PERSONAL_INFO, 'classic').getvalue(), range(16)))
+    assert all(pdf.startswith(b'%PDF') for pdf in pdfs)
+    assert len({len(pdf) for pdf in pdfs}) == 1
+
+
+def test_unknown_theme_raises():
+    with pytest.raises(UnknownThemeError):
+        get_theme('neon')
+
+
+def test_download_pdf_picks_theme():
+    client = app.test_client()
+    body = {'resumeData': TYPICAL_RESUME, 'personalInfo': PERSONAL_INFO}
+
+    classic = client.post('/api/download-pdf', json=body)
+    modern = client.post('/api/download-pdf', json=dict(body, theme='modern'))
+    assert classic.status_code == modern.status_code == 200
+    assert classic.data != modern.data
+
+    response = client.post('/api/download-pdf', json=dict(body, theme='neon'))
+    assert response.status_code == 400
+    assert 'classic' in response.json['error']
@@ -0,0 +1,80 @@
+"""
+Tests for prompt construction and token budgeting
+Run with: pytest test_prompt_builder.py
+"""
+
+from prompt_builder import (
+    build_cover_letter_prompt,
+    build_resume_prompt,
+    count_tokens,
+    cover_letter_fields,
+    resume_fields,
+    truncate_to_tokens,
+)
+
+PROFILE = {
+    'name': 'Jordan Lee',
+    'email': 'jordan.lee@example.com',
+    'phone': '+1 555 010 2030',
+    'skills': 'Python, Flask, SQL',
+    'education': 'B.Sc. Computer Science, State University, 2025',
+    'experience': 'Backend intern at Acme Analytics, built CSV ingestion in Flask.',
+    'projects': 'Course planner web app (React, Flask).',
+    'targetRole': 'Backend Developer'
+}
+
+
+def test_count_tokens_approximation():
+    """English runs about four characters per token, punctuation counts once"""
+    assert count_tokens('') == 0
+    assert count_tokens('Python, SQL') == 4
+    assert count_tokens('internationalization') == 5
+    assert count_tokens('日本語') >= 3
+
+
+def test_small_profile_is_not_trimmed():
+    prompt = build_resume_prompt(resume_fields(PROFILE))
+    assert prompt['trimmed'] == []
+    assert prompt['max_tokens'] == 1500
+    assert PROFILE['experience'] in prompt['messages'][1]['content']
+
+
+def test_oversized_fields_fit_the_budget():
+    """Page-long fields are cut so the prompt stays near the input budget"""
+    data = dict(PROFILE, experience='Led a team. ' * 2000, projects='Built a tool. ' * 2000)
+    prompt = build_resume_prompt(resume_fields(data), input_budget=600)
+
+    empty = build_resume_prompt(resume_fields(dict(PROFILE, skills='', education='', experience='', projects='')))
+
+    assert sorted(prompt['trimmed']) == ['experience', 'projects']
+    assert prompt['input_tokens'] <= empty['input_tokens'] + 600
+    assert '…' in prompt['messages'][1]['content']
+
+
+def test_truncation_prefers_sentence_boundary():
+    text = 'First sentence here. Second sentence is a bit longer than the first one.'
+    assert truncate_to_tokens(text, 8) == 'First sentence here. …'
+
+
+def test_static_prefix_is_shared_across_students():
+    """Instructions come before user details so the provider can cache the prefix"""
+    first = build_resume_prompt(resume_fields(PROFILE))['messages']
+    second = build_resume_prompt(resume_fields(dict(PROFILE, name='Sam Rivera', targetRole='Data Analyst')))['messages']
+    assert first[0] == second[0]
+    prefix = first[1]['content'].split('Student:')[0]
+    assert second[1]['content'].startswith(prefix)
+
+
+def test_max_tokens_follows_requested_sections():
+    fields = resume_fields(dict(PROFILE, sections=['summary', 'skills', 'unknown']))
+    prompt = build_resume_prompt(fields)
+    assert prompt['sections'] == ['summary', 'skills']
+    assert prompt['max_tokens'] == 380
+    assert '"experience"' not in prompt['messages'][1]['content']
+
+
+def test_duplicate_skills_are_dropped():
+    fields = cover_letter_fields({'skills': 'Python, SQL, python, Docker, SQL'})
+    prompt = build_cover_letter_prompt(fields)
+    assert 'Skills: Python, SQL, Docker' in prompt['messages'][1]['content']
+    assert prompt['max_tokens'] == 800
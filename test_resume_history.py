@@ -0,0 +1,71 @@
+"""
+Tests for the saved resume history
+Run with: pytest test_resume_history.py
+"""
+
+import pytest
+from flask import Flask
+from flask_login import LoginManager, login_user
+
+import app as app_module
+from benchmarks.fixtures import PERSONAL_INFO, MAXIMAL_RESUME, TYPICAL_RESUME, UNICODE_RESUME
+from identity_cache import Identity
+from models import db, User, Resume
+from pdf_cache import PdfCache
+from pdf_pool import PdfRenderPool
+
+
+def test_versions_round_trip_compressed():
+    version = Resume.build(1, MAXIMAL_RESUME, PERSONAL_INFO, 'Engineer')
+
+    assert len(version.payload) * 4 < version.size
+    assert version.unpack() == (MAXIMAL_RESUME, PERSONAL_INFO)
+    assert Resume.build(1, UNICODE_RESUME, PERSONAL_INFO).unpack()[0] == UNICODE_RESUME
+
+
+@pytest.fixture
+def history_app(monkeypatch):
+    flask_app = Flask('resume_history_test')
+    flask_app.config.update(SECRET_KEY='test', SQLALCHEMY_DATABASE_URI='sqlite:///:memory:')
+    db.init_app(flask_app)
+    LoginManager().init_app(flask_app)
+    monkeypatch.setattr(app_module, 'pdf_cache', PdfCache())
+    monkeypatch.setattr(app_module, 'pdf_pool', PdfRenderPool(workers=0))
+    with flask_app.app_context():
+        db.create_all()
+        users = [User(username=name, email=f'{name}@example.com', password_hash='x') for name in ('ada', 'bob')]
+        db.session.add_all(users)
+        db.session.commit()
+        yield flask_app, [Identity.from_user(user) for user in users]
+
+
+def call(flask_app, user, path, view, *args):
+    with flask_app.test_request_context(path):
+        login_user(user)
+        response = flask_app.make_response(view(*args))
+    return response
+
+
+def test_history_lists_fetches_and_redownloads_per_user(history_app):
+    flask_app, (ada, bob) = history_app
+    with flask_app.test_request_context('/'):
+        login_user(ada)
+        ids = [app_module.save_resume_version(dict(TYPICAL_RESUME, summary=f'Version {i}'), PERSONAL_INFO, 'Engineer')
+               for i in range(5)]
+        assert app_module.save_resume_version(dict(TYPICAL_RESUME, summary='Version 4'), PERSONAL_INFO, 'x') == ids[-1]
+
+    first = call(flask_app, ada, '/api/resumes?limit=2', app_module.list_resumes).json
+    assert [entry['id'] for entry in first['resumes']] == [ids[4], ids[3]]
+    second = call(flask_app, ada, f"/api/resumes?limit=2&before={first['nextBefore']}", app_module.list_resumes).json
+    last = call(flask_app, ada, f"/api/resumes?limit=2&before={second['nextBefore']}", app_module.list_resumes).json
+    assert [entry['id'] for entry in second['resumes'] + last['resumes']] == ids[2::-1]
+    assert last['nextBefore'] is None and 'resume' not in last['resumes'][0]
+
+    fetched = call(flask_app, ada, f'/api/resumes/{ids[1]}', app_module.get_resume, ids[1]).json
+    assert fetched['resume']['summary'] == 'Version 1' and fetched['personalInfo'] == PERSONAL_INFO
+
+    pdf = call(flask_app, ada, f'/api/resumes/{ids[1]}/pdf?compact=true', app_module.download_saved_resume, ids[1])
+    assert pdf.status_code == 200 and pdf.mimetype == 'application/pdf'
+
+    assert call(flask_app, bob, f'/api/resumes/{ids[1]}', app_module.get_resume, ids[1]).status_code == 404
+    assert call(flask_app, bob, '/api/resumes', app_module.list_resumes).json['resumes'] == []
@@ -0,0 +1,73 @@
+"""
+Tests for incremental resume JSON parsing
+Run with: pytest test_resume_json.py
+"""
+
+import random
+
+import pytest
+
+from benchmarks.json_corpus import build_corpus
+from resume_json import RESUME_SECTIONS, ResumeParseError, ResumeStreamParser, extract_resume
+
+COMPLETION = '''Here is the resume:
+```json
+{
+    "summary": "Builds {robust} services, \\"fast\\".",
+    "skills": ["Python", "SQL"],
+    "experience": [{"title": "Intern", "company": "Tech Corp", "duration": "2023", "description": "APIs"}],
+    "education": [],
+    "projects": [{"name": "Site", "description": "Shop", "technologies": "Flask"}]
+}
+```'''
+
+
+def test_sections_are_emitted_as_they_complete():
+    """Each section is reported once, in order, as soon as its value closes"""
+    parser = ResumeStreamParser()
+    emitted = []
+    for i in range(0, len(COMPLETION), 7):
+        emitted.extend(name for name, _ in parser.feed(COMPLETION[i:i + 7]))
+
+    assert emitted == ['summary', 'skills', 'experience', 'education', 'projects']
+    assert parser.done
+    assert parser.sections['summary'] == 'Builds {robust} services, "fast".'
+
+
+def test_summary_available_before_object_closes():
+    """The summary is emitted before the rest of the object has arrived"""
+    parser = ResumeStreamParser()
+    cut = COMPLETION.index('"skills"') + 3
+    completed = parser.feed(COMPLETION[:cut])
+    assert completed == [('summary', 'Builds {robust} services, "fast".')]
+    assert not parser.done
+
+
+def test_malformed_corpus_is_recovered():
+    """Every whole section in the malformed-output corpus is recovered"""
+    for name, text, expected in build_corpus():
+        resume, _ = extract_resume(text)
+        for section, value in expected.items():
+            assert resume.get(section) == value, f'{name}: {section}'
+
+
+def test_stream_parser_is_chunking_invariant():
+    """Random chunk boundaries never change what the stream parser recovers"""
+    rng = random.Random(7)
+    for name, text, expected in build_corpus(truncations_per_resume=5):
+        parser = ResumeStreamParser()
+        pos = 0
+        while pos < len(text):
+            size = rng.randint(1, 32)
+            parser.feed(text[pos:pos + size])
+            pos += size
+        sections, missing = parser.finish()
+        for section, value in expected.items():
+            assert sections.get(section) == value, f'{name}: {section}'
+        assert set(missing) == set(RESUME_SECTIONS) - set(sections)
+
+
+def test_unrecoverable_output_raises():
+    """Output without any resume object raises ResumeParseError"""
+    with pytest.raises(ResumeParseError):
+        extract_resume("I'm sorry, I can't help with that {request}.")
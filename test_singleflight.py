@@ -0,0 +1,95 @@
+"""
+Tests for single-flight request coalescing
+Run with: pytest test_singleflight.py
+"""
+
+import threading
+import time
+
+import pytest
+
+import singleflight
+from singleflight import SingleFlight
+
+
+def run_concurrently(count, target):
+    threads = [threading.Thread(target=target) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def test_concurrent_calls_share_one_execution():
+    """N identical concurrent calls trigger one upstream call"""
+    flight = SingleFlight(lock_dir='')
+    calls = []
+    results = []
+
+    def generate():
+        calls.append(1)
+        time.sleep(0.1)
+        return {'summary': 'shared'}
+
+    run_concurrently(8, lambda: results.append(flight.do('key', generate)))
+
+    assert len(calls) == 1
+    assert all(result == {'summary': 'shared'} for result, _ in results)
+    assert sum(shared for _, shared in results) == 7
+    stats = flight.stats()
+    assert stats['leaders'] == 1
+    assert stats['coalesced'] == 7
+    assert stats['in_flight'] == 0
+
+
+def test_leader_error_reaches_waiters():
+    """A failed upstream call fails every coalesced caller"""
+    flight = SingleFlight(lock_dir='')
+    errors = []
+
+    def generate():
+        time.sleep(0.05)
+        raise RuntimeError('Grok API error')
+
+    def call():
+        try:
+            flight.do('key', generate)
+        except RuntimeError as e:
+            errors.append(str(e))
+
+    run_concurrently(4, call)
+    assert errors == ['Grok API error'] * 4
+
+
+@pytest.mark.skipif(singleflight.fcntl is None, reason='needs POSIX file locks')
+def test_cross_process_waiter_rechecks_shared_store(tmp_path):
+    """A second process waits on the lock file and reuses the stored result"""
+    store = {}
+    first = SingleFlight(lock_dir=str(tmp_path))
+    second = SingleFlight(lock_dir=str(tmp_path))
+    second_calls = []
+
+    def slow_generate():
+        time.sleep(0.2)
+        store['key'] = 'letter'
+        return 'letter'
+
+    leader = threading.Thread(target=lambda: first.do('key', slow_generate))
+    leader.start()
+    time.sleep(0.05)
+    result = second.do('key', lambda: second_calls.append(1), recheck=lambda: store.get('key'))
+    leader.join()
+
+    assert result == ('letter', True)
+    assert second_calls == []
+    assert second.stats()['cross_process_coalesced'] == 1
+
+
+@pytest.mark.skipif(singleflight.fcntl is None, reason='needs POSIX file locks')
+def test_lock_directory_stays_bounded(tmp_path):
+    flight = SingleFlight(lock_dir=str(tmp_path), lock_buckets=4)
+
+    for number in range(50):
+        assert flight.do(f'key-{number}', lambda: number) == (number, False)
+
+    assert 0 < len(list(tmp_path.iterdir())) <= 4
@@ -0,0 +1,134 @@
+"""
+Tests for the Streamlit front end
+Run with: pytest test_streamlit_app.py
+"""
+
+import hashlib
+
+import pytest
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+import pdf_themes
+from user_store import open_user_store
+
+RESUME = {
+    'resume': {'summary': 'Backend engineer', 'skills': ['Go', 'SQL']},
+    'personal': {'name': 'Ada Lovelace', 'email': 'ada@example.com', 'phone': '555-0100'}
+}
+
+
+@pytest.fixture
+def renders(monkeypatch):
+    calls = []
+    render = pdf_themes.PdfTheme.render
+
+    def counting_render(self, *args, **kwargs):
+        calls.append((self.name, kwargs.get('compact')))
+        return render(self, *args, **kwargs)
+
+    monkeypatch.setattr(pdf_themes.PdfTheme, 'render', counting_render)
+    return calls
+
+
+def password_hash(password):
+    return hashlib.sha256(password.encode()).hexdigest()
+
+
+@pytest.fixture
+def user_store(tmp_path, monkeypatch):
+    """Temporary account store, the one the app's get_user_store() opens"""
+    db_path = str(tmp_path / 'streamlit_users.db')
+    monkeypatch.setenv('USER_STORE_DB', db_path)
+    # get_user_store() is a cached resource: drop the store an earlier test opened
+    st.cache_resource.clear()
+    yield open_user_store(db_path=db_path, legacy_path=None)
+    st.cache_resource.clear()
+
+
+def new_app_test():
+    at = AppTest.from_file('streamlit_app.py', default_timeout=30)
+    at.secrets['XAI_API_KEY'] = ''
+    return at
+
+
+@pytest.fixture
+def app_test(user_store):
+    user_store.add('ada', {'password': password_hash('secret1'), 'full_name': 'Ada Lovelace',
+                           'email': 'ada@example.com', 'created_at': '2024-01-01T00:00:00'})
+    at = new_app_test()
+    at.session_state['logged_in'] = True
+    at.session_state['username'] = 'ada'
+    at.session_state['resume_data'] = {'resume': dict(RESUME['resume']),
+                                       'personal': dict(RESUME['personal'])}
+    return at
+
+
+def test_reruns_do_not_rerender_unchanged_pdf(app_test, renders):
+    app_test.run()
+    assert not app_test.exception
+    assert len(app_test.get('download_button')) == 1
+
+    app_test.run()
+    app_test.sidebar.radio[0].set_value('About').run()
+    app_test.sidebar.radio[0].set_value('Resume Builder').run()
+    assert len(renders) <= 1
+
+    before = len(renders)
+    app_test.session_state['resume_data']['resume']['summary'] = 'Platform engineer'
+    app_test.run()
+    assert len(renders) == before + 1
+
+
+def test_compact_pdf_is_an_option(app_test, renders):
+    # A summary no other test renders, so the shared PDF cache has neither variant
+    app_test.session_state['resume_data']['resume']['summary'] = 'Compact option engineer'
+    app_test.run()
+    assert renders[-1] == ('modern', True)
+
+    app_test.checkbox(key='compact_pdf').uncheck().run()
+    assert not app_test.exception
+    assert renders[-1] == ('modern', False)
+    assert len(app_test.get('download_button')) == 1
+
+
+def log_in(at, username, password):
+    at.text_input[0].input(username)
+    at.text_input[1].input(password)
+    at.button[0].click().run()
+
+
+def test_login_checks_the_user_store(user_store):
+    user_store.add('ada', {'password': password_hash('secret1'), 'full_name': 'Ada Lovelace',
+                           'email': 'ada@example.com', 'created_at': '2024-01-01T00:00:00'})
+    at = new_app_test()
+    at.run()
+
+    log_in(at, 'ada', 'wrong-password')
+    assert not at.session_state['logged_in']
+    assert at.error[0].value == 'Invalid username or password'
+
+    log_in(at, 'ada', 'secret1')
+    assert at.session_state['logged_in'] and at.session_state['username'] == 'ada'
+
+
+def test_registration_adds_one_account_to_the_store(user_store):
+    at = new_app_test()
+    at.session_state['page'] = 'register'
+    at.run()
+
+    def register():
+        for field, value in zip(at.text_input, ['Grace Hopper', 'grace', 'grace@example.com', 'cobol60', 'cobol60']):
+            field.input(value)
+        at.button[0].click().run()
+
+    register()
+    assert not at.exception
+    assert user_store.get('grace')['email'] == 'grace@example.com'
+    assert user_store.get('grace')['password'] == password_hash('cobol60')
+
+    at.session_state['page'] = 'register'
+    at.run()
+    register()
+    assert at.error[0].value == 'Username already exists'
+    assert user_store.count() == 1
@@ -0,0 +1,69 @@
+"""
+Tests for the stub Grok server and load-test helpers
+Run with: pytest test_stub_grok.py
+"""
+
+import json
+import random
+
+import pytest
+
+from benchmarks.load_test import percentile, summarize
+from benchmarks.stub_grok import LatencyDistribution, StubGrokServer, COVER_LETTER_TEXT
+from grok_client import GrokClient, GrokAPIError
+from prompt_builder import build_resume_prompt, resume_fields
+from resume_json import extract_resume
+
+RESUME_MESSAGES = build_resume_prompt(resume_fields({'targetRole': 'Developer'}))['messages']
+
+
+def test_completion_and_stream_match_protocol():
+    """GrokClient should work unchanged against the stub, streamed or not"""
+    with StubGrokServer(seed=1) as stub:
+        client = GrokClient('stub-key', stub.url)
+        resume, missing = extract_resume(client.chat_completion(RESUME_MESSAGES))
+        assert missing == []
+
+        letter = ''.join(client.stream_chat_completion([{'role': 'user', 'content': 'Write a cover letter'}]))
+        assert letter == COVER_LETTER_TEXT
+        assert stub.stats()['requests'] == 2
+        assert stub.stats()['streamed'] == 1
+        client.close()
+
+
+def test_error_and_malformed_rates():
+    with StubGrokServer(error_rate=1.0) as stub:
+        client = GrokClient('stub-key', stub.url)
+        with pytest.raises(GrokAPIError):
+            client.chat_completion(RESUME_MESSAGES)
+        client.close()
+
+    with StubGrokServer(malformed_rate=1.0, seed=3) as stub:
+        client = GrokClient('stub-key', stub.url)
+        content = client.chat_completion(RESUME_MESSAGES)
+        with pytest.raises(ValueError):
+            json.loads(content)
+        extract_resume(content)
+        assert stub.stats()['malformed'] == 1
+        client.close()
+
+
+def test_latency_specs():
+    rng = random.Random(0)
+    assert LatencyDistribution('fixed:250').sample(rng) == 0.25
+    assert 0.1 <= LatencyDistribution('uniform:100,200').sample(rng) <= 0.2
+    assert LatencyDistribution('lognormal:800,0.4').sample(rng) > 0
+    with pytest.raises(ValueError):
+        LatencyDistribution('gamma:1,2')
+
+
+def test_percentiles_and_summary():
+    values = [i / 1000 for i in range(1, 101)]
+    assert percentile(values, 50) == 0.05
+    assert percentile(values, 99) == 0.099
+    assert percentile([], 50) is None
+
+    summary = summarize([0.1, 0.2, 0.3], [200, 200, 500], elapsed=1.0)
+    assert summary['errors'] == 1
+    assert summary['throughput_rps'] == 2.0
+    assert summary['status_counts'] == {'200': 2, '500': 1}
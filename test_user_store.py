@@ -0,0 +1,90 @@
+"""
+Tests for the indexed Streamlit user store
+Run with: pytest test_user_store.py
+"""
+
+import json
+import threading
+
+import pytest
+
+import user_store
+from user_store import SqliteUserStore, open_user_store
+
+RECORD = {'password': 'hash', 'full_name': 'Ada Lovelace', 'email': 'ada@example.com',
+          'created_at': '2024-01-01T00:00:00'}
+
+
+@pytest.fixture
+def store(tmp_path):
+    return SqliteUserStore(str(tmp_path / 'users.db'))
+
+
+def test_lookup_and_duplicate_registration(store):
+    assert store.get('ada') is None
+    assert store.add('ada', RECORD) is True
+    assert store.add('ada', dict(RECORD, password='other')) is False
+    assert store.get('ada') == RECORD and store.count() == 1
+
+
+def test_concurrent_registrations_of_one_name_create_one_account(tmp_path):
+    path = str(tmp_path / 'users.db')
+    stores = [SqliteUserStore(path) for _ in range(8)]
+    results = []
+    threads = [threading.Thread(target=lambda s=s: results.append(s.add('ada', RECORD))) for s in stores]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results.count(True) == 1 and stores[0].count() == 1
+
+
+def test_legacy_json_is_imported_once(tmp_path):
+    legacy = tmp_path / 'users_data.json'
+    legacy.write_text(json.dumps({'ada': RECORD, 'bob': dict(RECORD, full_name='Bob')}, indent=4))
+    store = open_user_store(str(tmp_path / 'users.db'), legacy_path=str(legacy))
+
+    assert store.get('bob')['full_name'] == 'Bob' and store.count() == 2
+    assert not legacy.exists() and (tmp_path / 'users_data.json.migrated').exists()
+    assert open_user_store(str(tmp_path / 'users.db'), legacy_path=str(legacy)).count() == 2
+
+
+def test_default_file_is_not_the_flask_database(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv('USER_STORE_DB', raising=False)
+    open_user_store().add('ada', RECORD)
+
+    assert (tmp_path / 'streamlit_users.db').exists() and not (tmp_path / 'users.db').exists()
+
+
+def test_backends_are_pluggable(tmp_path):
+    added = []
+
+    @user_store.register_backend('memory')
+    class MemoryUserStore(user_store.UserStore):
+        def __init__(self, path):
+            self.users = {}
+
+        def get(self, username):
+            return self.users.get(username)
+
+        def add(self, username, record):
+            added.append(username)
+            return self.users.setdefault(username, record) is record
+
+        def count(self):
+            return len(self.users)
+
+    legacy = tmp_path / 'users_data.json'
+    legacy.write_text(json.dumps({'ada': RECORD, 'nopass': dict(RECORD, password='')}))
+    try:
+        store = open_user_store('unused', legacy_path=str(legacy), backend='memory')
+    finally:
+        user_store._backends.pop('memory')
+
+    assert isinstance(store, MemoryUserStore)
+    assert store.get('ada') == RECORD and added == ['ada']
+    assert not legacy.exists()
+    with pytest.raises(ValueError):
+        open_user_store('unused', backend='memory')
@@ -0,0 +1,157 @@
+"""
+Indexed account store for the Streamlit app.
+
+Accounts live in a SQLite table keyed by username (WAL mode, so readers never
+wait on a writer): a login is one primary-key lookup and a registration one
+INSERT, instead of parsing and rewriting the whole users_data.json file.
+An existing JSON file is imported once, on first open, and then renamed to
+users_data.json.migrated.
+
+Stores implement the small UserStore interface (get, add, count) and are
+registered by name; USER_STORE_BACKEND picks one. SQLite is the only backend
+shipped.
+
+    store = open_user_store()
+    store.add('ada', {'password': ..., 'full_name': ..., 'email': ..., 'created_at': ...})
+    store.get('ada') -> record dict, or None
+"""
+
+import json
+import os
+import sqlite3
+import threading
+
+USER_FIELDS = ('password', 'full_name', 'email', 'created_at')
+LEGACY_USERS_FILE = 'users_data.json'
+# Not users.db: that is the Flask app's SQLAlchemy database, with its own users table
+DEFAULT_DB = 'streamlit_users.db'
+
+
+_backends = {}
+
+
+def register_backend(name):
+    """Register a UserStore class, built with the store's path, under name"""
+    def decorator(cls):
+        _backends[name] = cls
+        return cls
+    return decorator
+
+
+class UserStore:
+    """Account store interface the Streamlit app relies on"""
+
+    def get(self, username):
+        """Return the record for username, or None"""
+        raise NotImplementedError
+
+    def add(self, username, record):
+        """Insert a new account atomically; returns False if the username is taken"""
+        raise NotImplementedError
+
+    def count(self):
+        raise NotImplementedError
+
+    def migrate_json(self, json_path):
+        """Import a legacy users JSON file once, then rename it; returns accounts imported"""
+        if not os.path.exists(json_path):
+            return 0
+        with open(json_path, 'r') as f:
+            users = json.load(f)
+
+        imported = 0
+        for username, record in users.items():
+            if record.get('password') and self.add(username, record):
+                imported += 1
+        try:
+            os.replace(json_path, json_path + '.migrated')
+        except FileNotFoundError:
+            pass  # another process finished the same migration first
+        return imported
+
+
+@register_backend('sqlite')
+class SqliteUserStore(UserStore):
+    """Username-indexed accounts in one SQLite file"""
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('PRAGMA busy_timeout=5000')
+        self._db.execute(
+            'CREATE TABLE IF NOT EXISTS users ('
+            'username TEXT PRIMARY KEY, password TEXT NOT NULL, full_name TEXT, '
+            'email TEXT, created_at TEXT) WITHOUT ROWID'
+        )
+
+    def get(self, username):
+        """Return the record for username, or None"""
+        with self._lock:
+            row = self._db.execute(
+                'SELECT password, full_name, email, created_at FROM users WHERE username = ?',
+                (username,)
+            ).fetchone()
+        return dict(zip(USER_FIELDS, row)) if row is not None else None
+
+    def add(self, username, record):
+        """Insert a new account; returns False if the username is taken"""
+        try:
+            with self._lock:
+                self._db.execute(
+                    'INSERT INTO users (username, password, full_name, email, created_at) '
+                    'VALUES (?, ?, ?, ?, ?)',
+                    (username, *(record.get(field) for field in USER_FIELDS))
+                )
+        except sqlite3.IntegrityError:
+            return False
+        return True
+
+    def count(self):
+        with self._lock:
+            return self._db.execute('SELECT COUNT(*) FROM users').fetchone()[0]
+
+    def migrate_json(self, json_path):
+        """UserStore.migrate_json() as one bulk insert"""
+        if not os.path.exists(json_path):
+            return 0
+        with open(json_path, 'r') as f:
+            users = json.load(f)
+
+        rows = [(username, *(record.get(field) for field in USER_FIELDS))
+                for username, record in users.items() if record.get('password')]
+        with self._lock:
+            before = self._db.total_changes
+            self._db.execute('BEGIN IMMEDIATE')
+            try:
+                self._db.executemany(
+                    'INSERT OR IGNORE INTO users (username, password, full_name, email, created_at) '
+                    'VALUES (?, ?, ?, ?, ?)',
+                    rows
+                )
+                self._db.execute('COMMIT')
+            except Exception:
+                self._db.execute('ROLLBACK')
+                raise
+            imported = self._db.total_changes - before
+
+        try:
+            os.replace(json_path, json_path + '.migrated')
+        except FileNotFoundError:
+            pass  # another process finished the same migration first
+        return imported
+
+
+def open_user_store(db_path=None, legacy_path=LEGACY_USERS_FILE, backend=None):
+    """Open the configured store, importing the legacy JSON file if one is left"""
+    if db_path is None:
+        db_path = os.getenv('USER_STORE_DB', DEFAULT_DB)
+    if backend is None:
+        backend = os.getenv('USER_STORE_BACKEND', 'sqlite')
+    if backend not in _backends:
+        raise ValueError(f"Unknown user store backend '{backend}'. Available: {', '.join(sorted(_backends))}")
+    store = _backends[backend](db_path)
+    if legacy_path:
+        store.migrate_json(legacy_path)
+    return store
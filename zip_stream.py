@@ -0,0 +1,45 @@
+"""
+Write a ZIP archive as a stream of byte chunks.
+
+zipfile can write to an unseekable file (it then appends a data descriptor
+after each member instead of patching the local header), so each member is
+handed to the client as soon as it is added and only that member is ever in
+memory, not the archive.
+"""
+
+import zipfile
+
+
+class _ChunkSink:
+    """Unseekable file object that collects written bytes until drained"""
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def stream_zip(members, compression=zipfile.ZIP_STORED):
+    """Yield the bytes of a ZIP archive holding (name, data) pairs from members
+
+    members may be a generator; each pair is written and its bytes yielded
+    before the next one is requested. The default stores members
+    uncompressed, which suits already-compressed content such as PDFs.
+    """
+    sink = _ChunkSink()
+    with zipfile.ZipFile(sink, 'w', compression=compression) as archive:
+        for name, data in members:
+            archive.writestr(name, data)
+            yield sink.drain()
+    # Closing the archive wrote the central directory
+    yield sink.drain()